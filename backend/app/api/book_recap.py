@@ -1,30 +1,42 @@
+import asyncio
 from app.services.book_recap_service import BookRecapService
+from app.data_sources.browser_pool import BrowserPool
 from app.data_sources.coursehero_json_scraper import CourseHeroScraper
+from app.data_sources.tiered_fetcher import TieredFetcher
 
 
-def main():
+async def main():
     BOOK_TITLE = "Crime and Punishment"
     TARGET_CHAPTER = 2
     PART = None  # None → default part = 1
 
+    # Debug: görünür browser
+    pool = BrowserPool(size=1, headless=False)
+    fetcher = TieredFetcher(pool=pool)
+
     # Scraper artık chapter'ı burada alıyor
     scraper = CourseHeroScraper(
         book_title=BOOK_TITLE,
-        chapter=TARGET_CHAPTER,
-        part=PART,
-        headless=False
+        target_part=PART or 1,
+        target_chapter=TARGET_CHAPTER,
+        fetcher=fetcher
     )
 
     service = BookRecapService(scraper)
 
-    recap = service.generate_full_recap(
-        book_title=BOOK_TITLE,
-        chapter=TARGET_CHAPTER
-    )
+    try:
+        recap = await service.generate_full_recap(
+            book_title=BOOK_TITLE,
+            chapter=TARGET_CHAPTER,
+            part=PART
+        )
+    finally:
+        await fetcher.aclose()
+        await pool.close()
 
     print("\n===== FINAL RECAP =====\n")
-    print(recap)
+    print(recap.text)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -3,15 +3,37 @@ Recap API Router
 Provides endpoints for generating AI-powered recaps for series and books
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import hashlib
+import math
+from datetime import datetime, timezone
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Union
+from app.core.serialization import dumps
+from app.services.recap_cache import RecapResult, get_recap_cache
+from app.services.recap_jobs import (
+    DONE,
+    FAILED,
+    IdempotencyConflict,
+    JobQueueFull,
+    RecapJob,
+    get_recap_jobs,
+)
+from app.services.recap_sections import RecapSectionStream, parse_recap_sections
 from app.services.recap_service import RecapService
 from app.services.book_recap_service import BookRecapService
-from app.data_sources.coursehero_json_scraper import CourseHeroScraper
+from app.data_sources.scrape_workers import ScrapeQueueFull, book_chapter_source
+from app.data_sources.tmdb import TMDBRateLimited
 
 router = APIRouter(tags=["recap"])
 
+# İstemci bağlantısı bu aralıkla kontrol edilir
+DISCONNECT_POLL_INTERVAL = 0.5
+# GET /recap/jobs/{id}?wait= için üst sınır (saniye)
+MAX_JOB_WAIT = 60.0
+
 
 class SeriesRecapRequest(BaseModel):
     title: str
@@ -29,10 +51,232 @@ class RecapResponse(BaseModel):
     characterContext: list[str]
     storyRecap: str
     generatedAt: str
+    cached: bool = False
+
+
+class RecapJobResponse(BaseModel):
+    jobId: str
+    status: str
+    createdAt: str
+    finishedAt: Optional[str] = None
+    result: Optional[RecapResponse] = None
+    error: Optional[str] = None
+    errorStatus: Optional[int] = None
+    retryAfter: Optional[int] = None
+
+
+# ?async=true: 202 + job; bitmiş job'a bağlanınca 200 + job
+ASYNC_RESPONSES = {202: {"model": RecapJobResponse, "description": "Recap job queued or running"}}
+
+
+def _to_response(result: RecapResult) -> RecapResponse:
+    # Parse the recap into sections (character context + story recap)
+    character_context, story_recap = parse_recap_sections(result.text)
+
+    return RecapResponse(
+        characterContext=character_context or ["Unable to parse character context"],
+        storyRecap=story_recap or result.text,
+        generatedAt=result.generated_at,
+        cached=result.cached
+    )
+
+
+def _error_status(kind: str, e: Exception) -> tuple[int, str]:
+    if isinstance(e, asyncio.TimeoutError):
+        return 504, "Recap generation timed out"
+    if isinstance(e, (ScrapeQueueFull, TMDBRateLimited)):
+        return 503, str(e)
+    if kind == "series" and isinstance(e, ValueError):
+        return 404, f"Series not found: {str(e)}"
+    if kind == "book":
+        return 500, f"Error generating book recap: {str(e)}"
+    return 500, f"Error generating recap: {str(e)}"
+
+
+def _retry_after(e: Exception) -> int | None:
+    # 503 + Retry-After (JobQueueFull ile aynı sözleşme)
+    if isinstance(e, TMDBRateLimited):
+        return max(1, math.ceil(e.retry_after))
+    return None
+
+
+def _error_exception(kind: str, e: Exception) -> HTTPException:
+    status, detail = _error_status(kind, e)
+    retry_after = _retry_after(e)
+    headers = {"Retry-After": str(retry_after)} if retry_after else None
+    return HTTPException(status_code=status, detail=detail, headers=headers)
+
+
+def _series_recap(request: SeriesRecapRequest):
+    return RecapService().generate_full_recap(
+        title=request.title,
+        season=request.season,
+        episode=request.episode
+    )
+
+
+async def _book_recap(request: BookRecapRequest):
+    # Scraping runs in the worker processes
+    scraper = await book_chapter_source(
+        book_title=request.title,
+        target_part=request.part or 1,
+        target_chapter=request.chapter
+    )
+
+    # Generate recap
+    service = BookRecapService(scraper)
+    return await service.generate_full_recap(
+        book_title=request.title,
+        chapter=request.chapter,
+        part=request.part or 1
+    )
 
 
-@router.post("/series", response_model=RecapResponse)
-async def get_series_recap(request: SeriesRecapRequest):
+async def _book_recap_stream(request: BookRecapRequest):
+    # Kaynak stream içinde çözülür: hatası da SSE error event'i olur
+    scraper = await book_chapter_source(
+        book_title=request.title,
+        target_part=request.part or 1,
+        target_chapter=request.chapter
+    )
+
+    service = BookRecapService(scraper)
+    async for item in service.stream_full_recap(
+        book_title=request.title,
+        chapter=request.chapter,
+        part=request.part or 1
+    ):
+        yield item
+
+
+# ------------------------
+# Async jobs
+# ------------------------
+def _iso(timestamp: float | None) -> str | None:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds")
+
+
+def _job_response(job: RecapJob) -> RecapJobResponse:
+    response = RecapJobResponse(
+        jobId=job.id,
+        status=job.status,
+        createdAt=_iso(job.created_at),
+        finishedAt=_iso(job.finished_at)
+    )
+    if job.status == DONE:
+        response.result = _to_response(job.result)
+    elif job.status == FAILED:
+        response.errorStatus, response.error = _error_status(job.kind, job.error)
+        response.retryAfter = _retry_after(job.error)
+    return response
+
+
+def _submit_job(
+    kind: str,
+    idempotency_key: Optional[str],
+    default_key: str,
+    request: BaseModel,
+    run
+) -> JSONResponse:
+    """
+    Queues a recap job (or attaches to the one with the same key) and
+    answers 202 with its id; 200 if that job already finished. Without an
+    Idempotency-Key header the key is derived from the request; a header
+    key reused with a different request body is rejected with 422.
+    """
+    fingerprint = ""
+    if idempotency_key:
+        fingerprint = hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+
+    try:
+        job, _ = get_recap_jobs().submit(kind, idempotency_key or default_key, run, fingerprint)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return JSONResponse(
+        _job_response(job).model_dump(),
+        status_code=200 if job.done.is_set() else 202,
+        headers={"Location": f"/recap/jobs/{job.id}"}
+    )
+
+
+async def _until_disconnected(http_request: Request, coro):
+    """
+    Awaits `coro`, cancelling it if the HTTP client goes away first, so an
+    abandoned request stops holding an LLM slot. Single-flighted work only
+    stops once every waiter is gone.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client disconnected")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+async def _sse_recap_events(kind: str, chunks):
+    """
+    Turns a service's recap stream into server-sent events:
+    - character: one finished SECTION 1 line  {"line": ...}
+    - story:     a SECTION 2 text delta       {"text": ...}
+    - done:      the full parsed RecapResponse
+    - error:     {"status": ..., "detail": ...}, same mapping as the
+                 blocking routes (_error_status)
+    """
+    parser = RecapSectionStream()
+    try:
+        async for item in chunks:
+            if isinstance(item, RecapResult):
+                for event, value in parser.finish():
+                    yield _sse(event, {"line" if event == "character" else "text": value})
+                yield _sse("done", _to_response(item).model_dump())
+                return
+
+            for event, value in parser.feed(item):
+                yield _sse(event, {"line" if event == "character" else "text": value})
+    except Exception as e:
+        status, detail = _error_status(kind, e)
+        error = {"status": status, "detail": detail}
+        retry_after = _retry_after(e)
+        if retry_after:
+            error["retryAfter"] = retry_after
+        yield _sse("error", error)
+
+
+def _event_stream(kind: str, chunks) -> StreamingResponse:
+    # Starlette istemci koptuğunda generator'ı iptal eder → LLM stream'i de kapanır
+    return StreamingResponse(
+        _sse_recap_events(kind, chunks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post(
+    "/series",
+    response_model=Union[RecapResponse, RecapJobResponse],
+    responses=ASYNC_RESPONSES
+)
+async def get_series_recap(
+    request: SeriesRecapRequest,
+    http_request: Request,
+    run_async: bool = Query(False, alias="async"),
+    idempotency_key: Optional[str] = Header(None)
+):
     """
     Generate an AI recap for a TV series up to a specific season and episode.
     
@@ -41,48 +285,43 @@ async def get_series_recap(request: SeriesRecapRequest):
     - season: Target season number
     - episode: Target episode number
     
+    Query Parameters:
+    - async: If true, queue a job and return its id (202) instead of waiting.
+      The same request (or Idempotency-Key header) attaches to the existing job;
+      an Idempotency-Key reused with a different body gets 422.
+    
     Returns:
     Recap with character context and story summary
     """
-    try:
-        service = RecapService()
-        recap_text = service.generate_full_recap(
-            title=request.title,
-            season=request.season,
-            episode=request.episode
-        )
-        
-        # Parse the recap into sections (character context + story recap)
-        sections = recap_text.split("SECTION 2 —")
-        
-        character_context = []
-        story_recap = ""
-        
-        if len(sections) >= 1:
-            # Extract character context bullets
-            context_text = sections[0].replace("SECTION 1 —", "").replace("CHARACTER CONTEXT", "").strip()
-            character_context = [
-                line.strip()
-                for line in context_text.split("\n")
-                if line.strip().startswith("•") or (line.strip() and not line.strip().startswith("-"))
-            ]
-        
-        if len(sections) == 2:
-            story_recap = sections[1].replace("STORY RECAP", "").strip()
-        
-        return RecapResponse(
-            characterContext=character_context or ["Unable to parse character context"],
-            storyRecap=story_recap or recap_text,
-            generatedAt=""
+    if run_async:
+        return _submit_job(
+            "series",
+            idempotency_key,
+            f"{request.title.strip().lower()}|S{request.season}E{request.episode}",
+            request,
+            lambda: _series_recap(request)
         )
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=f"Series not found: {str(e)}")
+
+    try:
+        result = await _until_disconnected(http_request, _series_recap(request))
+        return _to_response(result)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating recap: {str(e)}")
+        raise _error_exception("series", e)
 
 
-@router.post("/book", response_model=RecapResponse)
-async def get_book_recap(request: BookRecapRequest):
+@router.post(
+    "/book",
+    response_model=Union[RecapResponse, RecapJobResponse],
+    responses=ASYNC_RESPONSES
+)
+async def get_book_recap(
+    request: BookRecapRequest,
+    http_request: Request,
+    run_async: bool = Query(False, alias="async"),
+    idempotency_key: Optional[str] = Header(None)
+):
     """
     Generate an AI recap for a book up to a specific chapter.
     
@@ -91,53 +330,94 @@ async def get_book_recap(request: BookRecapRequest):
     - chapter: Target chapter number
     - part: Optional part number (for multi-part books)
     
+    Query Parameters:
+    - async: If true, queue a job and return its id (202), see /recap/series
+    
     Returns:
     Recap with character context and story summary
     """
-    try:
-        # Initialize scraper
-        scraper = CourseHeroScraper(
-            book_title=request.title,
-            chapter=request.chapter,
-            part=request.part or 1,
-            headless=True
-        )
-        
-        # Generate recap
-        service = BookRecapService(scraper)
-        recap_text = service.generate_full_recap(
-            book_title=request.title,
-            chapter=request.chapter
-        )
-        
-        # Parse the recap into sections
-        sections = recap_text.split("SECTION 2 —")
-        
-        character_context = []
-        story_recap = ""
-        
-        if len(sections) >= 1:
-            context_text = sections[0].replace("SECTION 1 —", "").replace("CHARACTER CONTEXT", "").strip()
-            character_context = [
-                line.strip()
-                for line in context_text.split("\n")
-                if line.strip().startswith("•") or (line.strip() and not line.strip().startswith("-"))
-            ]
-        
-        if len(sections) == 2:
-            story_recap = sections[1].replace("STORY RECAP", "").strip()
-        
-        return RecapResponse(
-            characterContext=character_context or ["Unable to parse character context"],
-            storyRecap=story_recap or recap_text,
-            generatedAt=""
+    if run_async:
+        return _submit_job(
+            "book",
+            idempotency_key,
+            f"{request.title.strip().lower()}|P{request.part or 1}C{request.chapter}",
+            request,
+            lambda: _book_recap(request)
         )
+
+    try:
+        result = await _until_disconnected(http_request, _book_recap(request))
+        return _to_response(result)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating book recap: {str(e)}")
+        raise _error_exception("book", e)
+
+
+@router.get("/jobs/{job_id}", response_model=RecapJobResponse)
+async def get_recap_job(job_id: str, wait: float = Query(0, ge=0, le=MAX_JOB_WAIT)):
+    """
+    Status of an async recap job; result is included once it is done.
+    
+    Query Parameters:
+    - wait: Long-poll up to this many seconds for the job to finish
+    """
+    jobs = get_recap_jobs()
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return _job_response(await jobs.wait(job, wait))
+
+
+@router.post("/series/stream")
+async def stream_series_recap(request: SeriesRecapRequest):
+    """
+    Streaming variant of /recap/series (server-sent events).
+    
+    Character context lines are sent as soon as SECTION 1 lines are
+    complete, story text as it is generated. The final "done" event
+    carries the same payload as /recap/series.
+    """
+    service = RecapService()
+    return _event_stream("series", service.stream_full_recap(
+        title=request.title,
+        season=request.season,
+        episode=request.episode
+    ))
+
+
+@router.post("/book/stream")
+async def stream_book_recap(request: BookRecapRequest):
+    """
+    Streaming variant of /recap/book (server-sent events).
+    """
+    return _event_stream("book", _book_recap_stream(request))
+
+
+@router.delete("/cache")
+async def invalidate_recap_cache(
+    kind: str = Query(..., pattern="^(series|series_digest|book)$"),
+    content_id: Optional[str] = None,
+    position: Optional[str] = None
+):
+    """
+    Drop cached recaps.
+    
+    Query Parameters:
+    - kind: "series", "series_digest" (per-season digests) or "book"
+    - content_id: Optional TMDB tv id (series) or CourseHero slug (book)
+    - position: Optional position, e.g. "S6E2", "S5" or "P2C3"
+    
+    Returns:
+    Number of removed cache entries
+    """
+    removed = get_recap_cache().invalidate(kind, content_id, position)
+    return {"removed": removed}
 
 
 # Test endpoint (for development)
-def main():
+async def main():
     """Test function for local development"""
     print("=== RECAP PIPELINE TEST ===")
 
@@ -152,16 +432,16 @@ def main():
     print(f"Hedef: Season {TARGET_SEASON} Episode {TARGET_EPISODE}")
     print("\nRecap üretiliyor...\n")
 
-    final_recap = service.generate_full_recap( 
+    final_recap = await service.generate_full_recap(
         title=TITLE,
         season=TARGET_SEASON,
         episode=TARGET_EPISODE
     )
 
     print("===== FINAL RECAP =====\n")
-    print(final_recap)
+    print(final_recap.text)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
 
@@ -3,17 +3,37 @@ Series API Router
 Provides endpoints for browsing and searching TV series with image caching
 """
 
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional
-from functools import lru_cache
-from app.data_sources.series_photos import TMDBClient
+from fastapi import APIRouter, Query, HTTPException, Response
+from app.core.cache import TTLCache
+from app.core.config import (
+    LISTING_CACHE_MAX_ENTRIES,
+    LISTING_CACHE_STALE_TTL,
+    LISTING_TTL_POPULAR,
+    LISTING_TTL_SEARCH,
+    LISTING_TTL_TOP_RATED,
+    LISTING_TTL_TRENDING,
+)
+from app.data_sources.tmdb import get_tmdb_client
+from app.schemas.series import encode_listing
 
 router = APIRouter(tags=["series"])
 
-# Initialize TMDB client (reused for caching)
-@lru_cache(maxsize=1)
-def _get_tmdb_client():
-    return TMDBClient()
+# Listing responses (pre-encoded JSON bytes): key = (endpoint, page, query, language)
+listing_cache = TTLCache(
+    max_entries=LISTING_CACHE_MAX_ENTRIES,
+    stale_ttl=LISTING_CACHE_STALE_TTL
+)
+
+
+async def _listing_response(endpoint: str, page: int, query: str | None, ttl: int, fetch) -> Response:
+    client = get_tmdb_client()
+
+    async def load():
+        return encode_listing(await fetch(client), client.image_url)
+
+    key = (endpoint, page, query, client.params["language"])
+    body = await listing_cache.get_or_load(key, load, ttl)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/series/popular")
@@ -28,31 +48,13 @@ async def get_popular_series(page: int = Query(1, ge=1)):
     List of popular series with poster and backdrop images
     """
     try:
-        client = _get_tmdb_client()
-        data = client.popular_tv(page=page)
-        
-        series_list = []
-        for show in data.get("results", []):
-            series_list.append({
-                "id": show["id"],
-                "title": show.get("name", ""),
-                "description": show.get("overview", ""),
-                "poster_path": show.get("poster_path"),
-                "poster": client.image_url(show.get("poster_path")),
-                "backdrop_path": show.get("backdrop_path"),
-                "backdrop": client.image_url(show.get("backdrop_path")),
-                "rating": show.get("vote_average", 0),
-                "genres": [],  # Will be filled for detailed view
-                "seasons": 0,  # Will be filled for detailed view
-                "episodes": 0,  # Will be filled for detailed view
-            })
-        
-        return {
-            "results": series_list,
-            "page": data.get("page"),
-            "total_pages": data.get("total_pages"),
-            "total_results": data.get("total_results"),
-        }
+        return await _listing_response(
+            "popular",
+            page,
+            None,
+            LISTING_TTL_POPULAR,
+            lambda client: client.popular_tv(page=page)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching popular series: {str(e)}")
 
@@ -69,25 +71,13 @@ async def get_trending_series(page: int = Query(1, ge=1)):
     List of trending series with poster and backdrop images
     """
     try:
-        client = _get_tmdb_client()
-        data = client.trending_tv(page=page)
-        
-        series_list = []
-        for show in data.get("results", []):
-            series_list.append({
-                "id": show["id"],
-                "title": show.get("name", ""),
-                "description": show.get("overview", ""),
-                "poster": client.image_url(show.get("poster_path")),
-                "backdrop": client.image_url(show.get("backdrop_path")),
-                "rating": show.get("vote_average", 0),
-            })
-        
-        return {
-            "results": series_list,
-            "page": data.get("page"),
-            "total_pages": data.get("total_pages"),
-        }
+        return await _listing_response(
+            "trending",
+            page,
+            None,
+            LISTING_TTL_TRENDING,
+            lambda client: client.trending_tv(page=page)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching trending series: {str(e)}")
 
@@ -104,25 +94,13 @@ async def get_top_rated_series(page: int = Query(1, ge=1)):
     List of top-rated series with poster and backdrop images
     """
     try:
-        client = _get_tmdb_client()
-        data = client.top_rated_tv(page=page)
-        
-        series_list = []
-        for show in data.get("results", []):
-            series_list.append({
-                "id": show["id"],
-                "title": show.get("name", ""),
-                "description": show.get("overview", ""),
-                "poster": client.image_url(show.get("poster_path")),
-                "backdrop": client.image_url(show.get("backdrop_path")),
-                "rating": show.get("vote_average", 0),
-            })
-        
-        return {
-            "results": series_list,
-            "page": data.get("page"),
-            "total_pages": data.get("total_pages"),
-        }
+        return await _listing_response(
+            "top_rated",
+            page,
+            None,
+            LISTING_TTL_TOP_RATED,
+            lambda client: client.top_rated_tv(page=page)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching top-rated series: {str(e)}")
 
@@ -143,26 +121,13 @@ async def search_series(q: str = Query(..., min_length=1), page: int = Query(1,
         if not q or not q.strip():
             raise HTTPException(status_code=400, detail="Search query cannot be empty")
         
-        client = _get_tmdb_client()
-        data = client.search_tv(query=q, page=page)
-        
-        series_list = []
-        for show in data.get("results", []):
-            series_list.append({
-                "id": show["id"],
-                "title": show.get("name", ""),
-                "description": show.get("overview", ""),
-                "poster": client.image_url(show.get("poster_path")),
-                "backdrop": client.image_url(show.get("backdrop_path")),
-                "rating": show.get("vote_average", 0),
-            })
-        
-        return {
-            "results": series_list,
-            "page": data.get("page"),
-            "total_pages": data.get("total_pages"),
-            "total_results": data.get("total_results"),
-        }
+        return await _listing_response(
+            "search",
+            page,
+            q.strip().lower(),
+            LISTING_TTL_SEARCH,
+            lambda client: client.search_tv(query=q, page=page)
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -181,8 +146,8 @@ async def get_series_details(series_id: int):
     Detailed series information with poster, backdrop, seasons count, and genres
     """
     try:
-        client = _get_tmdb_client()
-        data = client.tv_details(series_id)
+        client = get_tmdb_client()
+        data = await client.tv_details(series_id)
         
         # Extract genre names
         genres = [genre["name"] for genre in data.get("genres", [])]
@@ -233,8 +198,8 @@ async def get_season_details(series_id: int, season_number: int):
     Season information including episode count
     """
     try:
-        client = _get_tmdb_client()
-        data = client.tv_details(series_id)
+        client = get_tmdb_client()
+        data = await client.tv_details(series_id)
         
         # Find the specific season
         seasons_info = data.get("seasons", [])
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class TTLCache:
+    """
+    In-memory LRU cache with per-entry TTL and stale-while-revalidate.
+
+    - At most `max_entries` entries; the least recently used one is evicted.
+    - A fresh entry is returned as is.
+    - A stale entry (past its TTL but within `stale_ttl`) is returned at once
+      and a single background refresh is started for its key.
+    - Anything older is treated as a miss and loaded inline.
+    """
+
+    def __init__(self, max_entries: int = 512, stale_ttl: float = 3600):
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._data: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        now = time.monotonic()
+        self._data[key] = _Entry(value, now + ttl, now + ttl + self.stale_ttl)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable | None = None):
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float
+    ) -> Any:
+        entry = self._data.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now < entry.stale_until:
+            self._data.move_to_end(key)
+
+            if now < entry.fresh_until:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._refresh_in_background(key, loader, ttl)
+
+            return entry.value
+
+        self.misses += 1
+        value = await loader()
+        self.set(key, value, ttl)
+        return value
+
+    def _refresh_in_background(self, key, loader, ttl):
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                self.set(key, await loader(), ttl)
+            except Exception as e:
+                # Stale değer bir sonraki denemeye kadar servis edilmeye devam eder
+                print(f"Cache refresh failed for {key!r}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshing": len(self._refreshing),
+        }
@@ -4,7 +4,170 @@ from dotenv import load_dotenv
 load_dotenv()
 
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")
-TMDB_BASE_URL = os.getenv("TMDB_BASE_URL")
+TMDB_BASE_URL = os.getenv("TMDB_BASE_URL") or "https://api.themoviedb.org/3"
 
 if not TMDB_API_KEY:
     raise RuntimeError("TMDB_API_KEY is not set")
+
+# TMDB HTTP client
+TMDB_TIMEOUT = float(os.getenv("TMDB_TIMEOUT", "10"))
+TMDB_MAX_CONNECTIONS = int(os.getenv("TMDB_MAX_CONNECTIONS", "20"))
+TMDB_KEEPALIVE_EXPIRY = float(os.getenv("TMDB_KEEPALIVE_EXPIRY", "30"))
+TMDB_FANOUT = int(os.getenv("TMDB_FANOUT", "6"))
+
+# TMDB client-side rate limit (token bucket) and 429 handling
+TMDB_RATE_LIMIT = float(os.getenv("TMDB_RATE_LIMIT", "40"))
+TMDB_RATE_BURST = int(os.getenv("TMDB_RATE_BURST", "40"))
+TMDB_MAX_RETRIES = int(os.getenv("TMDB_MAX_RETRIES", "3"))
+
+# Local persistent data (SQLite stores)
+DATA_DIR = os.getenv("DATA_DIR", "data")
+
+# Episode overview store
+EPISODE_STORE_PATH = os.getenv("EPISODE_STORE_PATH", os.path.join(DATA_DIR, "episodes.sqlite3"))
+EPISODE_IMMUTABLE_AFTER_DAYS = int(os.getenv("EPISODE_IMMUTABLE_AFTER_DAYS", "30"))
+EPISODE_TTL_RECENT = int(os.getenv("EPISODE_TTL_RECENT", str(6 * 3600)))
+EPISODE_TTL_UPCOMING = int(os.getenv("EPISODE_TTL_UPCOMING", "3600"))
+TV_DETAILS_TTL = int(os.getenv("TV_DETAILS_TTL", str(6 * 3600)))
+
+# Series listing response cache (seconds)
+LISTING_CACHE_MAX_ENTRIES = int(os.getenv("LISTING_CACHE_MAX_ENTRIES", "512"))
+LISTING_CACHE_STALE_TTL = int(os.getenv("LISTING_CACHE_STALE_TTL", "3600"))
+LISTING_TTL_POPULAR = int(os.getenv("LISTING_TTL_POPULAR", "600"))
+LISTING_TTL_TRENDING = int(os.getenv("LISTING_TTL_TRENDING", "900"))
+LISTING_TTL_TOP_RATED = int(os.getenv("LISTING_TTL_TOP_RATED", str(6 * 3600)))
+LISTING_TTL_SEARCH = int(os.getenv("LISTING_TTL_SEARCH", "600"))
+
+# Bounded thread pools for work that has no async API
+LLM_WORKERS = int(os.getenv("LLM_WORKERS", "8"))
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "2"))
+
+# LLM calls: in-flight cap (tune to the provider quota) and per-call timeout
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "90"))
+
+# LLM providers (see app/services/llm/registry.py): "gemini" | "local".
+# With a fallback set, calls still running after the primary's
+# LLM_HEDGE_PERCENTILE latency are hedged to it; first answer wins.
+LLM_PRIMARY = os.getenv("LLM_PRIMARY", "gemini")
+LLM_FALLBACK = os.getenv("LLM_FALLBACK", "")
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+# Hedge delay (s) until LLM_HEDGE_MIN_SAMPLES primary latencies are known
+LLM_HEDGE_DELAY = float(os.getenv("LLM_HEDGE_DELAY", "15"))
+
+# Deterministic offline stand-in provider ("local")
+LOCAL_LLM_LATENCY_MS = float(os.getenv("LOCAL_LLM_LATENCY_MS", "1000"))
+LOCAL_LLM_TAIL_MS = float(os.getenv("LOCAL_LLM_TAIL_MS", "0"))
+LOCAL_LLM_TAIL_RATIO = float(os.getenv("LOCAL_LLM_TAIL_RATIO", "0"))
+
+# Headless Chromium pool for the CourseHero scrapers: browsers kept alive,
+# each relaunched after BROWSER_RECYCLE_PAGES pages (or when unhealthy)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_TABS_PER_BROWSER = int(os.getenv("BROWSER_TABS_PER_BROWSER", "4"))
+BROWSER_RECYCLE_PAGES = int(os.getenv("BROWSER_RECYCLE_PAGES", "100"))
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "1") == "1"
+# Scripts from other hosts are blocked (comma separated, subdomains match)
+BROWSER_FIRST_PARTY_HOSTS = [
+    host.strip() for host in os.getenv("BROWSER_FIRST_PARTY_HOSTS", "coursehero.com").split(",") if host.strip()
+]
+
+# Scraper politeness, per host: page starts per second, random extra delay
+# (s) per start and concurrent pages. SCRAPE_HOST_RATES overrides the rate
+# for specific hosts, e.g. "coursehero.com=0.5,example.org=2"
+SCRAPE_HOST_RATE = float(os.getenv("SCRAPE_HOST_RATE", "1.0"))
+SCRAPE_HOST_JITTER = float(os.getenv("SCRAPE_HOST_JITTER", "0.5"))
+SCRAPE_HOST_CONCURRENCY = int(os.getenv("SCRAPE_HOST_CONCURRENCY", "4"))
+SCRAPE_HOST_RATES = {
+    host.strip(): float(rate)
+    for host, _, rate in (
+        item.partition("=") for item in os.getenv("SCRAPE_HOST_RATES", "").split(",") if "=" in item
+    )
+}
+
+# Tiered page fetcher: plain HTTP first, browser only when needed. Hosts
+# that needed the browser are re-probed over HTTP every N fetches.
+SCRAPE_HTTP_TIMEOUT = float(os.getenv("SCRAPE_HTTP_TIMEOUT", "15"))
+SCRAPE_HTTP_MAX_CONNECTIONS = int(os.getenv("SCRAPE_HTTP_MAX_CONNECTIONS", "10"))
+SCRAPE_HTTP_REPROBE_EVERY = int(os.getenv("SCRAPE_HTTP_REPROBE_EVERY", "50"))
+
+# Summary/link extraction with lxml instead of BeautifulSoup (faster; pages
+# the two parsers would repair differently still go to bs4, see html_extract)
+HTML_EXTRACT_LXML = os.getenv("HTML_EXTRACT_LXML", "1") == "1"
+
+# Book scraping runs in separate worker processes (each with its own
+# browser), so a hung or bloated Chromium can't take the API down. Tasks
+# are killed after SCRAPE_TASK_TIMEOUT s; a worker is replaced after
+# SCRAPE_PROCESS_MAX_TASKS tasks or when its process tree (worker +
+# browser) grows past SCRAPE_PROCESS_MAX_RSS_MB. At most SCRAPE_PROCESS_QUEUE
+# callers wait for a free worker. SCRAPE_PROCESSES=0 scrapes in-process.
+SCRAPE_PROCESSES = int(os.getenv("SCRAPE_PROCESSES", "2"))
+SCRAPE_PROCESS_QUEUE = int(os.getenv("SCRAPE_PROCESS_QUEUE", "20"))
+SCRAPE_TASK_TIMEOUT = float(os.getenv("SCRAPE_TASK_TIMEOUT", "180"))
+SCRAPE_PROCESS_MAX_TASKS = int(os.getenv("SCRAPE_PROCESS_MAX_TASKS", "50"))
+SCRAPE_PROCESS_MAX_RSS_MB = int(os.getenv("SCRAPE_PROCESS_MAX_RSS_MB", "1500"))
+
+# Async recap jobs: worker count, queue bound, how long finished jobs are kept
+RECAP_JOB_WORKERS = int(os.getenv("RECAP_JOB_WORKERS", "4"))
+RECAP_JOB_QUEUE_SIZE = int(os.getenv("RECAP_JOB_QUEUE_SIZE", "100"))
+RECAP_JOB_TTL = int(os.getenv("RECAP_JOB_TTL", "3600"))
+
+# Local title -> TMDB id index (built from TMDB's daily ID export); fuzzy
+# matches scoring below TITLE_INDEX_FUZZY_MIN go to /search/tv instead
+TITLE_INDEX_PATH = os.getenv("TITLE_INDEX_PATH", os.path.join(DATA_DIR, "title_index.sqlite3"))
+TITLE_INDEX_FUZZY_MIN = float(os.getenv("TITLE_INDEX_FUZZY_MIN", "0.9"))
+
+# Full-recap result cache
+RECAP_CACHE_PATH = os.getenv("RECAP_CACHE_PATH", os.path.join(DATA_DIR, "recaps.sqlite3"))
+RECAP_CACHE_MAX_ENTRIES = int(os.getenv("RECAP_CACHE_MAX_ENTRIES", "20000"))
+RECAP_LANGUAGE = os.getenv("RECAP_LANGUAGE", "tr")
+
+# Book chapter-summary corpus; the per-book discovery index (summary page
+# list) is refreshed after BOOK_INDEX_TTL, extracted summaries never expire,
+# gated / summary-less pages are retried after BOOK_PAGE_MISS_TTL
+BOOK_CORPUS_PATH = os.getenv("BOOK_CORPUS_PATH", os.path.join(DATA_DIR, "book_corpus.sqlite3"))
+BOOK_INDEX_TTL = int(os.getenv("BOOK_INDEX_TTL", str(30 * 24 * 3600)))
+BOOK_PAGE_MISS_TTL = int(os.getenv("BOOK_PAGE_MISS_TTL", str(7 * 24 * 3600)))
+# Title -> verified site slug: kept BOOK_SLUG_TTL when the slug is the title
+# as typed, BOOK_SLUG_GUESS_TTL when it came from a fuzzy Google Books match
+BOOK_SLUG_TTL = int(os.getenv("BOOK_SLUG_TTL", str(30 * 24 * 3600)))
+BOOK_SLUG_GUESS_TTL = int(os.getenv("BOOK_SLUG_GUESS_TTL", str(24 * 3600)))
+# Google Books metadata (book title -> canonical title / author). The API
+# key is optional (anonymous quota without it). Resolved titles are cached
+# locally for GOOGLE_BOOKS_TTL, unknown titles for GOOGLE_BOOKS_NEGATIVE_TTL.
+GOOGLE_BOOKS_API_KEY = os.getenv("GOOGLE_BOOKS_API_KEY")
+GOOGLE_BOOKS_BASE_URL = os.getenv("GOOGLE_BOOKS_BASE_URL") or "https://www.googleapis.com/books/v1"
+GOOGLE_BOOKS_TIMEOUT = float(os.getenv("GOOGLE_BOOKS_TIMEOUT", "10"))
+GOOGLE_BOOKS_TTL = int(os.getenv("GOOGLE_BOOKS_TTL", str(30 * 24 * 3600)))
+GOOGLE_BOOKS_NEGATIVE_TTL = int(os.getenv("GOOGLE_BOOKS_NEGATIVE_TTL", str(24 * 3600)))
+GOOGLE_BOOKS_MATCH_MIN = float(os.getenv("GOOGLE_BOOKS_MATCH_MIN", "0.8"))
+BOOK_METADATA_PATH = os.getenv("BOOK_METADATA_PATH", os.path.join(DATA_DIR, "book_metadata.sqlite3"))
+
+# Offline pre-scrape (python -m app.services.book_prescrape): progress
+# checkpoint and number of books scraped at once
+PRESCRAPE_CHECKPOINT_PATH = os.getenv("PRESCRAPE_CHECKPOINT_PATH", os.path.join(DATA_DIR, "prescrape_checkpoint.json"))
+PRESCRAPE_BOOK_CONCURRENCY = int(os.getenv("PRESCRAPE_BOOK_CONCURRENCY", "2"))
+
+# Recap generation mode: "hierarchical" (cached per-season digests + current
+# season overviews) or "flat" (every overview from S1E1 in one prompt)
+RECAP_MODE = os.getenv("RECAP_MODE", "hierarchical")
+
+# Token budget for the summaries in one recap prompt; older entries are
+# compacted to fit, the most recent PROMPT_KEEP_RECENT stay verbatim
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+PROMPT_KEEP_RECENT = int(os.getenv("PROMPT_KEEP_RECENT", "4"))
+# Hierarchical mode: share of the budget always left for the current
+# season's overviews; earlier-season digests are compacted into the rest
+PROMPT_CURRENT_SEASON_SHARE = float(os.getenv("PROMPT_CURRENT_SEASON_SHARE", "0.5"))
+
+# Background recap warm-up for trending/popular shows (off unless enabled)
+RECAP_WARMUP_ENABLED = os.getenv("RECAP_WARMUP_ENABLED", "0") == "1"
+RECAP_WARMUP_INTERVAL = int(os.getenv("RECAP_WARMUP_INTERVAL", "3600"))
+RECAP_WARMUP_PAGES = int(os.getenv("RECAP_WARMUP_PAGES", "1"))
+RECAP_WARMUP_MAX_SHOWS = int(os.getenv("RECAP_WARMUP_MAX_SHOWS", "20"))
+# Recaps per show: the latest aired episode and the ones right before it
+RECAP_WARMUP_EPISODES = int(os.getenv("RECAP_WARMUP_EPISODES", "3"))
+# LLM calls (recaps + season digests) one warm-up cycle may spend
+RECAP_WARMUP_LLM_BUDGET = int(os.getenv("RECAP_WARMUP_LLM_BUDGET", "30"))
+# LLM slots left free for users; warm-up waits while fewer are idle
+RECAP_WARMUP_RESERVED_SLOTS = int(os.getenv("RECAP_WARMUP_RESERVED_SLOTS", "1"))
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from app.core.config import LLM_WORKERS, SCRAPER_WORKERS
+
+
+class BoundedExecutor:
+    """
+    Named, fixed-size thread pool for blocking calls made from async code.
+
+    The event loop never runs blocking SDK/browser code itself; it hands it
+    to one of these pools, so a slow call only occupies a pool thread.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        self.pending = 0
+
+    async def run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        try:
+            return await loop.run_in_executor(self._pool, partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+
+    async def iterate(self, fn, *args, **kwargs):
+        """
+        Runs a blocking generator on the pool and yields its items
+        on the event loop as they are produced.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def put(item, error=None):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+            except RuntimeError:
+                # Event loop kapandı
+                stop.set()
+
+        def produce():
+            try:
+                for item in fn(*args, **kwargs):
+                    if stop.is_set():
+                        break
+                    put(item)
+            except BaseException as e:
+                put(done, e)
+            else:
+                put(done)
+
+        self.pending += 1
+        loop.run_in_executor(self._pool, produce)
+        try:
+            while True:
+                item, error = await queue.get()
+                if item is done:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            stop.set()
+            self.pending -= 1
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {"max_workers": self.max_workers, "pending": self.pending}
+
+
+llm_executor = BoundedExecutor("llm", LLM_WORKERS)
+scraper_executor = BoundedExecutor("scraper", SCRAPER_WORKERS)
@@ -0,0 +1,5 @@
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 desteği için)
+    HTTP2_AVAILABLE = True
+except ImportError:  # h2 opsiyonel; yoksa HTTP/1.1
+    HTTP2_AVAILABLE = False
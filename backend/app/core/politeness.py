@@ -0,0 +1,98 @@
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from app.core.config import (
+    SCRAPE_HOST_CONCURRENCY,
+    SCRAPE_HOST_JITTER,
+    SCRAPE_HOST_RATE,
+    SCRAPE_HOST_RATES,
+)
+
+
+class _Host:
+    __slots__ = ("interval", "next_start", "semaphore", "in_flight", "started", "waited")
+
+    def __init__(self, rate: float, concurrency: int):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self.next_start = 0.0
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.in_flight = 0
+        self.started = 0
+        self.waited = 0.0
+
+
+class HostScheduler:
+    """
+    Central per-host politeness policy for scrapers.
+
+    Consecutive page loads to one host start 1/`rate` seconds plus a random
+    0..`jitter` seconds apart, with at most `concurrency` loads in flight
+    per host. Different hosts do not wait for each other.
+    Callers wrap each page load in `async with scheduler.slot(url)`.
+    """
+
+    def __init__(
+        self,
+        rate: float = SCRAPE_HOST_RATE,
+        jitter: float = SCRAPE_HOST_JITTER,
+        concurrency: int = SCRAPE_HOST_CONCURRENCY,
+        host_rates: dict[str, float] = SCRAPE_HOST_RATES
+    ):
+        self.rate = rate
+        self.jitter = jitter
+        self.concurrency = concurrency
+        self.host_rates = dict(host_rates)
+        self._hosts: dict[str, _Host] = {}
+        self._random = random.Random()
+
+    def _host(self, url: str) -> _Host:
+        host = (urlsplit(url).hostname or "").removeprefix("www.")
+        state = self._hosts.get(host)
+        if state is None:
+            rate = next(
+                (r for h, r in self.host_rates.items() if host == h or host.endswith(f".{h}")),
+                self.rate
+            )
+            state = self._hosts[host] = _Host(rate, self.concurrency)
+        return state
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        state = self._host(url)
+
+        async with state.semaphore:
+            # Başlangıç zamanı rezerve edilir; bekleme kilitsiz
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            start = max(now, state.next_start)
+            state.next_start = start + state.interval + self._random.uniform(0, self.jitter)
+
+            if start > now:
+                state.waited += start - now
+                await asyncio.sleep(start - now)
+
+            state.started += 1
+            state.in_flight += 1
+            try:
+                yield
+            finally:
+                state.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            host: {
+                "interval": round(state.interval, 3),
+                "started": state.started,
+                "waited_seconds": round(state.waited, 1),
+                "in_flight": state.in_flight,
+            }
+            for host, state in self._hosts.items()
+        }
+
+
+@lru_cache(maxsize=1)
+def get_host_scheduler() -> HostScheduler:
+    return HostScheduler()
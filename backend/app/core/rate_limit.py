@@ -0,0 +1,116 @@
+import asyncio
+import heapq
+import itertools
+import time
+from email.utils import parsedate_to_datetime
+
+# Priority classes (lower value is served first)
+INTERACTIVE = 0
+BULK = 1
+
+
+class TokenBucket:
+    """
+    Async token-bucket limiter with priority classes.
+
+    Tokens refill at `rate` per second up to `burst`. When no token is free,
+    callers queue and are released in priority order (INTERACTIVE before
+    BULK, FIFO within a class). pause() stops all releases for a while,
+    e.g. when the upstream answers 429 with Retry-After.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._pump: asyncio.Task | None = None
+
+        self.acquired = 0
+        self.queued = 0
+        self.pauses = 0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority: int = INTERACTIVE):
+        now = time.monotonic()
+        self._refill(now)
+        self.acquired += 1
+
+        if not self._waiters and now >= self._paused_until and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        self.queued += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.create_task(self._release_waiters())
+
+        await future
+
+    def pause(self, seconds: float):
+        """
+        Hold every caller for `seconds` (Retry-After) and drain the bucket.
+        """
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = now
+        self.pauses += 1
+
+    async def _release_waiters(self):
+        while self._waiters:
+            now = time.monotonic()
+
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            self._refill(now)
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # Bekleyen iptal edilmiş
+                continue
+
+            self._tokens -= 1
+            future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "queued": self.queued,
+            "waiting": len(self._waiters),
+            "pauses": self.pauses,
+        }
+
+
+def retry_after_seconds(value: str | None, default: float) -> float:
+    """
+    Parses a Retry-After header (delta-seconds or HTTP-date).
+    """
+    if not value:
+        return default
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,25 @@
+import dataclasses
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson opsiyonel; yoksa stdlib json
+    orjson = None
+
+
+def _default(obj):
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """
+    Serializes to compact UTF-8 JSON bytes (orjson when installed).
+    Dataclasses are encoded as objects.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
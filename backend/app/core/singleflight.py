@@ -0,0 +1,76 @@
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Hashable
+
+
+# Canlı flight'lar (stats için); bırakılan instance'lar kendiliğinden düşer
+_registry: "weakref.WeakValueDictionary[str, SingleFlight]" = weakref.WeakValueDictionary()
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    In-flight request registry.
+
+    Concurrent do() calls with the same key share one execution and all
+    waiters get the same result (or the same exception). If every waiter
+    goes away before the work finishes, the shared task is cancelled.
+
+    Per-instance flights (one per client) may share a name; later ones are
+    registered as "name#<id>" so each keeps its own stats entry.
+    """
+
+    def __init__(self, name: str):
+        if name in _registry:
+            name = f"{name}#{id(self):x}"
+        self.name = name
+        self._inflight: dict[Hashable, _Call] = {}
+
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+        _registry[name] = self
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        call = self._inflight.get(key)
+
+        if call is None:
+            self.executions += 1
+            call = _Call(asyncio.create_task(fn()))
+            self._inflight[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+
+def singleflight_stats() -> dict:
+    return {name: flight.stats() for name, flight in list(_registry.items())}
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+from app.core.config import BOOK_CORPUS_PATH, BOOK_INDEX_TTL, BOOK_PAGE_MISS_TTL
+from app.data_sources.title_index import normalize_title
+
+# Özeti alınamayan sayfa durumları
+GATED = "gated"
+MISSING = "missing"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class BookCorpus:
+    """
+    Persistent chapter-summary corpus (SQLite, WAL mode).
+
+    - index: per-book discovery result (part, chapter range, URL for every
+      summary page), kept for BOOK_INDEX_TTL seconds
+    - pages: summary page URL -> content hash
+    - texts: content hash -> extracted summary text
+    - page_misses: summary page URL -> gated / missing, kept for
+      BOOK_PAGE_MISS_TTL seconds so repeat recaps don't re-render them
+    - slugs: book title (normalized) -> site slug that was verified to work,
+      with an expiry (a fuzzy match may have picked the wrong book)
+
+    Published summaries don't change, so pages/texts never expire; texts
+    are content-addressed, identical summaries are stored once.
+    """
+
+    def __init__(
+        self,
+        path: str = BOOK_CORPUS_PATH,
+        index_ttl: int = BOOK_INDEX_TTL,
+        miss_ttl: int = BOOK_PAGE_MISS_TTL
+    ):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.index_ttl = index_ttl
+        self.miss_ttl = miss_ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS book_index (
+                slug TEXT PRIMARY KEY,
+                entries TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS page_misses (
+                url TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS texts (
+                hash TEXT PRIMARY KEY,
+                text TEXT NOT NULL
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS slugs (
+                norm TEXT PRIMARY KEY,
+                slug TEXT NOT NULL,
+                expires_at REAL
+            ) WITHOUT ROWID;
+            """
+        )
+        # Eski dosyalar: expires_at sonradan eklendi (NULL = süresi dolmuş,
+        # eski kayıtlar bir kez yeniden doğrulanır)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(slugs)")}
+        if "expires_at" not in columns:
+            self._db.execute("ALTER TABLE slugs ADD COLUMN expires_at REAL")
+
+        self.index_hits = 0
+        self.index_misses = 0
+        self.summary_hits = 0
+        self.summary_misses = 0
+        self.page_miss_hits = 0
+
+    # ------------------------
+    # Discovery index
+    # ------------------------
+    def get_index(self, slug: str) -> list[dict] | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT entries FROM book_index WHERE slug = ? AND expires_at > ?",
+                (slug, time.time()),
+            ).fetchone()
+
+        if row is None:
+            self.index_misses += 1
+            return None
+
+        self.index_hits += 1
+        return json.loads(row[0])
+
+    def put_index(self, slug: str, entries: list[dict]):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO book_index VALUES (?, ?, ?)",
+                (slug, json.dumps(entries), time.time() + self.index_ttl),
+            )
+
+    # ------------------------
+    # Verified slugs
+    # ------------------------
+    def get_slug(self, title: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT slug FROM slugs WHERE norm = ? AND expires_at > ?",
+                (normalize_title(title), time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_slug(self, title: str, slug: str, ttl: float):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO slugs (norm, slug, expires_at) VALUES (?, ?, ?)",
+                (normalize_title(title), slug, time.time() + ttl),
+            )
+
+    # ------------------------
+    # Summaries
+    # ------------------------
+    def get_summary(self, url: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT t.text FROM pages p JOIN texts t ON t.hash = p.hash WHERE p.url = ?",
+                (url,),
+            ).fetchone()
+
+        if row is None:
+            self.summary_misses += 1
+            return None
+
+        self.summary_hits += 1
+        return row[0]
+
+    def put_summary(self, url: str, text: str):
+        digest = content_hash(text)
+
+        with self._lock, self._db:
+            self._db.execute("INSERT OR IGNORE INTO texts VALUES (?, ?)", (digest, text))
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)",
+                (url, digest, time.time()),
+            )
+            self._db.execute("DELETE FROM page_misses WHERE url = ?", (url,))
+
+    def get_page_miss(self, url: str) -> str | None:
+        """
+        GATED / MISSING if the page recently gave no summary, else None.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status FROM page_misses WHERE url = ? AND expires_at > ?",
+                (url, time.time()),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        self.page_miss_hits += 1
+        return row[0]
+
+    def put_page_miss(self, url: str, status: str):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO page_misses VALUES (?, ?, ?)",
+                (url, status, time.time() + self.miss_ttl),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            books = self._db.execute("SELECT COUNT(*) FROM book_index").fetchone()[0]
+            pages = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            texts = self._db.execute("SELECT COUNT(*) FROM texts").fetchone()[0]
+            misses = self._db.execute(
+                "SELECT COUNT(*) FROM page_misses WHERE expires_at > ?", (time.time(),)
+            ).fetchone()[0]
+
+        return {
+            "books": books,
+            "pages": pages,
+            "texts": texts,
+            "page_misses": misses,
+            "index_hits": self.index_hits,
+            "index_misses": self.index_misses,
+            "summary_hits": self.summary_hits,
+            "summary_misses": self.summary_misses,
+            "page_miss_hits": self.page_miss_hits,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+@lru_cache(maxsize=1)
+def get_book_corpus() -> BookCorpus:
+    return BookCorpus()
@@ -0,0 +1,230 @@
+"""
+Long-lived headless Chromium pool for the scrapers.
+
+Browsers are launched once and kept; each one has a reusable context
+that serves up to `tabs` concurrent pages and whose route handler aborts
+images, fonts, media and third-party scripts (only the summary HTML is
+needed). A browser is health-checked before every lease and relaunched
+after `recycle_after` pages or a crash, so memory growth stays bounded.
+
+    async with get_browser_pool().page() as page:
+        await page.goto(url, wait_until="domcontentloaded")
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from playwright.async_api import Browser, BrowserContext, Error as PlaywrightError, Page, Route, async_playwright
+
+from app.core.config import (
+    BROWSER_FIRST_PARTY_HOSTS,
+    BROWSER_HEADLESS,
+    BROWSER_POOL_SIZE,
+    BROWSER_RECYCLE_PAGES,
+    BROWSER_TABS_PER_BROWSER,
+)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+LAUNCH_ARGS = ["--disable-dev-shm-usage", "--disable-gpu", "--no-first-run"]
+
+
+class _Slot:
+    __slots__ = ("index", "browser", "context", "pages", "active", "healthy", "draining", "lock")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser: Browser | None = None
+        self.context: BrowserContext | None = None
+        self.pages = 0
+        self.active = 0
+        self.healthy = True
+        self.draining = False
+        self.lock = asyncio.Lock()
+
+
+class BrowserPool:
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        tabs: int = BROWSER_TABS_PER_BROWSER,
+        recycle_after: int = BROWSER_RECYCLE_PAGES,
+        headless: bool = BROWSER_HEADLESS,
+        first_party_hosts: list[str] = BROWSER_FIRST_PARTY_HOSTS
+    ):
+        self.size = size
+        self.tabs = tabs
+        self.recycle_after = recycle_after
+        self.headless = headless
+        self.first_party_hosts = tuple(first_party_hosts)
+
+        self._playwright = None
+        self._start_lock = asyncio.Lock()
+        self._slots = [_Slot(i) for i in range(size)]
+        self._available: asyncio.Condition | None = None
+
+        self.launches = 0
+        self.recycles = 0
+        self.crashes = 0
+        self.pages = 0
+        self.blocked = 0
+
+    # ------------------------
+    # Leasing
+    # ------------------------
+    @asynccontextmanager
+    async def page(self):
+        """
+        Lends a fresh page (tab) from a pooled browser context.
+        """
+        slot = await self._acquire()
+        page: Page | None = None
+        try:
+            page = await slot.context.new_page()
+            yield page
+        except PlaywrightError:
+            # Browser/context çöktüyse slot yeniden başlatılır
+            if slot.browser is None or not slot.browser.is_connected():
+                slot.healthy = False
+            raise
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except PlaywrightError:
+                    slot.healthy = False
+            slot.pages += 1
+            self.pages += 1
+            await self._release(slot)
+
+    def _pick(self) -> _Slot | None:
+        # En az sekmesi açık, boşaltılmayan browser
+        candidates = [slot for slot in self._slots if not slot.draining and slot.active < self.tabs]
+        return min(candidates, key=lambda slot: slot.active) if candidates else None
+
+    async def _acquire(self) -> _Slot:
+        await self._start()
+        async with self._available:
+            while (slot := self._pick()) is None:
+                await self._available.wait()
+            slot.active += 1
+
+        try:
+            async with slot.lock:
+                # Health check: kopmuş browser'ı yeniden başlat
+                if slot.browser is None or not slot.browser.is_connected():
+                    if slot.browser is not None:
+                        self.crashes += 1
+                    await self._launch(slot)
+        except BaseException:
+            await self._release(slot, counted=False)
+            raise
+        return slot
+
+    async def _release(self, slot: _Slot, counted: bool = True):
+        async with self._available:
+            slot.active -= 1
+            if counted and (not slot.healthy or slot.pages >= self.recycle_after):
+                # Yeni sekme verilmez; son sekme kapanınca browser yeniden başlar
+                slot.draining = True
+
+            shutdown = slot.draining and slot.active == 0
+            if shutdown:
+                if slot.healthy:
+                    self.recycles += 1
+                else:
+                    self.crashes += 1
+            else:
+                self._available.notify_all()
+
+        if not shutdown:
+            return
+
+        # Browser kapanışı yavaş olabilir: condition dışında, sadece slot
+        # kilidiyle (draining slot'a bu arada kimse sekme açamaz)
+        async with slot.lock:
+            await self._shutdown_slot(slot)
+
+        async with self._available:
+            slot.draining = False
+            slot.healthy = True
+            self._available.notify_all()
+
+    # ------------------------
+    # Browser lifecycle
+    # ------------------------
+    async def _start(self):
+        if self._available is not None:
+            return
+        async with self._start_lock:
+            if self._available is None:
+                self._playwright = await async_playwright().start()
+                self._available = asyncio.Condition()
+
+    async def _launch(self, slot: _Slot):
+        await self._shutdown_slot(slot)
+        slot.browser = await self._playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        slot.context = await slot.browser.new_context(user_agent=USER_AGENT)
+        await slot.context.route("**/*", self._route)
+        slot.pages = 0
+        self.launches += 1
+
+    async def _shutdown_slot(self, slot: _Slot):
+        browser, slot.browser, slot.context = slot.browser, None, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except PlaywrightError:
+                pass
+
+    async def close(self):
+        for slot in self._slots:
+            await self._shutdown_slot(slot)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._available = None
+
+    # ------------------------
+    # Request filtering
+    # ------------------------
+    def _is_first_party(self, url: str) -> bool:
+        host = urlsplit(url).hostname or ""
+        return any(host == h or host.endswith(f".{h}") for h in self.first_party_hosts)
+
+    async def _route(self, route: Route):
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or (
+            request.resource_type == "script" and not self._is_first_party(request.url)
+        ):
+            self.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "tabs": self.tabs,
+            "running": sum(1 for slot in self._slots if slot.browser is not None),
+            "open_tabs": sum(slot.active for slot in self._slots),
+            "launches": self.launches,
+            "recycles": self.recycles,
+            "crashes": self.crashes,
+            "pages": self.pages,
+            "blocked_requests": self.blocked,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_browser_pool() -> BrowserPool:
+    return BrowserPool()
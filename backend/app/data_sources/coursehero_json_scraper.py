@@ -1,8 +1,39 @@
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+import asyncio
 import re
-import time
-import random
+from typing import AsyncIterator
+
+from app.core.config import BOOK_SLUG_GUESS_TTL, BOOK_SLUG_TTL
+from app.data_sources.book_corpus import GATED, MISSING, BookCorpus, get_book_corpus
+from app.data_sources.browser_pool import BrowserPool
+from app.data_sources.google_books import GoogleBooksClient, get_google_books
+from app.data_sources.html_extract import extract_summary, iter_links
+from app.data_sources.title_index import normalize_title
+from app.data_sources.tiered_fetcher import GatedContent, TieredFetcher, get_tiered_fetcher
+
+
+def book_slug(title: str) -> str:
+    # CourseHero URL slug: "Crime and Punishment" → "Crime-and-Punishment"
+    return title.strip().replace(" ", "-")
+
+
+async def slug_candidates(
+    title: str,
+    books: GoogleBooksClient | None = None,
+    corpus: BookCorpus | None = None
+) -> list[str]:
+    """
+    Slugs to try for a free-form title, best first: the slug that worked
+    before, else the title as typed, then the Google Books canonical titles
+    (typo fixes, other editions' spellings).
+    """
+    corpus = corpus or get_book_corpus()
+    verified = corpus.get_slug(title)
+    if verified:
+        return [verified]
+
+    metadata = await (books or get_google_books()).resolve(title)
+    titles = metadata.title_candidates if metadata else ()
+    return list(dict.fromkeys([book_slug(title), *(book_slug(t) for t in titles)]))
 
 
 class CourseHeroScraper:
@@ -13,19 +44,18 @@ class CourseHeroScraper:
         book_title: str,
         target_part: int,
         target_chapter: int,
-        headless: bool = True
+        fetcher: TieredFetcher | None = None,
+        corpus: BookCorpus | None = None,
+        slug_candidates: list[str] | None = None
     ):
         self.book_title = book_title
-        self.book_slug = self._normalize_title(book_title)
+        # Denenecek slug'lar (bkz. slug_candidates()); ilk çalışan kalır
+        self.slug_candidates = slug_candidates or [book_slug(book_title)]
+        self.book_slug = self.slug_candidates[0]
         self.target_part = target_part
         self.target_chapter = target_chapter
-        self.headless = headless
-
-    # --------------------------------------------------
-    # SLUG
-    # --------------------------------------------------
-    def _normalize_title(self, title: str) -> str:
-        return title.strip().replace(" ", "-")
+        self.fetcher = fetcher or get_tiered_fetcher()
+        self.corpus = corpus or get_book_corpus()
 
     # --------------------------------------------------
     # LINK FILTER (SPOILER SAFE)
@@ -83,28 +113,45 @@ class CourseHeroScraper:
     # --------------------------------------------------
     # DISCOVERY
     # --------------------------------------------------
-    def _discover_all_summaries(self, context) -> list[dict]:
-        page = context.new_page()
-        url = f"{self.BASE_URL}/{self.book_slug}/"
-
-        page.goto(url, wait_until="domcontentloaded", timeout=20000)
-        soup = BeautifulSoup(page.content(), "html.parser")
-
+    async def _discover_all_summaries(self) -> list[dict]:
+        """
+        Every summary page of the book (all parts); the part/chapter cut
+        is done in _select_until so one cached index serves every request.
+        Slug candidates are tried in order; the first that has summaries is
+        remembered for the title (briefly, if it isn't the title as typed).
+        """
+        for slug in self.slug_candidates:
+            summaries = self.corpus.get_index(slug)
+
+            if summaries is None:
+                url = f"{self.BASE_URL}/{slug}/"
+                try:
+                    summaries = await self.fetcher.fetch(url, self._parse_summary_links, timeout=20000)
+                except GatedContent:
+                    print(f"🚫 {slug}: gated content")
+                    continue
+                if not summaries:
+                    print(f"↪️ {slug}: özet listesi yok")
+                    continue
+                self.corpus.put_index(slug, summaries)
+
+            if self.corpus.get_slug(self.book_title) != slug:
+                exact = normalize_title(slug) == normalize_title(self.book_title)
+                self.corpus.put_slug(self.book_title, slug, BOOK_SLUG_TTL if exact else BOOK_SLUG_GUESS_TTL)
+            self.book_slug = slug
+            return summaries
+
+        raise RuntimeError("No valid summaries discovered")
+
+    def _parse_summary_links(self, html: str) -> list[dict] | None:
         summaries = []
 
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            text = a.get_text(strip=True)
-
+        for href, text in iter_links(html):
             if not self._is_valid_summary_link(href, text):
                 continue
 
             part, start, end = self._parse_part_and_range(href,text)
 
-            # 🔥 ASIL OLAY BURASI
-            if part > self.target_part:
-                continue   # HİÇ KEŞFETME
-
             if href.startswith("/"):
                 href = f"https://www.coursehero.com{href}"
 
@@ -115,12 +162,8 @@ class CourseHeroScraper:
                 "url": href
             })
 
-        page.close()
-
-        if not summaries:
-            raise RuntimeError("No valid summaries discovered")
-
-        return summaries
+        # Boş → link listesi yok (JS ile render ediliyor olabilir)
+        return summaries or None
 
 
     # --------------------------------------------------
@@ -154,82 +197,144 @@ class CourseHeroScraper:
     # HTML → SUMMARY
     # --------------------------------------------------
     def _extract_summary(self, html: str) -> str | None:
-        soup = BeautifulSoup(html, "html.parser")
+        # "Summary" h2'sinden sonraki <p>'ler, bir sonraki h2'ye kadar
+        return extract_summary(html)
 
-        h2 = soup.find("h2", string=lambda x: x and x.strip() == "Summary")
-        if not h2:
+    # --------------------------------------------------
+    # PAGE FETCH (HTTP first, browser if needed)
+    # --------------------------------------------------
+    def _title(self, s: dict) -> str:
+        return f"Part {s['part']} | Chapters {s['start']}-{s['end']}"
+
+    async def _load_summary(self, s: dict) -> str | None:
+        # Corpus first; only missing pages are scraped. Gated / boş sayfalar
+        # da (TTL ile) kaydedilir, tekrar recap'te browser açılmaz
+        url = s["url"]
+        summary = self.corpus.get_summary(url)
+        if summary is not None:
+            return summary
+
+        miss = self.corpus.get_page_miss(url)
+        if miss == GATED:
+            raise GatedContent(url)
+        if miss == MISSING:
             return None
 
-        paragraphs = []
-        for el in h2.find_next_siblings():
-            if el.name == "h2":
-                break
-            if el.name == "p":
-                text = el.get_text(" ", strip=True)
-                if text:
-                    paragraphs.append(text)
+        try:
+            summary = await self.fetcher.fetch(url, self._extract_summary)
+        except GatedContent:
+            self.corpus.put_page_miss(url, GATED)
+            raise
+
+        if summary:
+            self.corpus.put_summary(url, summary)
+        else:
+            self.corpus.put_page_miss(url, MISSING)
+        return summary
+
+    async def _fetch_summary(self, s: dict) -> dict | None:
+        try:
+            summary = await self._load_summary(s)
+        except GatedContent:
+            print(f"🚫 {self._title(s)}: gated content")
+            return None
 
-        return "\n\n".join(paragraphs) if paragraphs else None
+        if not summary:
+            return None
+
+        return {
+            "part": s["part"],
+            "chapter": f"{s['start']}-{s['end']}",
+            "title": self._title(s),
+            "summary": summary
+        }
 
     # --------------------------------------------------
     # PUBLIC API
     # --------------------------------------------------
-    def fetch_summaries_until(self) -> list[dict]:
-        results = []
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=self.headless)
-            context = browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                )
-            )
-            input("Devam etmek için Enter'a bas...")
-            all_summaries = self._discover_all_summaries(context)
-            print(all_summaries)
-            input("Devam etmek için Enter'a bas...")
-            required = self._select_until(all_summaries)
-
-            for s in required:
-                page = context.new_page()
-                page.goto(s["url"], wait_until="domcontentloaded", timeout=30000)
-                html = page.content()
-                page.close()
-
-                summary = self._extract_summary(html)
-                if summary:
-                    results.append({
-                        "part": s["part"],
-                        "chapters": f"{s['start']}-{s['end']}",
-                        "summary": summary
-                    })
-
-                time.sleep(random.uniform(1.5, 3.0))
-
-            browser.close()
-
+    async def stream_summaries_until(self, max_chapter: int | None = None) -> AsyncIterator[dict]:
+        """
+        Yields chapter summaries as their pages come in (completion order).
+        Pages load concurrently; the host scheduler paces them.
+        """
+        if max_chapter is not None:
+            self.target_chapter = max_chapter
+
+        all_summaries = await self._discover_all_summaries()
+        required = self._select_until(all_summaries)
+
+        tasks = [asyncio.create_task(self._fetch_summary(s)) for s in required]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def prefetch_all(self) -> dict:
+        """
+        Fills the corpus with every summary page of the book (all parts)
+        and reports which entries are gated, missing or failed.
+        """
+        entries = await self._discover_all_summaries()
+
+        async def prefetch(s: dict) -> str:
+            try:
+                return "ok" if await self._load_summary(s) else "missing"
+            except GatedContent:
+                return "gated"
+            except Exception as e:
+                print(f"⚠️ {self._title(s)}: {e}")
+                return "failed"
+
+        statuses = await asyncio.gather(*(prefetch(s) for s in entries))
+
+        report = {"entries": len(entries), "ok": 0, "gated": [], "missing": [], "failed": []}
+        for s, status in zip(entries, statuses):
+            if status == "ok":
+                report["ok"] += 1
+            else:
+                report[status].append(self._title(s))
+        return report
+
+    async def fetch_summaries_until(self, max_chapter: int | None = None) -> list[dict]:
+        """
+        BookRecapService chapter_source arayüzü: target part içinde
+        max_chapter'a kadar (verilmezse target_chapter) özetleri döner.
+        """
+        results = [s async for s in self.stream_summaries_until(max_chapter)]
+
+        # Stream tamamlanma sırasıyla gelir; hikâye sırasına diz
+        results.sort(key=lambda s: (s["part"], int(s["chapter"].split("-")[0])))
         return results
 
 
-def main():
+async def main():
+    # Debug: görünür tek browser'lık ayrı pool
+    pool = BrowserPool(size=1, headless=False)
+    fetcher = TieredFetcher(pool=pool)
     scraper = CourseHeroScraper(
         book_title="Crime and Punishment",
         target_part=2,
         target_chapter=3,
-        headless=False
+        fetcher=fetcher
     )
 
-    summaries = scraper.fetch_summaries_until()
+    try:
+        summaries = await scraper.fetch_summaries_until()
+    finally:
+        await fetcher.aclose()
+        await pool.close()
 
     print("\n===== FINAL SCRAPE RESULT =====\n")
 
     for s in summaries:
-        print(f"Part {s['part']} | Chapters {s['chapters']}")
+        print(s["title"])
         print(s["summary"])
         print("\n" + "=" * 60 + "\n")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,16 +1,22 @@
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
-import time
-import random
+import asyncio
+
+from app.data_sources.browser_pool import BrowserPool
+from app.data_sources.html_extract import extract_summary
+from app.data_sources.tiered_fetcher import GatedContent, TieredFetcher, get_tiered_fetcher
 
 ##YEDEK MIMARI
 class CourseHeroScraper:
     BASE_URL = "https://www.coursehero.com/lit"
 
-    def __init__(self, book_slug: str, book_part: int = 1, headless: bool = True):
+    def __init__(
+        self,
+        book_slug: str,
+        book_part: int = 1,
+        fetcher: TieredFetcher | None = None
+    ):
         self.book_slug = book_slug
         self.book_part = book_part
-        self.headless = headless
+        self.fetcher = fetcher or get_tiered_fetcher()
 
     # ---------------------------
     # URL BUILDER
@@ -25,99 +31,65 @@ class CourseHeroScraper:
     # HTML → SUMMARY PARSER
     # ---------------------------
     def _extract_summary_from_html(self, html: str) -> str | None:
-        soup = BeautifulSoup(html, "html.parser")
-
-        h2 = soup.find("h2", string=lambda x: x and x.strip() == "Summary")
-        if not h2:
-            return None
-
-        paragraphs = []
-        for el in h2.find_next_siblings():
-            if el.name == "h2":  # Analysis / Themes'e gelince dur
-                break
-            if el.name == "p":
-                text = el.get_text(" ", strip=True)
-                if text:
-                    paragraphs.append(text)
-
-        if not paragraphs:
-            return None
-
-        return "\n\n".join(paragraphs)
+        # "Summary" h2 → Analysis / Themes h2'sine kadar olan <p>'ler
+        return extract_summary(html)
 
     # ---------------------------
     # SINGLE CHAPTER FETCH
     # ---------------------------
-    def fetch_chapter_summary(self, context, chapter: int) -> dict | None:
-        page = context.new_page()
+    async def fetch_chapter_summary(self, chapter: int) -> dict | None:
         url = self._build_chapter_url(chapter)
 
+        # HTTP → gerekirse browser
         try:
-            page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            html = page.content()
-
-            # gated check
-            if "Sign up to unlock" in html or "Create a free account" in html:
-                print(f"🚫 Chapter {chapter}: gated content")
-                return None
-
-            summary = self._extract_summary_from_html(html)
-            if not summary:
-                print(f"⚠️ Chapter {chapter}: summary bulunamadı")
-                return None
+            summary = await self.fetcher.fetch(url, self._extract_summary_from_html)
+        except GatedContent:
+            print(f"🚫 Chapter {chapter}: gated content")
+            return None
 
-            return {
-                "chapter": chapter,
-                "title": f"Book {self.book_part} | Chapter {chapter}",
-                "summary": summary
-            }
+        if not summary:
+            print(f"⚠️ Chapter {chapter}: summary bulunamadı")
+            return None
 
-        finally:
-            page.close()
+        return {
+            "chapter": chapter,
+            "title": f"Book {self.book_part} | Chapter {chapter}",
+            "summary": summary
+        }
 
     # ---------------------------
     # MULTI CHAPTER LOOP
     # ---------------------------
-    def fetch_summaries_until(self, max_chapter: int) -> list:
-        results = []
-
-        with sync_playwright() as p:
-            print(">>> Browser launching <<<")
-            browser = p.chromium.launch(headless=self.headless)
-            context = browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                )
-            )
-
-            for chapter in range(1, max_chapter + 1):
-                print(f"📘 Fetching chapter {chapter}...")
-                data = self.fetch_chapter_summary(context, chapter)
-                if data:
-                    results.append(data)
-
-                time.sleep(random.uniform(1.8, 3.5))
-
-            browser.close()
+    async def fetch_summaries_until(self, max_chapter: int) -> list:
+        # Bölümler paralel; hız/jitter host scheduler'da
+        print(f"📘 Fetching chapters 1-{max_chapter}...")
+        chapters = await asyncio.gather(*(
+            self.fetch_chapter_summary(chapter)
+            for chapter in range(1, max_chapter + 1)
+        ))
 
-        return results
+        return [data for data in chapters if data]
 
 
 # =========================================================
 # MAIN / ENTRYPOINT
 # =========================================================
-if __name__ == "__main__":
+async def main():
     print(">>> MAIN START <<<")
 
+    pool = BrowserPool(size=1, headless=False)  # debug için görünür browser
+    fetcher = TieredFetcher(pool=pool)
     scraper = CourseHeroScraper(
         book_slug="1984",
         book_part=2,
-        headless=False  # debug için False
+        fetcher=fetcher
     )
 
-    chapters = scraper.fetch_summaries_until(6)
+    try:
+        chapters = await scraper.fetch_summaries_until(6)
+    finally:
+        await fetcher.aclose()
+        await pool.close()
 
     print("\n>>> RESULTS <<<")
     for ch in chapters:
@@ -125,3 +97,7 @@ if __name__ == "__main__":
         print(ch["summary"])
 
     print("\n>>> MAIN END <<<")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
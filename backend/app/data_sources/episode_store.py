@@ -0,0 +1,195 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from functools import lru_cache
+
+from app.core.config import (
+    EPISODE_IMMUTABLE_AFTER_DAYS,
+    EPISODE_STORE_PATH,
+    EPISODE_TTL_RECENT,
+    EPISODE_TTL_UPCOMING,
+    TV_DETAILS_TTL,
+)
+
+
+def episode_expires_at(ep: dict, now: float) -> float | None:
+    """
+    TTL policy for one episode (TMDB shape): None once it aired more than
+    EPISODE_IMMUTABLE_AFTER_DAYS ago with a non-empty overview, else a
+    short expiry, since TMDB may still fill in or edit it.
+    """
+    air_date = ep.get("air_date")
+    today = date.fromtimestamp(now)
+
+    try:
+        aired = date.fromisoformat(air_date) if air_date else None
+    except ValueError:
+        aired = None
+
+    # Yayınlanmamış ya da tarihi belli değil → kısa ömürlü
+    if aired is None or aired > today:
+        return now + EPISODE_TTL_UPCOMING
+
+    old = aired <= today - timedelta(days=EPISODE_IMMUTABLE_AFTER_DAYS)
+    if old and (ep.get("overview") or "").strip():
+        return None
+
+    return now + EPISODE_TTL_RECENT
+
+
+class EpisodeStore:
+    """
+    Persistent episode-overview store (SQLite, WAL mode).
+
+    Keyed by tv_id / season / episode / language. Episodes that aired more
+    than EPISODE_IMMUTABLE_AFTER_DAYS ago with a non-empty overview never
+    expire; recent episodes and upcoming ones get short TTLs so late
+    TMDB edits are picked up.
+
+    Each put_season also records how many episodes TMDB returned for the
+    season (kept TV_DETAILS_TTL), so asking for more episodes than the
+    season has is still a hit.
+    """
+
+    def __init__(self, path: str = EPISODE_STORE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS episodes (
+                tv_id INTEGER NOT NULL,
+                language TEXT NOT NULL,
+                season INTEGER NOT NULL,
+                episode INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                overview TEXT NOT NULL,
+                air_date TEXT,
+                fetched_at REAL NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (tv_id, language, season, episode)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS tv_details (
+                tv_id INTEGER NOT NULL,
+                language TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (tv_id, language)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS season_sizes (
+                tv_id INTEGER NOT NULL,
+                language TEXT NOT NULL,
+                season INTEGER NOT NULL,
+                episode_count INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (tv_id, language, season)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    # ------------------------
+    # Episodes
+    # ------------------------
+    def get_season(self, tv_id: int, season: int, language: str, upto: int) -> list[dict] | None:
+        """
+        Returns episodes 1..upto of a season, or None if any of them is
+        missing or expired. Episodes past the season's stored size are not
+        expected (upto may exceed the real episode count).
+        """
+        now = time.time()
+
+        with self._lock:
+            size = self._db.execute(
+                """
+                SELECT episode_count FROM season_sizes
+                WHERE tv_id = ? AND language = ? AND season = ? AND expires_at > ?
+                """,
+                (tv_id, language, season, now),
+            ).fetchone()
+            rows = self._db.execute(
+                """
+                SELECT episode, name, overview, air_date FROM episodes
+                WHERE tv_id = ? AND language = ? AND season = ? AND episode <= ?
+                  AND (expires_at IS NULL OR expires_at > ?)
+                ORDER BY episode
+                """,
+                (tv_id, language, season, upto, now),
+            ).fetchall()
+
+        expected = min(upto, size[0]) if size else upto
+        if len(rows) < expected:
+            return None
+
+        return [
+            {
+                "episode_number": episode,
+                "name": name,
+                "overview": overview,
+                "air_date": air_date,
+            }
+            for episode, name, overview, air_date in rows
+        ]
+
+    def put_season(self, tv_id: int, season: int, language: str, episodes: list[dict]):
+        now = time.time()
+        rows = [
+            (
+                tv_id,
+                language,
+                season,
+                ep["episode_number"],
+                ep.get("name") or "",
+                ep.get("overview") or "",
+                ep.get("air_date"),
+                now,
+                episode_expires_at(ep, now),
+            )
+            for ep in episodes
+        ]
+
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO season_sizes VALUES (?, ?, ?, ?, ?)",
+                (tv_id, language, season, len(episodes), now + TV_DETAILS_TTL),
+            )
+
+    # ------------------------
+    # TV details (season list)
+    # ------------------------
+    def get_details(self, tv_id: int, language: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM tv_details WHERE tv_id = ? AND language = ? AND expires_at > ?",
+                (tv_id, language, time.time()),
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def put_details(self, tv_id: int, language: str, details: dict):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO tv_details VALUES (?, ?, ?, ?)",
+                (tv_id, language, json.dumps(details), time.time() + TV_DETAILS_TTL),
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+@lru_cache(maxsize=1)
+def get_episode_store() -> EpisodeStore:
+    return EpisodeStore()
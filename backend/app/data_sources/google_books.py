@@ -0,0 +1,324 @@
+"""
+Google Books metadata source.
+
+Resolves a free-form book title (case, accents and Turkish characters
+folded, typos tolerated within GOOGLE_BOOKS_MATCH_MIN) to a canonical
+title, its authors and a short list of title candidates for building
+scraper URLs, English editions first:
+
+    python -m app.data_sources.google_books "crime and punishment"
+
+A title that only matches a non-English edition ("Suç ve Ceza") is a
+translation; the English original is then looked up by author
+(inauthor:, English only) and taken if one work clearly leads on ratings
+(the TitleIndex margin rule, on each work's share of the ratings).
+
+Results (and misses) are kept in a local SQLite cache, so each title hits
+the API once per GOOGLE_BOOKS_TTL. Set GOOGLE_BOOKS_BASE_URL to a stand-in
+server (benchmarks/google_books_standin.py) to run offline.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+import httpx
+
+from app.core.config import (
+    BOOK_METADATA_PATH,
+    GOOGLE_BOOKS_API_KEY,
+    GOOGLE_BOOKS_BASE_URL,
+    GOOGLE_BOOKS_MATCH_MIN,
+    GOOGLE_BOOKS_NEGATIVE_TTL,
+    GOOGLE_BOOKS_TIMEOUT,
+    GOOGLE_BOOKS_TTL,
+)
+from app.core.singleflight import SingleFlight
+from app.data_sources.title_index import FUZZY_MARGIN, normalize_title
+
+# En fazla bu kadar başlık adayı döner (her aday bir URL denemesi demek)
+MAX_TITLE_CANDIDATES = 3
+
+
+@dataclass(slots=True, frozen=True)
+class BookMetadata:
+    title: str                          # canonical title
+    authors: tuple[str, ...]
+    language: str
+    title_candidates: tuple[str, ...]   # URL'ler için, en olası önce
+
+
+def clean_title(title: str) -> str:
+    """
+    Drops edition noise: "Crime and Punishment (Penguin Classics)" -> "Crime and Punishment".
+    """
+    title = re.sub(r"\s*[\(\[].*?[\)\]]\s*", " ", title)
+    return re.sub(r"\s+", " ", title).strip(" :-")
+
+
+class BookMetadataCache:
+    """
+    Persistent title -> BookMetadata cache (SQLite, WAL mode), keyed by the
+    normalized query title. Misses are cached too, for a shorter time.
+    """
+
+    def __init__(self, path: str = BOOK_METADATA_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS books (
+                norm TEXT PRIMARY KEY,
+                payload TEXT,
+                expires_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+
+    def get(self, norm: str) -> tuple[bool, BookMetadata | None]:
+        """
+        (found, metadata); found with metadata None is a cached miss.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM books WHERE norm = ? AND expires_at > ?",
+                (norm, time.time()),
+            ).fetchone()
+
+        if row is None:
+            return False, None
+        if row[0] is None:
+            return True, None
+
+        data = json.loads(row[0])
+        return True, BookMetadata(
+            title=data["title"],
+            authors=tuple(data["authors"]),
+            language=data["language"],
+            title_candidates=tuple(data["title_candidates"]),
+        )
+
+    def put(self, norm: str, metadata: BookMetadata | None):
+        payload = json.dumps(asdict(metadata), ensure_ascii=False) if metadata else None
+        ttl = GOOGLE_BOOKS_TTL if metadata else GOOGLE_BOOKS_NEGATIVE_TTL
+
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO books VALUES (?, ?, ?)",
+                (norm, payload, time.time() + ttl),
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class GoogleBooksClient:
+
+    def __init__(
+        self,
+        base_url: str = GOOGLE_BOOKS_BASE_URL,
+        api_key: str | None = GOOGLE_BOOKS_API_KEY,
+        timeout: float = GOOGLE_BOOKS_TIMEOUT,
+        cache: BookMetadataCache | None = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.cache = cache
+        self._http: httpx.AsyncClient | None = None
+        # Aynı başlık için eşzamanlı çözümlemeler tek API çağrısı
+        self._flight = SingleFlight("google_books")
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(timeout=self.timeout)
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    # ------------------------
+    # Resolve
+    # ------------------------
+    async def resolve(self, title: str) -> BookMetadata | None:
+        """
+        Canonical metadata for a free-form title, or None if no edition
+        matches. Network errors also give None (not cached).
+        """
+        norm = normalize_title(title)
+        if not norm:
+            return None
+
+        if self.cache:
+            found, metadata = self.cache.get(norm)
+            if found:
+                self.hits += 1
+                return metadata
+
+        self.misses += 1
+        return await self._flight.do(norm, lambda: self._resolve(title, norm))
+
+    async def _resolve(self, title: str, norm: str) -> BookMetadata | None:
+        try:
+            metadata = self._pick(norm, await self._search(f"intitle:{title}"))
+            if metadata and not metadata.language.startswith("en") and metadata.authors:
+                metadata = await self._with_original(metadata)
+        except (httpx.HTTPError, ValueError) as e:
+            self.errors += 1
+            print(f"Google Books araması başarısız ({title}): {e}")
+            return None
+
+        if self.cache:
+            self.cache.put(norm, metadata)
+        return metadata
+
+    async def _with_original(self, metadata: BookMetadata) -> BookMetadata:
+        """
+        Translated edition -> the English original first among its title
+        candidates (the translated titles stay as fallbacks).
+        """
+        original = await self._original_work(metadata.authors[0])
+        if original is None:
+            return metadata
+
+        candidates = dict.fromkeys([original.title, *metadata.title_candidates])
+        return BookMetadata(
+            title=original.title,
+            authors=original.authors,
+            language=original.language,
+            title_candidates=tuple(candidates)[:MAX_TITLE_CANDIDATES],
+        )
+
+    async def _original_work(self, author: str) -> BookMetadata | None:
+        # Yazar araması da cache'lenir (aynı yazarın başka çevirileri için)
+        key = f"inauthor:{normalize_title(author)}"
+        if self.cache:
+            found, original = self.cache.get(key)
+            if found:
+                return original
+
+        volumes = await self._search(f'inauthor:"{author}"', langRestrict="en")
+        original = self._pick_leading_work(volumes)
+        if self.cache:
+            self.cache.put(key, original)
+        return original
+
+    def _pick_leading_work(self, volumes: list[dict]) -> BookMetadata | None:
+        # Başlık başına (baskılar birleşik) toplam puan sayısı
+        works: dict[str, list] = {}
+        for info in volumes:
+            title = clean_title(info.get("title") or "")
+            if not title or not (info.get("language") or "").startswith("en"):
+                continue
+            work = works.setdefault(normalize_title(title), [0, title, info])
+            work[0] += info.get("ratingsCount") or 0
+
+        total = sum(ratings for ratings, _, _ in works.values())
+        if not total:
+            return None
+
+        ranked = sorted(works.values(), key=lambda w: w[0], reverse=True)
+        top_ratings, title, info = ranked[0]
+        # Yazarın başka bir eseri neredeyse aynı popülerlikteyse emin değiliz
+        if len(ranked) > 1 and ranked[1][0] / total >= top_ratings / total - FUZZY_MARGIN:
+            return None
+
+        return BookMetadata(
+            title=title,
+            authors=tuple(info.get("authors") or ()),
+            language=info.get("language") or "",
+            title_candidates=(title,),
+        )
+
+    async def _search(self, query: str, **extra) -> list[dict]:
+        params = {
+            "q": query,
+            "printType": "books",
+            "maxResults": 20,
+            "fields": "items(volumeInfo(title,authors,language,ratingsCount))",
+            **extra,
+        }
+        if self.api_key:
+            params["key"] = self.api_key
+
+        response = await self._client().get(f"{self.base_url}/volumes", params=params)
+        response.raise_for_status()
+        return [item.get("volumeInfo", {}) for item in response.json().get("items", [])]
+
+    def _pick(self, norm: str, volumes: list[dict]) -> BookMetadata | None:
+        matches = []
+        for info in volumes:
+            title = clean_title(info.get("title") or "")
+            if not title:
+                continue
+
+            score = SequenceMatcher(None, norm, normalize_title(title)).ratio()
+            if score < GOOGLE_BOOKS_MATCH_MIN:
+                continue
+
+            english = (info.get("language") or "").startswith("en")
+            rank = (english, round(score, 2), info.get("ratingsCount") or 0)
+            matches.append((rank, title, info))
+
+        if not matches:
+            return None
+
+        matches.sort(key=lambda m: m[0], reverse=True)
+        _, title, info = matches[0]
+
+        # Aynı başlığın farklı yazımları tek aday
+        candidates = {}
+        for _, candidate, _ in matches:
+            candidates.setdefault(normalize_title(candidate), candidate)
+
+        return BookMetadata(
+            title=title,
+            authors=tuple(info.get("authors") or ()),
+            language=info.get("language") or "",
+            title_candidates=tuple(candidates.values())[:MAX_TITLE_CANDIDATES],
+        )
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+@lru_cache(maxsize=1)
+def get_google_books() -> GoogleBooksClient:
+    return GoogleBooksClient(cache=BookMetadataCache())
+
+
+async def main():
+    client = get_google_books()
+    try:
+        metadata = await client.resolve(" ".join(sys.argv[1:]))
+    finally:
+        await client.aclose()
+
+    if metadata is None:
+        print("❌ Bulunamadı")
+        sys.exit(1)
+    print(json.dumps(asdict(metadata), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
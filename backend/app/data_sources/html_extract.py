@@ -0,0 +1,193 @@
+"""
+HTML extraction helpers for the CourseHero scrapers.
+
+Two implementations:
+- BeautifulSoup + html.parser: the reference
+- lxml (C parser, XPath picks only the nodes we need), ~10x faster; the
+  default when lxml is installed (HTML_EXTRACT_LXML=0 turns it off)
+
+Both give the same output on well-formed pages, but the two parsers repair
+broken markup differently. Known cases:
+- block element inside <p> (<p>a<div>b</div>c</p>): html.parser keeps
+  the nesting ("a b c"), lxml closes the <p> before the <div> ("a")
+- unclosed <p>s before the next heading (<p>one<p>two<h2>Next</h2>):
+  html.parser nests everything into the first <p>, so the heading ends up
+  inside it ("one two Next"); lxml closes each <p> ("one\n\ntwo")
+- nested <a>s: html.parser nests them (outer text "xy"), lxml closes the
+  outer one ("x")
+
+So the lxml path first scans the page's tags (one regex pass) and hands
+pages with markup like that to bs4; its output always matches bs4. Parity
+check (synthetic pages plus the broken-markup cases above):
+
+    python -m benchmarks.bench_html_extract [--fixtures <saved pages dir>]
+"""
+
+import re
+
+from typing import Iterator
+
+from bs4 import BeautifulSoup
+
+from app.core.config import HTML_EXTRACT_LXML
+
+try:
+    import lxml.etree
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:  # lxml opsiyonel; yoksa bs4 + html.parser
+    LXML_AVAILABLE = False
+
+
+SECTION_HEADING = "Summary"
+
+# Tag'ler: html.parser ile lxml'in farklı onardığı yapıları yakalamak için
+_BLOCK_TAGS = (
+    "p|div|ul|ol|dl|li|table|h[1-6]|blockquote|section|article|aside|header"
+    "|footer|nav|main|form|pre|hr|figure|address|fieldset"
+)
+_STRUCTURE_TAG = re.compile(rf"<(/?)({_BLOCK_TAGS}|a)(?=[\s/>])", re.I)
+
+
+# ------------------------
+# BeautifulSoup (reference)
+# ------------------------
+def extract_summary_bs4(html: str) -> str | None:
+    soup = BeautifulSoup(html, "html.parser")
+
+    h2 = soup.find("h2", string=lambda x: x and x.strip() == SECTION_HEADING)
+    if not h2:
+        return None
+
+    paragraphs = []
+    for el in h2.find_next_siblings():
+        if el.name == "h2":  # Analysis / Themes'e gelince dur
+            break
+        if el.name == "p":
+            text = el.get_text(" ", strip=True)
+            if text:
+                paragraphs.append(text)
+
+    return "\n\n".join(paragraphs) if paragraphs else None
+
+
+def iter_links_bs4(html: str) -> Iterator[tuple[str, str]]:
+    soup = BeautifulSoup(html, "html.parser")
+    for a in soup.find_all("a", href=True):
+        yield a["href"], a.get_text(strip=True)
+
+
+# ------------------------
+# lxml
+# ------------------------
+def _single_string(el) -> str | None:
+    """
+    bs4's Tag.string: the text of an element whose only child is one
+    string (or one element that itself has a single string).
+    """
+    if len(el) == 0:
+        return el.text
+    if len(el) == 1 and not el.text and not el[0].tail and isinstance(el[0].tag, str):
+        return _single_string(el[0])
+    return None
+
+
+def _text(el, separator: str = "") -> str:
+    # get_text(strip=True): her metin parçası kırpılır, boşlar atlanır
+    return separator.join(
+        piece.strip()
+        for piece in el.xpath(".//text()[not(parent::script or parent::style)]")
+        if piece.strip()
+    )
+
+
+def _repairs_agree(html: str) -> bool:
+    """
+    False if the page has markup the two parsers repair differently: a
+    block element (or another <p>) inside an open <p>, a stray or missing
+    </p>, a block element inside <a>, nested or unclosed <a>s. Strict on
+    purpose; a false alarm only costs a bs4 parse.
+    """
+    p_open = a_open = False
+    for closing, tag in _STRUCTURE_TAG.findall(html):
+        tag = tag.lower()
+
+        if tag == "a":
+            if bool(closing) != a_open:  # <a> içinde <a> ya da sahipsiz </a>
+                return False
+            a_open = not closing
+            continue
+
+        if tag == "p" and closing:
+            if not p_open:
+                return False
+            p_open = False
+        elif p_open or a_open:
+            return False
+        elif tag == "p":
+            p_open = True
+
+    return not p_open and not a_open
+
+
+def _parse(html: str):
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # <?xml encoding=...?> bildirimli str → bytes olarak parse et
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+    except lxml.etree.ParserError:
+        # Boş doküman
+        return None
+
+
+def extract_summary_lxml(html: str) -> str | None:
+    doc = _parse(html)
+    if doc is None:
+        return None
+
+    h2 = next(
+        (el for el in doc.iter("h2") if (_single_string(el) or "").strip() == SECTION_HEADING),
+        None,
+    )
+    if h2 is None:
+        return None
+
+    paragraphs = []
+    for el in h2.itersiblings():
+        if el.tag == "h2":
+            break
+        if el.tag == "p":
+            text = _text(el, " ")
+            if text:
+                paragraphs.append(text)
+
+    return "\n\n".join(paragraphs) if paragraphs else None
+
+
+def iter_links_lxml(html: str) -> Iterator[tuple[str, str]]:
+    doc = _parse(html)
+    if doc is None:
+        return
+    for a in doc.xpath("//a[@href]"):
+        yield a.get("href"), _text(a)
+
+
+def extract_summary_fast(html: str) -> str | None:
+    if _repairs_agree(html):
+        return extract_summary_lxml(html)
+    return extract_summary_bs4(html)
+
+
+def iter_links_fast(html: str) -> Iterator[tuple[str, str]]:
+    if _repairs_agree(html):
+        return iter_links_lxml(html)
+    return iter_links_bs4(html)
+
+
+if LXML_AVAILABLE and HTML_EXTRACT_LXML:
+    extract_summary = extract_summary_fast
+    iter_links = iter_links_fast
+else:
+    extract_summary = extract_summary_bs4
+    iter_links = iter_links_bs4
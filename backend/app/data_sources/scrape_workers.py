@@ -0,0 +1,514 @@
+"""
+Process-isolated book scraping.
+
+Scrapes run in a fixed set of worker processes, each with its own event
+loop, browser pool (one Chromium) and tiered fetcher; the API process
+only sends a task and waits for the result over a multiprocessing Pipe.
+A hung or bloated browser therefore costs a worker, never the API:
+
+- task timeout: the worker (and its browser processes) is killed and
+  replaced, the caller gets asyncio.TimeoutError
+- caller cancelled (client disconnected): the task still runs to the end
+  in the worker, so its pages reach the corpus; the worker is not killed
+- memory: while a task runs, the worker's process tree RSS is polled
+  (Linux /proc) and the worker is killed past max_rss_mb
+- recycling: a worker is retired after max_tasks tasks or when it is
+  over the memory limit between tasks
+- queue depth: at most max_queue callers wait for a free worker, the
+  rest get ScrapeQueueFull right away
+
+The per-host politeness rate and concurrency are split across the
+workers, so the pool as a whole keeps the configured pace and at most
+SCRAPE_HOST_CONCURRENCY pages in flight per host (each worker keeps at
+least one, so with more workers than that the cap is the worker count).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from functools import lru_cache
+
+from app.core.config import (
+    SCRAPE_HOST_CONCURRENCY,
+    SCRAPE_HOST_RATE,
+    SCRAPE_HOST_RATES,
+    SCRAPE_PROCESS_MAX_RSS_MB,
+    SCRAPE_PROCESS_MAX_TASKS,
+    SCRAPE_PROCESS_QUEUE,
+    SCRAPE_PROCESSES,
+    SCRAPE_TASK_TIMEOUT,
+)
+from app.data_sources.coursehero_json_scraper import CourseHeroScraper, slug_candidates
+
+# Görev sürerken bellek kontrol aralığı (saniye)
+MEMORY_POLL_INTERVAL = 1.0
+# Emekliye ayrılan worker'ın kendiliğinden kapanması için süre
+RETIRE_GRACE = 10.0
+
+
+class ScrapeQueueFull(Exception):
+    pass
+
+
+class ScrapeError(RuntimeError):
+    """The scrape itself failed inside the worker (worker is fine)."""
+
+
+class ScrapeWorkerLost(RuntimeError):
+    """The worker crashed or was killed for exceeding its memory limit."""
+
+
+# ------------------------
+# Worker process side
+# ------------------------
+async def _summaries_until(scraper_kwargs: dict, fetcher) -> dict:
+    # Doğrulanan slug da döner (parent tarafında cache key için)
+    scraper = CourseHeroScraper(**scraper_kwargs, fetcher=fetcher)
+    summaries = await scraper.fetch_summaries_until()
+    return {"slug": scraper.book_slug, "summaries": summaries}
+
+
+async def _prefetch_all(scraper_kwargs: dict, fetcher) -> dict:
+    scraper = CourseHeroScraper(**scraper_kwargs, fetcher=fetcher)
+    return await scraper.prefetch_all()
+
+
+TASKS = {
+    "summaries_until": _summaries_until,
+    "prefetch_all": _prefetch_all,
+}
+
+
+def _recv(conn):
+    try:
+        return conn.recv()
+    except (EOFError, OSError):
+        return None
+
+
+async def _serve(conn, processes: int):
+    # Ağır importlar sadece worker'da
+    from app.core.politeness import HostScheduler
+    from app.data_sources.browser_pool import BrowserPool
+    from app.data_sources.tiered_fetcher import TieredFetcher
+
+    # Politeness bütçesi worker'lar arasında bölünür: hız ve eşzamanlı
+    # sayfa sayısı (her worker'a en az bir slot)
+    scheduler = HostScheduler(
+        rate=SCRAPE_HOST_RATE / processes,
+        concurrency=max(1, SCRAPE_HOST_CONCURRENCY // processes),
+        host_rates={host: rate / processes for host, rate in SCRAPE_HOST_RATES.items()}
+    )
+    pool = BrowserPool(size=1)
+    fetcher = TieredFetcher(pool=pool, scheduler=scheduler)
+    loop = asyncio.get_running_loop()
+
+    try:
+        while True:
+            message = await loop.run_in_executor(None, _recv, conn)
+            if message is None:
+                break
+
+            task, kwargs = message
+            try:
+                result = await TASKS[task](kwargs, fetcher)
+            except Exception as e:
+                conn.send((False, f"{type(e).__name__}: {e}"))
+            else:
+                conn.send((True, result))
+    finally:
+        await fetcher.aclose()
+        await pool.close()
+
+
+def _worker_main(conn, processes: int):
+    # Ctrl+C API sürecine gider; worker'ları parent kapatır
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_serve(conn, processes))
+
+
+# ------------------------
+# Process tree helpers (Linux /proc; elsewhere only the worker itself)
+# ------------------------
+def _process_tree(pid: int) -> list[int]:
+    pids = [pid]
+    for current in pids:
+        try:
+            tids = os.listdir(f"/proc/{current}/task")
+        except OSError:
+            continue
+        for tid in tids:
+            try:
+                with open(f"/proc/{current}/task/{tid}/children") as f:
+                    pids.extend(int(child) for child in f.read().split())
+            except OSError:
+                continue
+    return pids
+
+
+def _tree_rss_mb(pid: int) -> float | None:
+    if not os.path.isdir("/proc"):
+        return None
+
+    total_kb = 0
+    for member in _process_tree(pid):
+        try:
+            with open(f"/proc/{member}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def _kill_tree(pid: int):
+    # Chromium kendi process grubunda; tek tek öldürülür (önce çocuklar)
+    for member in reversed(_process_tree(pid)):
+        try:
+            os.kill(member, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+# ------------------------
+# API process side
+# ------------------------
+class _Worker:
+    __slots__ = ("process", "conn", "tasks", "started_at")
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.tasks = 0
+        self.started_at = time.monotonic()
+
+
+class ScrapeWorkerPool:
+
+    def __init__(
+        self,
+        processes: int = SCRAPE_PROCESSES,
+        max_queue: int = SCRAPE_PROCESS_QUEUE,
+        task_timeout: float = SCRAPE_TASK_TIMEOUT,
+        max_tasks: int = SCRAPE_PROCESS_MAX_TASKS,
+        max_rss_mb: int = SCRAPE_PROCESS_MAX_RSS_MB,
+        mp_context: str = "spawn"
+    ):
+        self.processes = processes
+        self.max_queue = max_queue
+        self.task_timeout = task_timeout
+        self.max_tasks = max_tasks
+        self.max_rss_mb = max_rss_mb
+        self._ctx = multiprocessing.get_context(mp_context)
+
+        self._idle: asyncio.Queue[_Worker] | None = None
+        self._workers: set[_Worker] = set()
+        self._supervisors: set[asyncio.Task] = set()
+        self._background_tasks: set[asyncio.Task] = set()
+        self._closing = False
+        self.waiting = 0
+
+        self.tasks = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.memory_kills = 0
+        self.recycles = 0
+        self.rejected = 0
+        self.detached = 0
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.processes),
+            name="scrape-worker",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+
+        worker = _Worker(process, parent_conn)
+        self._workers.add(worker)
+        return worker
+
+    def _kill(self, worker: _Worker):
+        """
+        SIGKILLs the worker's process tree; the exit is reaped in the background.
+        """
+        if worker.process.pid is not None:
+            _kill_tree(worker.process.pid)
+        self._workers.discard(worker)
+        self._background(self._reap(worker))
+
+    async def _reap(self, worker: _Worker):
+        # join bloklayıcı: executor'da, event loop durmadan
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, worker.process.join, RETIRE_GRACE)
+        worker.conn.close()
+
+    def _replace(self, worker: _Worker):
+        self._kill(worker)
+        if not self._closing:
+            self._idle.put_nowait(self._spawn())
+
+    def _background(self, coro, tasks: set[asyncio.Task] | None = None) -> asyncio.Task:
+        tasks = self._background_tasks if tasks is None else tasks
+        task = asyncio.create_task(coro)
+        tasks.add(task)
+
+        def done(_):
+            tasks.discard(task)
+            # Sonucu kimse beklemiyorsa hata "never retrieved" uyarısı olmasın
+            if not task.cancelled():
+                task.exception()
+
+        task.add_done_callback(done)
+        return task
+
+    async def _retire(self, worker: _Worker):
+        """
+        Lets a worker close its browser and exit; killed if it doesn't.
+        """
+        self._workers.discard(worker)
+        try:
+            worker.conn.send(None)
+        except OSError:
+            pass
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, worker.process.join, RETIRE_GRACE)
+        if worker.process.is_alive():
+            self._kill(worker)
+        else:
+            worker.conn.close()
+
+    def _release(self, worker: _Worker):
+        """
+        Puts a healthy worker back, or replaces it when it is due for recycling.
+        """
+        rss = _tree_rss_mb(worker.process.pid)
+        if worker.tasks >= self.max_tasks or (rss is not None and rss > self.max_rss_mb):
+            self.recycles += 1
+            self._background(self._retire(worker))
+            if self._closing:
+                return
+            worker = self._spawn()
+
+        self._idle.put_nowait(worker)
+
+    # ------------------------
+    # Run
+    # ------------------------
+    async def _acquire(self) -> _Worker:
+        if self._idle is None:
+            self._closing = False
+            self._idle = asyncio.Queue()
+            for _ in range(self.processes):
+                self._idle.put_nowait(self._spawn())
+
+        if self._idle.empty() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise ScrapeQueueFull(f"Scraper queue is full ({self.waiting} waiting)")
+
+        self.waiting += 1
+        try:
+            return await self._idle.get()
+        finally:
+            self.waiting -= 1
+
+    def _send(self, worker: _Worker, message) -> _Worker:
+        """
+        Sends a task. A worker that died while idle is replaced and the task
+        is sent once more to the fresh one; returns the worker that got it.
+        """
+        try:
+            worker.conn.send(message)
+            return worker
+        except OSError:
+            self.crashes += 1
+            self._kill(worker)
+
+        worker = self._spawn()
+        try:
+            worker.conn.send(message)
+        except OSError:
+            self.crashes += 1
+            self._replace(worker)
+            raise ScrapeWorkerLost("Scrape worker died")
+        return worker
+
+    async def _supervise(self, worker: _Worker, reply: asyncio.Future, deadline: float):
+        """
+        Waits for the worker's reply, enforcing the task timeout and the
+        memory limit, then returns the worker to the pool (or replaces it).
+        Runs as its own task, so it keeps going when the caller goes away.
+        """
+        loop = asyncio.get_running_loop()
+
+        try:
+            while not reply.done():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise asyncio.TimeoutError()
+
+                await asyncio.wait({reply}, timeout=min(remaining, MEMORY_POLL_INTERVAL))
+
+                rss = _tree_rss_mb(worker.process.pid)
+                if not reply.done() and rss is not None and rss > self.max_rss_mb:
+                    self.memory_kills += 1
+                    raise ScrapeWorkerLost(f"Scrape worker exceeded {self.max_rss_mb} MB ({rss:.0f} MB)")
+
+            message = reply.result()
+            if message is None:
+                self.crashes += 1
+                raise ScrapeWorkerLost("Scrape worker crashed")
+
+        except BaseException:
+            # Zaman aşımı, bellek, çökme ya da havuz kapanıyor → worker
+            # yarım işle kalmasın, yenisiyle değiştirilir
+            self._replace(worker)
+            raise
+
+        worker.tasks += 1
+        self._release(worker)
+        return message
+
+    async def run(self, task: str, **kwargs):
+        """
+        Runs TASKS[task](kwargs) in a worker process and returns its result.
+
+        If the caller is cancelled (e.g. the client disconnected), the task
+        still finishes in the worker, so the pages it fetched end up in the
+        corpus; only a timeout or the memory limit kills the worker.
+        """
+        worker = await self._acquire()
+        self.tasks += 1
+        loop = asyncio.get_running_loop()
+
+        worker = self._send(worker, (task, kwargs))
+        reply = loop.run_in_executor(None, _recv, worker.conn)
+        supervisor = self._background(
+            self._supervise(worker, reply, loop.time() + self.task_timeout),
+            self._supervisors
+        )
+
+        try:
+            ok, payload = await asyncio.shield(supervisor)
+        except asyncio.CancelledError:
+            if not supervisor.done():
+                self.detached += 1
+            raise
+
+        if not ok:
+            self.failed += 1
+            raise ScrapeError(payload)
+        return payload
+
+    async def close(self):
+        self._closing = True
+
+        # Süren görevler beklenmez: worker'ları öldürülür
+        for task in list(self._supervisors):
+            task.cancel()
+        await asyncio.gather(*self._supervisors, return_exceptions=True)
+
+        for worker in list(self._workers):
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+
+        loop = asyncio.get_running_loop()
+        for worker in list(self._workers):
+            await loop.run_in_executor(None, worker.process.join, RETIRE_GRACE)
+            if worker.process.is_alive():
+                self._kill(worker)
+            else:
+                self._workers.discard(worker)
+                worker.conn.close()
+
+        # Emekliye ayrılanlar ve öldürülenler toparlanır (RETIRE_GRACE ile sınırlı)
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._idle = None
+
+    def stats(self) -> dict:
+        return {
+            "processes": self.processes,
+            "idle": self._idle.qsize() if self._idle else 0,
+            "waiting": self.waiting,
+            "tasks": self.tasks,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "memory_kills": self.memory_kills,
+            "recycles": self.recycles,
+            "rejected": self.rejected,
+            "detached": self.detached,
+            "rss_mb": [
+                round(rss)
+                for rss in (_tree_rss_mb(w.process.pid) for w in self._workers)
+                if rss is not None
+            ],
+        }
+
+
+@lru_cache(maxsize=1)
+def get_scrape_workers() -> ScrapeWorkerPool:
+    return ScrapeWorkerPool()
+
+
+# ------------------------
+# BookRecapService chapter source
+# ------------------------
+class ProcessScraperSource:
+    """
+    chapter_source for BookRecapService that scrapes in the worker pool.
+    Same attributes as CourseHeroScraper (used for cache keys).
+    """
+
+    def __init__(
+        self,
+        book_title: str,
+        target_part: int,
+        target_chapter: int,
+        slug_candidates: list[str],
+        workers: ScrapeWorkerPool | None = None
+    ):
+        self.book_title = book_title
+        self.slug_candidates = slug_candidates
+        self.book_slug = slug_candidates[0]
+        self.target_part = target_part
+        self.target_chapter = target_chapter
+        self.workers = workers or get_scrape_workers()
+
+    async def fetch_summaries_until(self, max_chapter: int | None = None) -> list[dict]:
+        result = await self.workers.run(
+            "summaries_until",
+            book_title=self.book_title,
+            target_part=self.target_part,
+            target_chapter=max_chapter or self.target_chapter,
+            slug_candidates=self.slug_candidates
+        )
+        # Worker'ın doğruladığı slug, CourseHeroScraper'daki gibi book_slug olur
+        self.book_slug = result["slug"]
+        self.slug_candidates = [result["slug"]]
+        return result["summaries"]
+
+
+async def book_chapter_source(book_title: str, target_part: int, target_chapter: int):
+    """
+    Chapter source for the book routes: the worker pool, or an in-process
+    scraper when SCRAPE_PROCESSES=0. The title is resolved to slug
+    candidates here (cached), so workers go straight to a likely URL.
+    """
+    slugs = await slug_candidates(book_title)
+
+    if SCRAPE_PROCESSES > 0:
+        return ProcessScraperSource(book_title, target_part, target_chapter, slugs)
+    return CourseHeroScraper(book_title, target_part, target_chapter, slug_candidates=slugs)
@@ -0,0 +1,188 @@
+"""
+Tiered page fetcher for the scrapers.
+
+Tier 1 is a pooled plain HTTP GET; tier 2 renders the page in the shared
+headless browser pool. A page escalates to the browser only when the HTTP
+response fails, is gated, or the caller's parser finds nothing in it
+(script-rendered / missing block). The tier that worked is remembered per
+host, so browser-only sites skip the doomed HTTP attempt; they are
+re-probed over HTTP every `reprobe_every` fetches in case that changed.
+An HTTP 404/410 is final (no browser attempt), so probing a wrong URL
+stays cheap. Both tiers go through the host politeness scheduler. Pages
+still gated after rendering raise GatedContent.
+"""
+
+from functools import lru_cache
+from typing import Callable, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import SCRAPE_HTTP_MAX_CONNECTIONS, SCRAPE_HTTP_REPROBE_EVERY, SCRAPE_HTTP_TIMEOUT
+from app.core.executor import scraper_executor
+from app.core.http import HTTP2_AVAILABLE
+from app.core.politeness import HostScheduler, get_host_scheduler
+from app.data_sources.browser_pool import USER_AGENT, BrowserPool, get_browser_pool
+
+T = TypeVar("T")
+
+HTTP = "http"
+BROWSER = "browser"
+
+GATED_MARKERS = ("Sign up to unlock", "Create a free account")
+# Browser'ın da değiştiremeyeceği HTTP cevapları
+NOT_FOUND_STATUSES = (404, 410)
+
+
+def is_gated(html: str) -> bool:
+    return any(marker in html for marker in GATED_MARKERS)
+
+
+class GatedContent(Exception):
+    """The page is behind a sign-up wall even in the browser."""
+
+
+class _HostTier:
+    __slots__ = ("tier", "since_probe", "http", "browser", "escalations", "not_found")
+
+    def __init__(self):
+        self.tier = HTTP
+        self.since_probe = 0
+        self.http = 0
+        self.browser = 0
+        self.escalations = 0
+        self.not_found = 0
+
+
+class TieredFetcher:
+
+    def __init__(
+        self,
+        pool: BrowserPool | None = None,
+        scheduler: HostScheduler | None = None,
+        timeout: float = SCRAPE_HTTP_TIMEOUT,
+        reprobe_every: int = SCRAPE_HTTP_REPROBE_EVERY
+    ):
+        self.pool = pool or get_browser_pool()
+        self.scheduler = scheduler or get_host_scheduler()
+        self.timeout = timeout
+        self.reprobe_every = reprobe_every
+        self._hosts: dict[str, _HostTier] = {}
+        self._http: httpx.AsyncClient | None = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=SCRAPE_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=SCRAPE_HTTP_MAX_CONNECTIONS,
+                ),
+            )
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    # ------------------------
+    # Fetch
+    # ------------------------
+    async def fetch(self, url: str, parse: Callable[[str], T | None], timeout: int = 30000) -> T | None:
+        """
+        Loads `url` and returns parse(html). `parse` runs on the scraper
+        pool and returns None when the page lacks the wanted content.
+        Raises GatedContent for pages behind a sign-up wall.
+        """
+        state = self._host(url)
+
+        if self._use_http(state):
+            status, html = await self._get_http(url)
+            if status in NOT_FOUND_STATUSES:
+                state.not_found += 1
+                return None
+
+            if html is not None and not is_gated(html):
+                result = await scraper_executor.run(parse, html)
+                if result is not None:
+                    state.tier = HTTP
+                    state.http += 1
+                    return result
+
+            # HTTP yetmedi → browser
+            state.escalations += 1
+
+        html = await self._get_browser(url, timeout)
+        state.browser += 1
+        if html is None:
+            state.not_found += 1
+            return None
+
+        if is_gated(html):
+            raise GatedContent(url)
+
+        result = await scraper_executor.run(parse, html)
+        if result is not None:
+            state.tier = BROWSER
+        return result
+
+    def _host(self, url: str) -> _HostTier:
+        host = urlsplit(url).hostname or ""
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostTier()
+        return state
+
+    def _use_http(self, state: _HostTier) -> bool:
+        if state.tier == HTTP:
+            return True
+        # Browser gereken sitelerde ara sıra HTTP tekrar denenir
+        state.since_probe += 1
+        if state.since_probe >= self.reprobe_every:
+            state.since_probe = 0
+            return True
+        return False
+
+    async def _get_http(self, url: str) -> tuple[int | None, str | None]:
+        """
+        (status, html); html is None unless the response is a 200 HTML page.
+        """
+        try:
+            async with self.scheduler.slot(url):
+                response = await self._client().get(url)
+        except httpx.HTTPError as e:
+            print(f"HTTP fetch başarısız ({url}): {e}")
+            return None, None
+
+        if response.status_code != 200 or "html" not in response.headers.get("content-type", "html"):
+            return response.status_code, None
+        return response.status_code, response.text
+
+    async def _get_browser(self, url: str, timeout: int) -> str | None:
+        async with self.scheduler.slot(url):
+            async with self.pool.page() as page:
+                response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+                if response is not None and response.status in NOT_FOUND_STATUSES:
+                    return None
+                return await page.content()
+
+    def stats(self) -> dict:
+        return {
+            host: {
+                "tier": state.tier,
+                "http": state.http,
+                "browser": state.browser,
+                "escalations": state.escalations,
+                "not_found": state.not_found,
+            }
+            for host, state in self._hosts.items()
+        }
+
+
+@lru_cache(maxsize=1)
+def get_tiered_fetcher() -> TieredFetcher:
+    return TieredFetcher()
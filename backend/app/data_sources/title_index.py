@@ -0,0 +1,316 @@
+"""
+Local title -> TMDB tv id index.
+
+Built from TMDB's daily TV series ID export (gzipped JSON lines with
+id / original_name / popularity):
+
+    python -m app.data_sources.title_index ingest tv_series_ids_MM_DD_YYYY.json.gz
+    python -m app.data_sources.title_index lookup "Kötü Yol"
+
+Lookups are normalized (case, accents and Turkish characters are folded),
+then tried as: learned alias -> exact name -> trigram fuzzy match, ranked
+by similarity and popularity. The fuzzy step only answers when it is sure
+(score >= TITLE_INDEX_FUZZY_MIN, no close runner-up, title long enough);
+otherwise the caller falls back to /search/tv. In the API the fuzzy scan
+runs in a worker thread on its own connection, off the event loop.
+Titles the API resolved are remembered as aliases, so localized titles
+become local hits after the first request. Restart the API after an
+ingest to pick up the new index file.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import unicodedata
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+from app.core.config import TITLE_INDEX_FUZZY_MIN, TITLE_INDEX_PATH
+
+_TURKISH = str.maketrans({
+    "ı": "i", "İ": "i", "ş": "s", "Ş": "s", "ğ": "g", "Ğ": "g",
+    "ç": "c", "Ç": "c", "ö": "o", "Ö": "o", "ü": "u", "Ü": "u",
+})
+
+# Fuzzy eşleşme için en kısa başlık (kısa başlıklarda tek harf = başka dizi)
+FUZZY_MIN_LENGTH = 5
+# En iyi aday ikinciden (farklı dizi) en az bu kadar iyi olmalı
+FUZZY_MARGIN = 0.05
+# Trigram taraması en fazla bu kadar gram ile yapılır
+FUZZY_MAX_GRAMS = 24
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS titles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    norm TEXT NOT NULL,
+    popularity REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS titles_norm ON titles (norm, popularity DESC);
+
+CREATE TABLE IF NOT EXISTS grams (
+    gram TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    PRIMARY KEY (gram, id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS aliases (
+    norm TEXT PRIMARY KEY,
+    id INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def normalize_title(title: str) -> str:
+    text = title.translate(_TURKISH)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = text.casefold().replace("&", " and ")
+    text = re.sub(r"[^\w\s]|_", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _trigrams(norm: str) -> set[str]:
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+
+    def __init__(self, path: str = TITLE_INDEX_PATH, memo_size: int = 4096):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+        # Fuzzy tarama thread'de, ayrı bağlantıyla (WAL: okuyucular birbirini beklemez)
+        if path == ":memory:":
+            self._scan_lock, self._scan_db = self._lock, self._db
+        else:
+            self._scan_lock = threading.Lock()
+            self._scan_db = sqlite3.connect(path, check_same_thread=False)
+
+        self._memo: OrderedDict[str, int | None] = OrderedDict()
+        self._memo_size = memo_size
+
+    # ------------------------
+    # Lookup
+    # ------------------------
+    def lookup(self, title: str) -> int | None:
+        norm = normalize_title(title)
+        if not norm:
+            return None
+
+        if norm in self._memo:
+            self._memo.move_to_end(norm)
+            return self._memo[norm]
+
+        tv_id = self._exact(norm)
+        if tv_id is None:
+            tv_id = self._fuzzy(norm)
+        return self._memoize(norm, tv_id)
+
+    async def alookup(self, title: str) -> int | None:
+        """
+        lookup() for async callers: alias and exact matches are indexed
+        point reads, the fuzzy scan runs in the default thread pool.
+        """
+        norm = normalize_title(title)
+        if not norm:
+            return None
+
+        if norm in self._memo:
+            self._memo.move_to_end(norm)
+            return self._memo[norm]
+
+        tv_id = self._exact(norm)
+        if tv_id is None:
+            loop = asyncio.get_running_loop()
+            tv_id = await loop.run_in_executor(None, self._fuzzy, norm)
+        return self._memoize(norm, tv_id)
+
+    def _memoize(self, norm: str, tv_id: int | None) -> int | None:
+        self._memo[norm] = tv_id
+        if len(self._memo) > self._memo_size:
+            self._memo.popitem(last=False)
+        return tv_id
+
+    def _exact(self, norm: str) -> int | None:
+        with self._lock:
+            row = self._db.execute("SELECT id FROM aliases WHERE norm = ?", (norm,)).fetchone()
+            if row:
+                return row[0]
+
+            row = self._db.execute(
+                "SELECT id FROM titles WHERE norm = ? ORDER BY popularity DESC LIMIT 1",
+                (norm,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _fuzzy(self, norm: str) -> int | None:
+        if len(norm) < FUZZY_MIN_LENGTH:
+            return None
+
+        # Uzun başlıklarda tarama maliyeti gram sayısıyla büyür: başlık
+        # boyunca eşit aralıklı sabit bir alt küme
+        padded = f"  {norm} "
+        grams = list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+        step = -(-len(grams) // FUZZY_MAX_GRAMS)
+        grams = grams[::step]
+        placeholders = ",".join("?" * len(grams))
+
+        with self._scan_lock:
+            candidates = self._scan_db.execute(
+                f"""
+                SELECT t.id, t.norm, t.popularity
+                FROM (
+                    SELECT id, COUNT(*) AS shared FROM grams
+                    WHERE gram IN ({placeholders})
+                    GROUP BY id ORDER BY shared DESC LIMIT 50
+                ) g JOIN titles t ON t.id = g.id
+                """,
+                grams,
+            ).fetchall()
+
+        scored = sorted(
+            ((round(SequenceMatcher(None, norm, cand_norm).ratio(), 2), popularity, tv_id, cand_norm)
+             for tv_id, cand_norm, popularity in candidates),
+            reverse=True,
+        )
+        if not scored or scored[0][0] < TITLE_INDEX_FUZZY_MIN:
+            return None
+
+        ratio, _, tv_id, best_norm = scored[0]
+        # Başka bir dizi neredeyse aynı yakınlıktaysa emin değiliz → /search/tv
+        for other_ratio, _, _, other_norm in scored[1:]:
+            if other_ratio < ratio - FUZZY_MARGIN:
+                break
+            if other_norm != best_norm:
+                return None
+        return tv_id
+
+    def remember(self, title: str, tv_id: int):
+        """
+        Stores an API-resolved title as an alias for later local hits.
+        """
+        norm = normalize_title(title)
+        if not norm:
+            return
+
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO aliases VALUES (?, ?)", (norm, tv_id))
+        self._memo.pop(norm, None)
+
+    # ------------------------
+    # Ingestion
+    # ------------------------
+    @staticmethod
+    def build(export_path: str, index_path: str = TITLE_INDEX_PATH, batch_size: int = 5000) -> int:
+        """
+        Builds a fresh index from a TMDB TV ID export (.json.gz or plain
+        JSON lines) next to `index_path`, then swaps it in atomically.
+        Learned aliases from the existing index are carried over.
+        """
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        tmp_path = f"{index_path}.building"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        db = sqlite3.connect(tmp_path)
+        db.execute("PRAGMA journal_mode=OFF")
+        db.execute("PRAGMA synchronous=OFF")
+        db.executescript(_SCHEMA)
+
+        opener = gzip.open if export_path.endswith(".gz") else open
+        count = 0
+        titles, grams = [], []
+
+        def flush():
+            db.executemany("INSERT OR REPLACE INTO titles VALUES (?, ?, ?, ?)", titles)
+            db.executemany("INSERT OR IGNORE INTO grams VALUES (?, ?)", grams)
+            titles.clear()
+            grams.clear()
+
+        with opener(export_path, "rt", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+
+                item = json.loads(line)
+                if item.get("adult"):
+                    continue
+
+                name = item.get("original_name") or item.get("name") or ""
+                norm = normalize_title(name)
+                if not norm:
+                    continue
+
+                titles.append((item["id"], name, norm, item.get("popularity") or 0))
+                grams.extend((g, item["id"]) for g in _trigrams(norm))
+                count += 1
+
+                if len(titles) >= batch_size:
+                    flush()
+
+        flush()
+
+        if os.path.exists(index_path):
+            db.execute("ATTACH DATABASE ? AS old", (index_path,))
+            db.execute("INSERT OR REPLACE INTO aliases SELECT norm, id FROM old.aliases")
+            db.commit()
+            db.execute("DETACH DATABASE old")
+
+        db.commit()
+        db.execute("VACUUM")
+        db.close()
+
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(index_path + suffix):
+                os.remove(index_path + suffix)
+        os.replace(tmp_path, index_path)
+        return count
+
+
+@lru_cache(maxsize=1)
+def get_title_index() -> TitleIndex:
+    return TitleIndex()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TMDB title index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="build the index from a TMDB TV ID export")
+    ingest.add_argument("export_path")
+    ingest.add_argument("--index", default=TITLE_INDEX_PATH)
+
+    lookup = sub.add_parser("lookup", help="resolve a title locally")
+    lookup.add_argument("title")
+    lookup.add_argument("--index", default=TITLE_INDEX_PATH)
+
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        count = TitleIndex.build(args.export_path, args.index)
+        print(f"✅ {count} dizi indekslendi → {args.index}")
+    else:
+        tv_id = TitleIndex(args.index).lookup(args.title)
+        if tv_id is None:
+            print("❌ Bulunamadı")
+            sys.exit(1)
+        print(tv_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,63 @@
+import asyncio
 import os
-import requests
-from dotenv import load_dotenv
+import time
+from functools import lru_cache
 
-load_dotenv()
+import httpx
 
+from app.core.config import (
+    TMDB_BASE_URL,
+    TMDB_FANOUT,
+    TMDB_KEEPALIVE_EXPIRY,
+    TMDB_MAX_CONNECTIONS,
+    TMDB_MAX_RETRIES,
+    TMDB_RATE_BURST,
+    TMDB_RATE_LIMIT,
+    TMDB_TIMEOUT,
+)
+from app.core.http import HTTP2_AVAILABLE
+from app.core.rate_limit import BULK, INTERACTIVE, TokenBucket, retry_after_seconds
+from app.core.singleflight import SingleFlight
+from app.data_sources.episode_store import EpisodeStore, episode_expires_at, get_episode_store
+from app.data_sources.title_index import TitleIndex, get_title_index, normalize_title
+
+
+class TMDBRateLimited(Exception):
+    """TMDB still answered 429 after the last retry."""
+
+    def __init__(self, path: str, retry_after: float):
+        super().__init__(f"TMDB rate limit ({path}), retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
 
-class TMDBClient:
-    BASE_URL = "https://api.themoviedb.org/3"
 
-    def __init__(self):
+class TMDBClient:
+    """
+    Async TMDB client shared by the recap pipeline and the series routes.
+
+    One pooled httpx.AsyncClient is reused for every call (keep-alive,
+    HTTP/2 when the h2 package is installed). Use get_tmdb_client() to get
+    the process-wide instance.
+
+    Every request passes a shared token bucket first. Listing/search calls
+    are INTERACTIVE, the recap season crawl is BULK; a 429 pauses the
+    bucket for Retry-After and the request is retried, up to
+    TMDB_MAX_RETRIES times, then raises TMDBRateLimited.
+
+    With an EpisodeStore attached, get_recap_until only goes to the network
+    for seasons that are missing or expired locally. With a TitleIndex
+    attached, titles are resolved locally and /search/tv is the fallback.
+    """
+
+    BASE_URL = TMDB_BASE_URL
+    IMAGE_BASE = "https://image.tmdb.org/t/p/w500"
+
+    def __init__(
+        self,
+        timeout: float = TMDB_TIMEOUT,
+        fanout: int = TMDB_FANOUT,
+        store: EpisodeStore | None = None,
+        title_index: TitleIndex | None = None
+    ):
         self.key = os.getenv("TMDB_API_KEY")
 
         if not self.key:
@@ -30,39 +79,184 @@ class TMDBClient:
                 "language": "tr-TR"
             }
 
-    def _get(self, path: str, extra_params: dict | None = None):
+        self.timeout = timeout
+        self.fanout = fanout
+        self.store = store
+        self.title_index = title_index
+        self.limiter = TokenBucket(TMDB_RATE_LIMIT, TMDB_RATE_BURST)
+        self._http: httpx.AsyncClient | None = None
+        # Aynı anda gelen özdeş GET'ler tek istek olarak gider
+        self._flight = SingleFlight("tmdb")
+
+    # ------------------------
+    # Connection pool
+    # ------------------------
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                headers=self.headers,
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=TMDB_MAX_CONNECTIONS,
+                    max_keepalive_connections=TMDB_MAX_CONNECTIONS,
+                    keepalive_expiry=TMDB_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    # ------------------------
+    # Core request helpers
+    # ------------------------
+    async def _get(
+        self,
+        path: str,
+        extra_params: dict | None = None,
+        timeout: float | None = None,
+        priority: int = INTERACTIVE
+    ):
         url = f"{self.BASE_URL}{path}"
         params = self.params.copy()
 
         if extra_params:
             params.update(extra_params)
 
-        response = requests.get(url, headers=self.headers, params=params)
-        response.raise_for_status()
-        return response.json()
+        async def fetch():
+            for attempt in range(TMDB_MAX_RETRIES + 1):
+                await self.limiter.acquire(priority)
+                response = await self._client().get(
+                    url,
+                    params=params,
+                    timeout=timeout if timeout is not None else self.timeout
+                )
+
+                if response.status_code == 429:
+                    wait = retry_after_seconds(
+                        response.headers.get("Retry-After"),
+                        default=2 ** attempt
+                    )
+                    self.limiter.pause(wait)
+                    if attempt == TMDB_MAX_RETRIES:
+                        raise TMDBRateLimited(path, wait)
+                    print(f"TMDB 429, {wait:.1f}s bekleniyor ({path})")
+                    continue
+
+                response.raise_for_status()
+                return response.json()
+
+        key = (path, tuple(sorted(params.items())))
+        return await self._flight.do(key, fetch)
+
+    async def gather(self, *aws):
+        """
+        asyncio.gather with at most `fanout` awaitables in flight.
+        """
+        semaphore = asyncio.Semaphore(self.fanout)
+
+        async def run(aw):
+            async with semaphore:
+                return await aw
+
+        return await asyncio.gather(*(run(aw) for aw in aws))
+
+    # ------------------------
+    # TV endpoints
+    # ------------------------
+    async def trending_tv(self, page: int = 1, priority: int = INTERACTIVE):
+        return await self._get("/trending/tv/week", {"page": page}, priority=priority)
+
+    async def popular_tv(self, page: int = 1, priority: int = INTERACTIVE):
+        return await self._get("/tv/popular", {"page": page}, priority=priority)
+
+    async def top_rated_tv(self, page: int = 1):
+        return await self._get("/tv/top_rated", {"page": page})
 
-    def search_tv(self, query: str):
-        data = self._get("/search/tv", {"query": query})
-        return data["results"]
+    async def search_tv(self, query: str, page: int = 1):
+        return await self._get(
+            "/search/tv",
+            {
+                "query": query,
+                "page": page,
+                "include_adult": False
+            }
+        )
+
+    async def tv_details(self, tv_id: int, priority: int = INTERACTIVE):
+        return await self._get(f"/tv/{tv_id}", priority=priority)
+
+    async def tv_images(self, tv_id: int):
+        return await self._get(f"/tv/{tv_id}/images")
+
+    async def get_episode(self, tv_id: int, season: int, episode: int):
+        return await self._get(f"/tv/{tv_id}/season/{season}/episode/{episode}")
 
-    def get_tv_details(self, tv_id: int):
-        return self._get(f"/tv/{tv_id}")
+    async def get_season(self, tv_id: int, season: int, priority: int = INTERACTIVE):
+        # Season resource tüm bölümleri (name + overview) tek istekte döner
+        return await self._get(f"/tv/{tv_id}/season/{season}", priority=priority)
 
-    def get_episode(self, tv_id: int, season: int, episode: int):
-        return self._get(f"/tv/{tv_id}/season/{season}/episode/{episode}")
+    # ------------------------
+    # Recap data
+    # ------------------------
+    async def resolve_tv_id(self, title: str) -> int:
+        """
+        Title → TMDB id: local index first, /search/tv only on a miss.
+        """
+        if self.title_index:
+            tv_id = await self.title_index.alookup(title)
+            if tv_id is not None:
+                return tv_id
 
-    def get_recap_until(self, title: str, target_season: int, target_episode: int):
-        search_results = self.search_tv(title)
+        search_results = (await self.search_tv(title))["results"]
 
         if not search_results:
             raise ValueError("Dizi bulunamadı")
 
-        tv_id = search_results[0]["id"]
+        # Birebir isim eşleşmesi varsa ilk sonuç yerine onu al
+        norm = normalize_title(title)
+        exact = [
+            r for r in search_results
+            if norm in (
+                normalize_title(r.get("name") or ""),
+                normalize_title(r.get("original_name") or "")
+            )
+        ]
+        best = max(exact, key=lambda r: r.get("popularity") or 0) if exact else search_results[0]
+
+        if self.title_index:
+            self.title_index.remember(title, best["id"])
+        return best["id"]
+
+    async def get_recap_until(self, title: str, target_season: int, target_episode: int):
+        tv_id = await self.resolve_tv_id(title)
         print(f"BULUNAN TV ID: {tv_id}")
 
-        tv_details = self.get_tv_details(tv_id)
-        recap = []
+        return await self.get_episodes_until(tv_id, target_season, target_episode)
 
+    async def get_episodes_until(self, tv_id: int, target_season: int, target_episode: int):
+        recap, _ = await self.get_recap_episodes(tv_id, target_season, target_episode)
+        return recap
+
+    async def get_recap_episodes(
+        self,
+        tv_id: int,
+        target_season: int,
+        target_episode: int
+    ) -> tuple[list[dict], dict[int, float | None]]:
+        """
+        get_episodes_until plus, per season, when its inputs may still
+        change: the earliest episode_expires_at() of the season's episodes
+        up to the cut (empty overviews included), None if all are final.
+        """
+        language = self.params["language"]
+        tv_details = await self._recap_tv_details(tv_id, language)
+
+        # (season_number, max_episode) for every season up to the target
+        wanted = []
         for season in tv_details["seasons"]:
             season_number = season["season_number"]
 
@@ -76,26 +270,103 @@ class TMDBClient:
                 if season_number == target_season
                 else season["episode_count"]
             )
+            wanted.append((season_number, max_episode))
+
+        # Local store first; only missing/expired seasons hit the network
+        season_episodes = {}
+        missing = []
+        for season_number, max_episode in wanted:
+            cached = (
+                self.store.get_season(tv_id, season_number, language, max_episode)
+                if self.store
+                else None
+            )
+            if cached is None:
+                missing.append(season_number)
+            else:
+                season_episodes[season_number] = cached
+
+        # One request per season, fetched concurrently, cut locally
+        fetched = await self.gather(
+            *(self.get_season(tv_id, number, priority=BULK) for number in missing)
+        )
+        for season_number, data in zip(missing, fetched):
+            episodes = data.get("episodes", [])
+            if self.store:
+                self.store.put_season(tv_id, season_number, language, episodes)
+            season_episodes[season_number] = episodes
+
+        now = time.time()
+        recap = []
+        expires: dict[int, float | None] = {}
+        for season_number, max_episode in wanted:
+            expires[season_number] = None
+            for ep in season_episodes[season_number]:
+                ep_number = ep["episode_number"]
+                if ep_number > max_episode:
+                    continue
 
-            for ep in range(1, max_episode + 1):
-                data = self.get_episode(tv_id, season_number, ep)
+                ep_expires = episode_expires_at(ep, now)
+                if ep_expires is not None:
+                    expires[season_number] = min(expires[season_number] or ep_expires, ep_expires)
 
-                overview = data.get("overview", "").strip()
+                overview = (ep.get("overview") or "").strip()
                 if not overview:
                     continue
 
                 recap.append({
                     "season": season_number,
-                    "episode": ep,
-                    "title": data["name"],
+                    "episode": ep_number,
+                    "title": ep["name"],
                     "overview": overview
                 })
 
-        return recap
+        return recap, expires
+
+    async def last_aired_episode(self, tv_id: int, priority: int = BULK) -> tuple[int, int] | None:
+        """
+        (season, episode) of the show's latest aired episode, from fresh
+        details (which also refresh the stored copy used by recaps).
+        """
+        details = await self.tv_details(tv_id, priority=priority)
+        if self.store:
+            self.store.put_details(tv_id, self.params["language"], details)
+
+        last = details.get("last_episode_to_air") or {}
+        if not last.get("season_number") or not last.get("episode_number"):
+            return None
+        return last["season_number"], last["episode_number"]
+
+    async def _recap_tv_details(self, tv_id: int, language: str) -> dict:
+        if self.store:
+            cached = self.store.get_details(tv_id, language)
+            if cached is not None:
+                return cached
+
+        details = await self.tv_details(tv_id)
+        if self.store:
+            self.store.put_details(tv_id, language, details)
+        return details
+
+    # ------------------------
+    # Helpers
+    # ------------------------
+    def image_url(self, path: str | None):
+        if not path:
+            return None
+        return f"{self.IMAGE_BASE}{path}"
+
+
+@lru_cache(maxsize=1)
+def get_tmdb_client() -> TMDBClient:
+    """
+    Process-wide TMDB client (one connection pool for every router).
+    """
+    return TMDBClient(store=get_episode_store(), title_index=get_title_index())
 
 
 #test amaçlı main fonksiyonu
-def main():
+async def main():
     client = TMDBClient()
 
     TITLE = "Better Call Saul"   # burada istediğin diziyi değiştir
@@ -107,7 +378,7 @@ def main():
     print(f"Until: Season {TARGET_SEASON}, Episode {TARGET_EPISODE}")
     print("-----------------------------")
 
-    recap_data = client.get_recap_until(
+    recap_data = await client.get_recap_until(
         title=TITLE,
         target_season=TARGET_SEASON,
         target_episode=TARGET_EPISODE
@@ -115,6 +386,7 @@ def main():
 
     if not recap_data:
         print("❌ Hiç recap verisi alınamadı")
+        await client.aclose()
         return
 
     print(f"✅ Toplam bölüm sayısı: {len(recap_data)}\n")
@@ -136,6 +408,8 @@ def main():
     print(f"Toplam bölüm: {len(recap_data)}")
     print(f"Boş overview sayısı: {empty_count}")
 
+    await client.aclose()
+
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
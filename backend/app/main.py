@@ -1,12 +1,48 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.recap import router as recap_router
-from app.api.series import router as series_router
+from app.api.series import listing_cache, router as series_router
+from app.core.config import RECAP_WARMUP_ENABLED
+from app.core.executor import llm_executor, scraper_executor
+from app.core.politeness import get_host_scheduler
+from app.core.singleflight import singleflight_stats
+from app.services.llm.registry import get_llm_client
+from app.services.recap_cache import get_recap_cache
+from app.services.recap_jobs import get_recap_jobs
+from app.services.recap_warmer import get_recap_warmer
+from app.data_sources.browser_pool import get_browser_pool
+from app.data_sources.book_corpus import get_book_corpus
+from app.data_sources.google_books import get_google_books
+from app.data_sources.scrape_workers import get_scrape_workers
+from app.data_sources.tiered_fetcher import get_tiered_fetcher
+from app.data_sources.tmdb import get_tmdb_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Trending/popular dizilerin recap'leri arka planda önceden üretilir
+    warmup = asyncio.create_task(get_recap_warmer().run_forever()) if RECAP_WARMUP_ENABLED else None
+    yield
+    if warmup:
+        warmup.cancel()
+    await get_recap_jobs().close()
+    # Shared TMDB connection pool
+    await get_tmdb_client().aclose()
+    await get_scrape_workers().close()
+    await get_google_books().aclose()
+    await get_tiered_fetcher().aclose()
+    await get_browser_pool().close()
+    llm_executor.shutdown()
+    scraper_executor.shutdown()
+
 
 app = FastAPI(
     title="Nerede Kalmıştık API",
     description="Spoiler-safe kitap ve dizi özet servisi",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Enable CORS for frontend
@@ -24,3 +60,26 @@ app.include_router(series_router)
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/stats")
+def stats():
+    return {
+        "listing_cache": listing_cache.stats(),
+        "recap_cache": get_recap_cache().stats(),
+        "singleflight": singleflight_stats(),
+        "tmdb_rate_limit": get_tmdb_client().limiter.stats(),
+        "llm": get_llm_client().stats(),
+        "browser_pool": get_browser_pool().stats(),
+        "scrape_hosts": get_host_scheduler().stats(),
+        "scrape_tiers": get_tiered_fetcher().stats(),
+        "scrape_workers": get_scrape_workers().stats(),
+        "book_corpus": get_book_corpus().stats(),
+        "google_books": get_google_books().stats(),
+        "recap_jobs": get_recap_jobs().stats(),
+        "recap_warmup": get_recap_warmer().stats() if RECAP_WARMUP_ENABLED else None,
+        "executors": {
+            "llm": llm_executor.stats(),
+            "scraper": scraper_executor.stats(),
+        },
+    }
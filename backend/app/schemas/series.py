@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from app.core.serialization import dumps
+
+
+@dataclass(slots=True, frozen=True)
+class SeriesSummary:
+    """
+    Compact per-show row shared by every series listing response.
+    """
+
+    id: int
+    title: str
+    description: str
+    poster_path: str | None
+    poster: str | None
+    backdrop_path: str | None
+    backdrop: str | None
+    rating: float
+    genres: tuple = ()  # Will be filled for detailed view
+    seasons: int = 0  # Will be filled for detailed view
+    episodes: int = 0  # Will be filled for detailed view
+
+    @classmethod
+    def from_tmdb(cls, show: dict, image_url: Callable[[str | None], str | None]) -> "SeriesSummary":
+        poster_path = show.get("poster_path")
+        backdrop_path = show.get("backdrop_path")
+        return cls(
+            id=show["id"],
+            title=show.get("name", ""),
+            description=show.get("overview", ""),
+            poster_path=poster_path,
+            poster=image_url(poster_path),
+            backdrop_path=backdrop_path,
+            backdrop=image_url(backdrop_path),
+            rating=show.get("vote_average", 0),
+        )
+
+
+def encode_listing(data: dict, image_url: Callable[[str | None], str | None]) -> bytes:
+    """
+    Projects one upstream TMDB listing page and encodes it straight to
+    JSON bytes, ready to be cached and served as is.
+    """
+    return dumps({
+        "results": [SeriesSummary.from_tmdb(show, image_url) for show in data.get("results", [])],
+        "page": data.get("page"),
+        "total_pages": data.get("total_pages"),
+        "total_results": data.get("total_results"),
+    })
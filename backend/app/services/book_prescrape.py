@@ -0,0 +1,177 @@
+"""
+Offline bulk pre-scrape of book chapter summaries.
+
+Fills the local summary corpus for a list of books, so /recap/book serves
+from pre-built data instead of scraping on the request path:
+
+    python -m app.services.book_prescrape "Crime and Punishment" "1984"
+    python -m app.services.book_prescrape --file books.txt --report report.json
+
+Progress is checkpointed per book (JSON, rewritten atomically after each
+book); a rerun skips finished books and retries failed ones. Pages already
+in the corpus are never fetched again, so an interrupted book also resumes
+where it stopped. At most `concurrency` books run at once; page requests
+inside a book are paced by the host politeness scheduler.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from app.core.config import PRESCRAPE_BOOK_CONCURRENCY, PRESCRAPE_CHECKPOINT_PATH
+from app.data_sources.browser_pool import get_browser_pool
+from app.data_sources.coursehero_json_scraper import CourseHeroScraper, slug_candidates
+from app.data_sources.google_books import get_google_books
+from app.data_sources.tiered_fetcher import get_tiered_fetcher
+
+DONE = "done"
+FAILED = "failed"
+
+
+class PrescrapeCheckpoint:
+    """
+    Per-book results of earlier runs: {title: {"status", "slug", report...}}.
+    """
+
+    def __init__(self, path: str = PRESCRAPE_CHECKPOINT_PATH):
+        self.path = path
+        self.books: dict[str, dict] = {}
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.books = json.load(f).get("books", {})
+
+    def is_done(self, title: str) -> bool:
+        return self.books.get(title, {}).get("status") == DONE
+
+    def record(self, title: str, result: dict):
+        self.books[title] = result
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"books": self.books}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+async def prescrape_book(title: str) -> dict:
+    scraper = CourseHeroScraper(
+        book_title=title,
+        target_part=1,
+        target_chapter=1,
+        slug_candidates=await slug_candidates(title)
+    )
+    started = time.monotonic()
+
+    try:
+        report = await scraper.prefetch_all()
+    except Exception as e:
+        return {"status": FAILED, "slug": scraper.book_slug, "error": str(e)}
+
+    # Başarısız sayfalar varsa kitap bir sonraki çalıştırmada tekrar denenir
+    status = FAILED if report["failed"] else DONE
+    return {
+        "status": status,
+        "slug": scraper.book_slug,
+        "seconds": round(time.monotonic() - started, 1),
+        **report,
+    }
+
+
+async def prescrape(
+    titles: list[str],
+    checkpoint: PrescrapeCheckpoint,
+    concurrency: int = PRESCRAPE_BOOK_CONCURRENCY,
+    force: bool = False
+) -> dict[str, dict]:
+    """
+    Scrapes every title not finished in `checkpoint` (all of them with
+    force=True) and returns this run's results.
+    """
+    pending = [t for t in dict.fromkeys(titles) if force or not checkpoint.is_done(t)]
+    skipped = len(set(titles)) - len(pending)
+    print(f"📚 {len(pending)} kitap işlenecek, {skipped} checkpoint'ten atlandı")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results: dict[str, dict] = {}
+
+    async def run(title: str):
+        async with semaphore:
+            print(f"▶️ {title}")
+            result = await prescrape_book(title)
+
+        checkpoint.record(title, result)
+        results[title] = result
+        print(f"{'✅' if result['status'] == DONE else '❌'} {title}: {_summary_line(result)}")
+
+    await asyncio.gather(*(run(t) for t in pending))
+    return results
+
+
+def _summary_line(result: dict) -> str:
+    if "error" in result:
+        return result["error"]
+    return (
+        f"{result['ok']}/{result['entries']} özet, "
+        f"{len(result['gated'])} gated, {len(result['missing'])} eksik, "
+        f"{len(result['failed'])} hata ({result['seconds']}s)"
+    )
+
+
+def print_report(books: dict[str, dict]):
+    print("\n===== PRE-SCRAPE REPORT =====\n")
+    for title, result in books.items():
+        print(f"{title} [{result['status']}]: {_summary_line(result)}")
+        for key, label in (("gated", "gated"), ("missing", "eksik"), ("failed", "hata")):
+            for entry in result.get(key, []):
+                print(f"    {label}: {entry}")
+
+
+def _read_titles(args) -> list[str]:
+    titles = list(args.titles)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            titles += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return titles
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Pre-scrape book chapter summaries into the corpus")
+    parser.add_argument("titles", nargs="*", help="book titles")
+    parser.add_argument("--file", help="file with one book title per line")
+    parser.add_argument("--concurrency", type=int, default=PRESCRAPE_BOOK_CONCURRENCY, help="books at once")
+    parser.add_argument("--checkpoint", default=PRESCRAPE_CHECKPOINT_PATH)
+    parser.add_argument("--force", action="store_true", help="also redo books finished earlier")
+    parser.add_argument("--report", help="write the report for the given titles as JSON")
+    args = parser.parse_args()
+
+    titles = _read_titles(args)
+    if not titles:
+        parser.error("no book titles given")
+
+    checkpoint = PrescrapeCheckpoint(args.checkpoint)
+    try:
+        await prescrape(titles, checkpoint, concurrency=args.concurrency, force=args.force)
+    finally:
+        await get_google_books().aclose()
+        await get_tiered_fetcher().aclose()
+        await get_browser_pool().close()
+
+    books = {t: checkpoint.books[t] for t in dict.fromkeys(titles) if t in checkpoint.books}
+    print_report(books)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(books, f, ensure_ascii=False, indent=2)
+
+    if any(result["status"] != DONE for result in books.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
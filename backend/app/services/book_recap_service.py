@@ -1,4 +1,64 @@
-from app.services.llm.gemini import GeminiClient
+from app.core.config import PROMPT_TOKEN_BUDGET, RECAP_LANGUAGE
+from app.core.singleflight import SingleFlight
+from app.services.llm.base import BaseLLMClient
+from app.services.llm.registry import get_llm_client
+from app.services.prompt_budget import PROMPT_BUDGET_VERSION, estimate_tokens, fit_to_budget
+from app.services.recap_cache import (
+    RecapCache,
+    RecapKey,
+    RecapResult,
+    get_recap_cache,
+    prompt_hash,
+)
+
+# Aynı (kitap, part, bölüm) için eşzamanlı istekler tek üretimi paylaşır
+_book_recap_flight = SingleFlight("book_recap")
+
+PROMPT_TEMPLATE = """
+Below are chapter summaries for the book "{book_title}" up to Chapter {chapter}.
+Your task is to create a detailed recap of the story so far and PRODUCE EXACTLY TWO SECTIONS as per the instructions below.
+
+SECTION 1 — CHARACTER CONTEXT
+Rules:
+- Introduce ONLY the main characters.
+- Maximum 1 sentence per character.
+- Describe ONLY:
+  - who the character is
+  - their current role or position in the story
+- Do NOT describe events.
+- Do NOT mention specific actions or chapters.
+- Do NOT include cause–effect explanations.
+- Use bullet points.
+- Keep this section SHORT and STATIC.
+
+SECTION 2 — STORY RECAP
+Rules:
+- Before describing events, briefly experience the atmosphere and environment of the book.
+- Write the recap as a continuous story, divided into natural paragraphs.
+- Each paragraph must focus on ONLY ONE character or character group.
+- Do NOT jump between characters within the same paragraph.
+- Early chapters must be summarized briefly.
+- Events closer to Chapter {chapter} must be described in more detail.
+- Skip minor side events unless they directly affect the current situation.
+- Emphasize:
+  - turning points
+  - unresolved conflicts
+  - the character’s current mental or situational state
+- Do NOT include headings or labels.
+- End the recap with the most recent unresolved tension, realization, or dilemma.
+
+────────────────────────────
+OUTPUT RULES
+────────────────────────────
+- Output language: Turkish.
+- Start directly with SECTION 1.
+- Do NOT add any commentary or explanations.
+
+CHAPTER SUMMARIES:
+{raw_text}
+"""
+
+PROMPT_VERSION = prompt_hash(PROMPT_TEMPLATE + PROMPT_BUDGET_VERSION)
 
 
 class BookRecapService:
@@ -13,45 +73,140 @@ class BookRecapService:
     - Scrape websites
     """
 
-    def __init__(self, chapter_source, llm: GeminiClient | None = None):
+    def __init__(
+        self,
+        chapter_source,
+        llm: BaseLLMClient | None = None,
+        cache: RecapCache | None = None
+    ):
         """
         chapter_source must implement:
-            fetch_summaries_until(max_chapter: int) -> list[dict]
+            async fetch_summaries_until(max_chapter: int) -> list[dict]
+        and may expose book_slug / target_part (used for cache keys).
+        book_slug may change during the fetch (a later slug candidate was
+        the one that worked); the recap is then stored under that slug.
         """
         self.chapter_source = chapter_source
-        self.llm = llm or GeminiClient()
+        self.llm = llm or get_llm_client()
+        self.cache = cache or get_recap_cache()
 
     # --------------------------------------------------
     # RAW TEXT BUILDER
     # --------------------------------------------------
     def _build_raw_text(self, chapters: list[dict]) -> str:
+        headers = [f"Chapter {ch['chapter']} ({ch['title']}):" for ch in chapters]
+
+        # Budget: older chapter summaries are compacted, recent ones kept
+        summaries = fit_to_budget(
+            [ch["summary"] or "" for ch in chapters],
+            PROMPT_TOKEN_BUDGET,
+            overheads=[estimate_tokens(h) + 1 for h in headers]
+        )
+
         parts: list[str] = []
 
-        for ch in chapters:
-            parts.append(
-                f"Chapter {ch['chapter']} ({ch['title']}): {ch['summary']}"
-            )
+        for header, summary in zip(headers, summaries):
+            if summary is not None:
+                parts.append(f"{header} {summary}".rstrip())
 
         return "\n".join(parts)
 
     # --------------------------------------------------
     # PUBLIC API
     # --------------------------------------------------
-    def generate_full_recap(
+    async def generate_full_recap(
         self,
         *,
         book_title: str,
-        chapter: int
-    ) -> str:
+        chapter: int,
+        part: int | None = None
+    ) -> RecapResult:
         """
         Generates a spoiler-safe recap up to the given chapter.
         """
+        key = self._cache_key(book_title=book_title, chapter=chapter, part=part)
+        return await _book_recap_flight.do(
+            key,
+            lambda: self._generate_full_recap(key, book_title=book_title, chapter=chapter, part=part)
+        )
 
-        # 1. Fetch chapter summaries
-        chapters = self.chapter_source.fetch_summaries_until(
-            max_chapter=chapter
+    def _cache_key(self, *, book_title: str, chapter: int, part: int | None) -> RecapKey:
+        content_id = getattr(self.chapter_source, "book_slug", None) or book_title.strip().lower()
+        part = part or getattr(self.chapter_source, "target_part", None) or 1
+
+        return RecapKey(
+            kind="book",
+            content_id=content_id,
+            position=f"P{part}C{chapter}",
+            language=RECAP_LANGUAGE,
+            prompt_hash=PROMPT_VERSION,
+            model=self.llm.model_name
         )
 
+    async def _generate_full_recap(
+        self,
+        key: RecapKey,
+        *,
+        book_title: str,
+        chapter: int,
+        part: int | None
+    ) -> RecapResult:
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        prompt = await self._prepare_prompt(book_title=book_title, chapter=chapter)
+
+        # Slug fetch sırasında doğrulandıysa anahtar değişir
+        key = self._cache_key(book_title=book_title, chapter=chapter, part=part)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # 4. Generate recap
+        text = await self.llm.agenerate_recap(prompt)
+        return self.cache.put(key, text)
+
+    async def stream_full_recap(
+        self,
+        *,
+        book_title: str,
+        chapter: int,
+        part: int | None = None
+    ):
+        """
+        Streaming variant of generate_full_recap: yields text chunks as the
+        model produces them, then the final RecapResult.
+        """
+        key = self._cache_key(book_title=book_title, chapter=chapter, part=part)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached.text
+            yield cached
+            return
+
+        prompt = await self._prepare_prompt(book_title=book_title, chapter=chapter)
+
+        # Slug fetch sırasında doğrulandıysa anahtar değişir
+        key = self._cache_key(book_title=book_title, chapter=chapter, part=part)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached.text
+            yield cached
+            return
+
+        chunks = []
+        async for chunk in self.llm.astream_recap(prompt):
+            chunks.append(chunk)
+            yield chunk
+
+        yield self.cache.put(key, "".join(chunks))
+
+    async def _prepare_prompt(self, *, book_title: str, chapter: int) -> str:
+        # 1. Fetch chapter summaries (async, pooled browser)
+        chapters = await self.chapter_source.fetch_summaries_until(max_chapter=chapter)
+
         if not chapters:
             raise RuntimeError("No chapter summaries found")
 
@@ -59,15 +214,12 @@ class BookRecapService:
         raw_text = self._build_raw_text(chapters)
 
         # 3. Build prompt
-        prompt = self._build_prompt(
+        return self._build_prompt(
             book_title=book_title,
             chapter=chapter,
             raw_text=raw_text
         )
 
-        # 4. Generate recap
-        return self.llm.generate_recap(prompt)
-
     # --------------------------------------------------
     # PROMPT BUILDER
     # --------------------------------------------------
@@ -78,46 +230,8 @@ class BookRecapService:
         chapter: int,
         raw_text: str
     ) -> str:
-        return f"""
-Below are chapter summaries for the book "{book_title}" up to Chapter {chapter}.
-Your task is to create a detailed recap of the story so far and PRODUCE EXACTLY TWO SECTIONS as per the instructions below.
-
-SECTION 1 — CHARACTER CONTEXT
-Rules:
-- Introduce ONLY the main characters.
-- Maximum 1 sentence per character.
-- Describe ONLY:
-  - who the character is
-  - their current role or position in the story
-- Do NOT describe events.
-- Do NOT mention specific actions or chapters.
-- Do NOT include cause–effect explanations.
-- Use bullet points.
-- Keep this section SHORT and STATIC.
-
-SECTION 2 — STORY RECAP
-Rules:
-- Before describing events, briefly experience the atmosphere and environment of the book.
-- Write the recap as a continuous story, divided into natural paragraphs.
-- Each paragraph must focus on ONLY ONE character or character group.
-- Do NOT jump between characters within the same paragraph.
-- Early chapters must be summarized briefly.
-- Events closer to Chapter {chapter} must be described in more detail.
-- Skip minor side events unless they directly affect the current situation.
-- Emphasize:
-  - turning points
-  - unresolved conflicts
-  - the character’s current mental or situational state
-- Do NOT include headings or labels.
-- End the recap with the most recent unresolved tension, realization, or dilemma.
-
-────────────────────────────
-OUTPUT RULES
-────────────────────────────
-- Output language: Turkish.
-- Start directly with SECTION 1.
-- Do NOT add any commentary or explanations.
-
-CHAPTER SUMMARIES:
-{raw_text}
-""".strip()
+        return PROMPT_TEMPLATE.format(
+            book_title=book_title,
+            chapter=chapter,
+            raw_text=raw_text
+        ).strip()
@@ -1,11 +1,41 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Iterator
+
+from app.core.executor import llm_executor
 
 
 class BaseLLMClient(ABC):
 
+    # Recap cache anahtarlarında kullanılır
+    model_name: str = "unknown"
+
     @abstractmethod
     def generate_recap(self, prompt: str) -> str:
         """
         Takes a recap prompt and returns a generated recap text.
         """
         pass
+
+    def stream_recap(self, prompt: str) -> Iterator[str]:
+        """
+        Yields the recap text in chunks as the model produces it.
+        Clients without streaming support yield the full text once.
+        """
+        yield self.generate_recap(prompt)
+
+    # ------------------------
+    # Async interface (services use these)
+    # ------------------------
+    async def agenerate_recap(self, prompt: str) -> str:
+        """
+        Async generate_recap. Clients without a native async API run the
+        blocking call on the bounded LLM thread pool.
+        """
+        return await llm_executor.run(self.generate_recap, prompt)
+
+    async def astream_recap(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Async stream_recap, bridged from the blocking generator by default.
+        """
+        async for chunk in llm_executor.iterate(self.stream_recap, prompt):
+            yield chunk
@@ -1,3 +1,4 @@
+from typing import AsyncIterator, Iterator
 import google.generativeai as genai
 from app.services.llm.base import BaseLLMClient
 import os
@@ -5,11 +6,14 @@ from dotenv import load_dotenv
 load_dotenv()
 class GeminiClient(BaseLLMClient):
 
+    model_name = "gemini-2.5-flash"
+
     def __init__(self):
+        # Process başına bir kez kurulur (bkz. app/services/llm/registry.py)
         genai.configure(api_key=os.getenv("GEMINI_KEY"))
         # Modeli başlatıyoruz (Gemini 2.5 Flash hızlı ve ücretsiz katman için idealdir)
         self.model = genai.GenerativeModel(
-            model_name="gemini-2.5-flash",
+            model_name=self.model_name,
             generation_config={
                 "temperature": 0.4,
             },
@@ -22,4 +26,20 @@ class GeminiClient(BaseLLMClient):
         response = self.model.generate_content(prompt)
         
         # Yanıtı döndür
-        return response.text
\ No newline at end of file
+        return response.text
+
+    def stream_recap(self, prompt: str) -> Iterator[str]:
+        for chunk in self.model.generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+    # SDK'nın native async API'si: thread tutmaz, iptal edilince istek de kapanır
+    async def agenerate_recap(self, prompt: str) -> str:
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+
+    async def astream_recap(self, prompt: str) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
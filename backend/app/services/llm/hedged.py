@@ -0,0 +1,160 @@
+import asyncio
+import time
+from collections import deque
+from typing import AsyncIterator
+
+from app.services.llm.base import BaseLLMClient
+
+
+class HedgedLLMClient(BaseLLMClient):
+    """
+    Primary + secondary provider with hedged requests.
+
+    Every call goes to the primary first. If it has not answered after the
+    primary's recent `percentile` latency (or `default_delay` until
+    `min_samples` latencies are known), the same prompt is also sent to the
+    secondary and the first answer wins; the other call is cancelled. A
+    primary error switches to the secondary right away.
+
+    Streams race on their first chunk, which comes much sooner than a full
+    answer, so they keep a latency window of their own.
+    """
+
+    def __init__(
+        self,
+        primary: BaseLLMClient,
+        secondary: BaseLLMClient,
+        percentile: float,
+        min_samples: int,
+        default_delay: float,
+        window: int = 200
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        # Cevap iki modelden biri olabilir; cache anahtarı ikisini de içerir
+        self.model_name = f"{primary.model_name}|{secondary.model_name}"
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._first_chunk_latencies: deque[float] = deque(maxlen=window)
+
+        self.calls = 0
+        self.hedged = 0
+        self.secondary_wins = 0
+        self.primary_errors = 0
+
+    def hedge_delay(self, latencies: deque[float] | None = None) -> float:
+        latencies = self._latencies if latencies is None else latencies
+        if len(latencies) < self.min_samples:
+            return self.default_delay
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[index]
+
+    def generate_recap(self, prompt: str) -> str:
+        # Senkron yol: hedge yok, sadece hata durumunda yedek
+        try:
+            return self.primary.generate_recap(prompt)
+        except Exception:
+            self.primary_errors += 1
+            return self.secondary.generate_recap(prompt)
+
+    async def agenerate_recap(self, prompt: str) -> str:
+        return await self._race(
+            lambda client: client.agenerate_recap(prompt),
+            self._latencies
+        )
+
+    async def astream_recap(self, prompt: str) -> AsyncIterator[str]:
+        # İlk chunk'ı önce veren provider kazanır, stream ondan devam eder
+        streams = {}
+
+        async def first_chunk(client: BaseLLMClient):
+            stream = client.astream_recap(prompt)
+            streams[client] = stream
+            try:
+                return await anext(stream)
+            except StopAsyncIteration:
+                return ""
+
+        winner, first = await self._race(first_chunk, self._first_chunk_latencies, with_client=True)
+        for client, stream in streams.items():
+            if client is not winner:
+                await stream.aclose()
+
+        stream = streams[winner]
+        try:
+            if first:
+                yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def _race(self, call, latencies: deque[float], with_client: bool = False):
+        """
+        Runs `call` hedged; `latencies` is the window the hedge delay is
+        read from and the primary's latency is recorded into.
+        """
+        self.calls += 1
+        started = time.monotonic()
+        primary = asyncio.ensure_future(call(self.primary))
+        tasks = {primary: self.primary}
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay(latencies))
+            if primary in done and primary.exception() is None:
+                latencies.append(time.monotonic() - started)
+                return (self.primary, primary.result()) if with_client else primary.result()
+
+            error = None
+            if primary in done:
+                # Primary hata verdi: beklemeden yedeğe geç
+                self.primary_errors += 1
+                error = primary.exception()
+            else:
+                self.hedged += 1
+
+            secondary = asyncio.ensure_future(call(self.secondary))
+            tasks[secondary] = self.secondary
+
+            pending = {task for task in tasks if not task.done()}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        if task is primary:
+                            self.primary_errors += 1
+                        error = error or task.exception()
+                        continue
+
+                    if task is primary:
+                        latencies.append(time.monotonic() - started)
+                    else:
+                        self.secondary_wins += 1
+                        if not primary.done():
+                            # Kaybeden primary'nin süresi en az bu kadar
+                            latencies.append(time.monotonic() - started)
+                    client = tasks[task]
+                    return (client, task.result()) if with_client else task.result()
+
+            raise error
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            # İptalin bitmesini bekle (kaybeden stream güvenle kapatılabilsin)
+            await asyncio.gather(*losers, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "primary": self.primary.model_name,
+            "secondary": self.secondary.model_name,
+            "hedge_delay": round(self.hedge_delay(), 3),
+            "stream_hedge_delay": round(self.hedge_delay(self._first_chunk_latencies), 3),
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "secondary_wins": self.secondary_wins,
+            "primary_errors": self.primary_errors,
+        }
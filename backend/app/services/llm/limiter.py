@@ -0,0 +1,98 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.services.llm.base import BaseLLMClient
+
+
+class LimitedLLMClient(BaseLLMClient):
+    """
+    Wraps an LLM client with a cap on in-flight async calls and a per-call
+    timeout.
+
+    Calls over the cap wait for a free slot (FIFO) instead of bursting into
+    the provider quota; the timeout starts once a slot is taken. A cancelled
+    caller (e.g. the HTTP client went away) gives its slot back immediately.
+    """
+
+    def __init__(self, inner: BaseLLMClient, max_concurrency: int, timeout: float):
+        self.inner = inner
+        self.model_name = inner.model_name
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.calls = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.timeouts = 0
+        self.cancelled = 0
+
+    def generate_recap(self, prompt: str) -> str:
+        return self.inner.generate_recap(prompt)
+
+    def stream_recap(self, prompt: str):
+        return self.inner.stream_recap(prompt)
+
+    def idle_slots(self) -> int:
+        """
+        Slots nobody is using or waiting for (background work yields to
+        interactive callers when this is 0).
+        """
+        return max(0, self.max_concurrency - self.in_flight - self.waiting)
+
+    @asynccontextmanager
+    async def _slot(self):
+        self.calls += 1
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def agenerate_recap(self, prompt: str) -> str:
+        async with self._slot():
+            return await asyncio.wait_for(self.inner.agenerate_recap(prompt), self.timeout)
+
+    async def astream_recap(self, prompt: str) -> AsyncIterator[str]:
+        async with self._slot():
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.timeout
+            stream = self.inner.astream_recap(prompt)
+            try:
+                while True:
+                    # Süre tüm stream için; her chunk kalan süre kadar beklenir
+                    remaining = max(0.0, deadline - loop.time())
+                    try:
+                        chunk = await asyncio.wait_for(anext(stream), remaining)
+                    except StopAsyncIteration:
+                        return
+                    yield chunk
+            finally:
+                await stream.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_name,
+            "max_concurrency": self.max_concurrency,
+            "timeout": self.timeout,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "provider": self.inner.stats() if hasattr(self.inner, "stats") else None,
+        }
@@ -0,0 +1,81 @@
+import asyncio
+import hashlib
+import time
+from typing import AsyncIterator, Iterator
+
+from app.core.config import LOCAL_LLM_LATENCY_MS, LOCAL_LLM_TAIL_MS, LOCAL_LLM_TAIL_RATIO
+from app.services.llm.base import BaseLLMClient
+
+
+class LocalLLMClient(BaseLLMClient):
+    """
+    Deterministic offline stand-in for load tests and local development.
+
+    The recap is built from the prompt itself (same prompt → same text) in
+    the two-section format the real models produce. Latency is
+    `latency_ms`, plus `tail_ms` for the `tail_ratio` share of prompts that
+    hash into the slow tail; `seed` decorrelates two instances' tails.
+    """
+
+    model_name = "local-standin"
+
+    def __init__(
+        self,
+        latency_ms: float = LOCAL_LLM_LATENCY_MS,
+        tail_ms: float = LOCAL_LLM_TAIL_MS,
+        tail_ratio: float = LOCAL_LLM_TAIL_RATIO,
+        seed: str = ""
+    ):
+        self.latency_ms = latency_ms
+        self.tail_ms = tail_ms
+        self.tail_ratio = tail_ratio
+        self.seed = seed
+
+    def latency(self, prompt: str) -> float:
+        """
+        Seconds this prompt takes (deterministic).
+        """
+        digest = hashlib.sha256(f"{self.seed}|{prompt}".encode("utf-8")).digest()
+        bucket = int.from_bytes(digest[:4], "big") / 2 ** 32
+        extra = self.tail_ms if bucket < self.tail_ratio else 0.0
+        return (self.latency_ms + extra) / 1000
+
+    def _recap(self, prompt: str) -> str:
+        # Prompttaki son özet satırları "hikâye" olur
+        lines = [
+            line.strip() for line in prompt.splitlines()
+            if line.startswith(("Season ", "Chapter "))
+        ]
+        story = "\n\n".join(line.split(": ", 1)[-1] for line in lines[-3:])
+
+        return (
+            "SECTION 1 — CHARACTER CONTEXT\n"
+            "• Stand-in character: the protagonist at the stopping point.\n"
+            "SECTION 2 — STORY RECAP\n"
+            f"{story or 'No summaries were provided.'}"
+        )
+
+    def generate_recap(self, prompt: str) -> str:
+        time.sleep(self.latency(prompt))
+        return self._recap(prompt)
+
+    def stream_recap(self, prompt: str) -> Iterator[str]:
+        for delay, chunk in self._chunks(prompt):
+            time.sleep(delay)
+            yield chunk
+
+    async def agenerate_recap(self, prompt: str) -> str:
+        await asyncio.sleep(self.latency(prompt))
+        return self._recap(prompt)
+
+    async def astream_recap(self, prompt: str) -> AsyncIterator[str]:
+        for delay, chunk in self._chunks(prompt):
+            await asyncio.sleep(delay)
+            yield chunk
+
+    def _chunks(self, prompt: str) -> list[tuple[float, str]]:
+        # Satır satır, toplam süre latency() kadar
+        text = self._recap(prompt)
+        chunks = text.splitlines(keepends=True)
+        delay = self.latency(prompt) / len(chunks)
+        return [(delay, chunk) for chunk in chunks]
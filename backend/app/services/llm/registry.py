@@ -0,0 +1,60 @@
+from functools import lru_cache
+from typing import Callable
+
+from app.core.config import (
+    LLM_FALLBACK,
+    LLM_HEDGE_DELAY,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_PERCENTILE,
+    LLM_MAX_CONCURRENCY,
+    LLM_PRIMARY,
+    LLM_TIMEOUT,
+)
+from app.services.llm.base import BaseLLMClient
+from app.services.llm.hedged import HedgedLLMClient
+from app.services.llm.limiter import LimitedLLMClient
+from app.services.llm.local import LocalLLMClient
+
+
+def _gemini() -> BaseLLMClient:
+    # SDK sadece Gemini seçilince import edilir
+    from app.services.llm.gemini import GeminiClient
+    return GeminiClient()
+
+
+# name -> factory; LLM_PRIMARY / LLM_FALLBACK pick from these
+PROVIDERS: dict[str, Callable[[], BaseLLMClient]] = {
+    "gemini": _gemini,
+    "local": LocalLLMClient,
+}
+
+
+def register_provider(name: str, factory: Callable[[], BaseLLMClient]):
+    PROVIDERS[name] = factory
+
+
+def create_provider(name: str) -> BaseLLMClient:
+    factory = PROVIDERS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown LLM provider: {name!r} (known: {', '.join(PROVIDERS)})")
+    return factory()
+
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> LimitedLLMClient:
+    """
+    Process-wide LLM client. Providers are configured and built once;
+    every service shares them and the concurrency limit.
+    """
+    client = create_provider(LLM_PRIMARY)
+
+    if LLM_FALLBACK:
+        client = HedgedLLMClient(
+            client,
+            create_provider(LLM_FALLBACK),
+            percentile=LLM_HEDGE_PERCENTILE,
+            min_samples=LLM_HEDGE_MIN_SAMPLES,
+            default_delay=LLM_HEDGE_DELAY
+        )
+
+    return LimitedLLMClient(client, LLM_MAX_CONCURRENCY, LLM_TIMEOUT)
@@ -0,0 +1,159 @@
+"""
+Prompt budget: local token estimates and deterministic extractive
+compaction of episode / chapter summaries.
+
+Entries are chronological. When they do not fit the budget, the newest
+`keep_recent` entries stay verbatim and older entries are reduced to their
+highest-scoring sentences, with a per-entry allowance that grows toward
+the stopping point (early material brief, recent material detailed, as
+the recap prompts ask); the oldest entries may be dropped entirely.
+Same input + same budget → same output, so compacted prompts stay
+cache-friendly.
+"""
+
+import math
+import re
+from collections import Counter
+
+from app.core.config import PROMPT_CURRENT_SEASON_SHARE, PROMPT_KEEP_RECENT, PROMPT_TOKEN_BUDGET
+
+# Cache anahtarlarına eklenir: bütçe/algoritma değişince eski recap'ler geçersiz
+PROMPT_BUDGET_VERSION = (
+    f"budget-v2:{PROMPT_TOKEN_BUDGET}:{PROMPT_KEEP_RECENT}:{PROMPT_CURRENT_SEASON_SHARE}"
+)
+
+# Verbatim tutulan son girdiler bütçenin en fazla bu kadarını kullanır
+RECENT_SHARE = 0.5
+# Bu kadar token'dan az pay düşen girdi yalnızca başlığıyla kalır
+MIN_ENTRY_TOKENS = 8
+
+_SENTENCE = re.compile(r"(?<=[.!?…])\s+(?=[\"'“‘(\[A-ZÇĞİÖŞÜ0-9])")
+_WORD = re.compile(r"\w+")
+_STOPWORDS = frozenset("""
+a about after again against all also an and any are as at be because been
+before being between both but by can could did do does during each for from
+had has have he her here hers him his how i if in into is it its itself just
+me more most my no nor not now of off on once only or other our out over own
+same she should so some such than that the their them then there these they
+this those through to too under until up very was we were what when where
+which while who whom why will with would you your
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough local token count (~4 characters per token for English prose).
+    """
+    return math.ceil(len(text) / 4)
+
+
+def _sentences(text: str) -> list[str]:
+    return [s.strip() for s in _SENTENCE.split(text.strip()) if s.strip()]
+
+
+def _terms(text: str) -> list[str]:
+    return [
+        w for w in _WORD.findall(text.casefold())
+        if len(w) > 2 and w not in _STOPWORDS and not w.isdigit()
+    ]
+
+
+def _extract(text: str, allowance: int, weights: Counter) -> str:
+    """
+    Keeps the first sentence plus the sentences whose terms recur most
+    across all entries (main characters, ongoing threads), in original
+    order, within `allowance` tokens.
+    """
+    sentences = _sentences(text)
+    if not sentences:
+        return ""
+
+    def score(item: tuple[int, str]) -> tuple[float, int]:
+        index, sentence = item
+        terms = _terms(sentence)
+        value = sum(weights[t] for t in terms) / math.sqrt(len(terms)) if terms else 0.0
+        return (-value, index)
+
+    first = sentences[0]
+    if estimate_tokens(first) > allowance:
+        # Tek cümle bile sığmıyor: kelime sınırından kes
+        words = first.split()
+        kept: list[str] = []
+        for word in words:
+            if estimate_tokens(" ".join(kept + [word]) + " …") > allowance:
+                break
+            kept.append(word)
+        return " ".join(kept) + " …" if kept else ""
+
+    chosen = {0}
+    used = estimate_tokens(first)
+    for index, sentence in sorted(enumerate(sentences[1:], start=1), key=score):
+        cost = estimate_tokens(sentence) + 1
+        if used + cost <= allowance:
+            chosen.add(index)
+            used += cost
+
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def fit_to_budget(
+    bodies: list[str],
+    budget: int = PROMPT_TOKEN_BUDGET,
+    keep_recent: int = PROMPT_KEEP_RECENT,
+    overheads: list[int] | None = None,
+) -> list[str | None]:
+    """
+    Compacts chronological entry texts so their estimated total, plus each
+    entry's fixed overhead (e.g. its "Season 1, Episode 2 (...):" header),
+    stays within `budget` tokens. Returns a list of the same length; None
+    marks an early entry that was dropped because nothing of it fits.
+    """
+    overheads = overheads or [0] * len(bodies)
+    costs = [estimate_tokens(body) + overhead for body, overhead in zip(bodies, overheads)]
+    if sum(costs) <= budget:
+        return list(bodies)
+
+    result: list[str | None] = list(bodies)
+
+    # 1. Son bölümler aynen kalır (en az sonuncusu)
+    recent_cap = budget * RECENT_SHARE
+    start = len(bodies)
+    used = 0
+    while start > 0 and len(bodies) - start < keep_recent:
+        cost = costs[start - 1]
+        if start < len(bodies) and used + cost > recent_cap:
+            break
+        start -= 1
+        used += cost
+
+    if used > budget:
+        result[-1] = _extract(bodies[-1], budget - overheads[-1], Counter())
+        used = estimate_tokens(result[-1]) + overheads[-1]
+
+    early = range(start)
+    if not early:
+        return result
+
+    # 2. Eski bölümler: yakına doğru artan ağırlıkla kalan bütçe paylaşılır
+    weights = Counter()
+    for body in bodies:
+        weights.update(set(_terms(body)))
+
+    remaining = max(0, budget - used)
+    total_share = sum(i + 1 for i in early)
+
+    # Payı küçük girdiler düşünce artan bütçe sonrakilere aktarılır
+    carry = 0.0
+    for i in early:
+        allowance = remaining * (i + 1) / total_share + carry
+        if costs[i] <= allowance:
+            carry = allowance - costs[i]
+            continue
+        if allowance - overheads[i] < MIN_ENTRY_TOKENS:
+            result[i] = None
+            carry = allowance
+            continue
+        result[i] = _extract(bodies[i], int(allowance - overheads[i]), weights)
+        carry = allowance - estimate_tokens(result[i]) - overheads[i]
+
+    return result
@@ -0,0 +1,184 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from app.core.config import RECAP_CACHE_MAX_ENTRIES, RECAP_CACHE_PATH
+
+
+def prompt_hash(template: str) -> str:
+    """
+    Short, stable version id for a prompt template.
+    """
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass(slots=True, frozen=True)
+class RecapKey:
+    kind: str          # series | book
+    content_id: str    # TMDB tv id | CourseHero book slug
+    position: str      # S6E2 | P2C3
+    language: str
+    prompt_hash: str
+    model: str
+
+    def digest(self) -> str:
+        raw = "|".join((self.kind, self.content_id, self.position, self.language, self.prompt_hash, self.model))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True, frozen=True)
+class RecapResult:
+    text: str
+    cached: bool
+    generated_at: str
+
+
+class RecapCache:
+    """
+    Persistent full-recap cache (SQLite, WAL mode).
+
+    Keyed by content id, position, language, prompt template hash and model
+    name, so a prompt or model change never serves an old recap. Bounded to
+    `max_entries`; the least recently read entries are evicted first.
+    Entries built from inputs that may still change (recent episodes, empty
+    overviews) are stored with a TTL and regenerated after it.
+    """
+
+    def __init__(self, path: str = RECAP_CACHE_PATH, max_entries: int = RECAP_CACHE_MAX_ENTRIES):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS recaps (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                content_id TEXT NOT NULL,
+                position TEXT NOT NULL,
+                language TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                text TEXT NOT NULL,
+                generated_at TEXT NOT NULL,
+                last_access REAL NOT NULL,
+                expires_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS recaps_content ON recaps (kind, content_id);
+            CREATE INDEX IF NOT EXISTS recaps_access ON recaps (last_access);
+            """
+        )
+        # Eski dosyalar: expires_at kolonu sonradan eklendi
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(recaps)")}
+        if "expires_at" not in columns:
+            self._db.execute("ALTER TABLE recaps ADD COLUMN expires_at REAL")
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: RecapKey) -> RecapResult | None:
+        digest = key.digest()
+
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT text, generated_at FROM recaps "
+                "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (digest, time.time()),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._db.execute(
+                "UPDATE recaps SET last_access = ? WHERE key = ?", (time.time(), digest)
+            )
+
+        self.hits += 1
+        return RecapResult(text=row[0], cached=True, generated_at=row[1])
+
+    def contains(self, key: RecapKey) -> bool:
+        """
+        Presence check without touching hit counters or LRU order.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM recaps WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key.digest(), time.time()),
+            ).fetchone()
+        return row is not None
+
+    def put(self, key: RecapKey, text: str, expires_at: float | None = None) -> RecapResult:
+        """
+        Stores a recap; `expires_at` (epoch seconds) for recaps that must be
+        regenerated later, None to keep it until evicted.
+        """
+        generated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO recaps "
+                "(key, kind, content_id, position, language, prompt_hash, model, "
+                "text, generated_at, last_access, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key.digest(), key.kind, key.content_id, key.position, key.language,
+                    key.prompt_hash, key.model, text, generated_at, time.time(), expires_at,
+                ),
+            )
+            self._evict()
+
+        return RecapResult(text=text, cached=False, generated_at=generated_at)
+
+    def _evict(self):
+        self._db.execute("DELETE FROM recaps WHERE expires_at <= ?", (time.time(),))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM recaps").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM recaps WHERE key IN "
+                "(SELECT key FROM recaps ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            )
+
+    def invalidate(self, kind: str, content_id: str | None = None, position: str | None = None) -> int:
+        """
+        Drops cached recaps of a kind, optionally narrowed to one content id
+        and position. Returns the number of removed entries.
+        """
+        query = "DELETE FROM recaps WHERE kind = ?"
+        params: list = [kind]
+
+        if content_id is not None:
+            query += " AND content_id = ?"
+            params.append(content_id)
+        if position is not None:
+            query += " AND position = ?"
+            params.append(position)
+
+        with self._lock, self._db:
+            return self._db.execute(query, params).rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            (count,) = self._db.execute("SELECT COUNT(*) FROM recaps").fetchone()
+        return {
+            "entries": count,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_recap_cache() -> RecapCache:
+    return RecapCache()
@@ -0,0 +1,198 @@
+"""
+Asynchronous recap jobs.
+
+Routes submit a job and answer right away with its id; a fixed number of
+workers run the jobs from a bounded queue. Each job has an idempotency key:
+submitting the same key again while the job is queued, running or still
+retained returns the existing job (failed jobs are retried instead). The
+key is bound to a fingerprint of the request it was first used with;
+reusing it for a different request raises IdempotencyConflict.
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Awaitable, Callable
+
+from app.core.config import RECAP_JOB_QUEUE_SIZE, RECAP_JOB_TTL, RECAP_JOB_WORKERS
+from app.services.recap_cache import RecapResult
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class IdempotencyConflict(Exception):
+    """The idempotency key is already in use for a different request."""
+
+
+@dataclass(slots=True)
+class RecapJob:
+    id: str
+    kind: str
+    idempotency_key: str
+    fingerprint: str
+    run: Callable[[], Awaitable[RecapResult]]
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    result: RecapResult | None = None
+    error: BaseException | None = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class RecapJobQueue:
+
+    def __init__(
+        self,
+        workers: int = RECAP_JOB_WORKERS,
+        max_queued: int = RECAP_JOB_QUEUE_SIZE,
+        ttl: float = RECAP_JOB_TTL
+    ):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.ttl = ttl
+
+        self._queue: asyncio.Queue[RecapJob] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._jobs: dict[str, RecapJob] = {}
+        self._by_key: dict[str, RecapJob] = {}
+
+        self.submitted = 0
+        self.attached = 0
+        self.rejected = 0
+        self.conflicts = 0
+
+    # ------------------------
+    # Submission / lookup
+    # ------------------------
+    def submit(
+        self,
+        kind: str,
+        idempotency_key: str,
+        run: Callable[[], Awaitable[RecapResult]],
+        fingerprint: str = ""
+    ) -> tuple[RecapJob, bool]:
+        """
+        Returns (job, created). `run` is only called if a new job is queued.
+        `fingerprint` identifies the request body (e.g. a hash of it).
+        """
+        self._start()
+        self._prune()
+
+        key = f"{kind}:{idempotency_key}"
+        existing = self._by_key.get(key)
+        if existing is not None and existing.fingerprint != fingerprint:
+            self.conflicts += 1
+            raise IdempotencyConflict(f"Idempotency key {idempotency_key!r} was used for a different request")
+        if existing is not None and existing.status != FAILED:
+            self.attached += 1
+            return existing, False
+
+        job = RecapJob(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            idempotency_key=key,
+            fingerprint=fingerprint,
+            run=run
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise JobQueueFull(f"{self.max_queued} recap jobs already queued")
+
+        self.submitted += 1
+        self._jobs[job.id] = job
+        self._by_key[key] = job
+        return job, True
+
+    def get(self, job_id: str) -> RecapJob | None:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: RecapJob, timeout: float) -> RecapJob:
+        """
+        Long-poll: returns once the job finished or `timeout` passed.
+        """
+        if timeout > 0 and not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    # ------------------------
+    # Workers
+    # ------------------------
+    def _start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(self.max_queued)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"recap-job-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            try:
+                job.result = await job.run()
+                job.status = DONE
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.error = e
+                job.status = FAILED
+                print(f"⚠️ Recap job {job.id} başarısız: {e}")
+            finally:
+                job.finished_at = time.time()
+                job.run = None
+                job.done.set()
+                self._queue.task_done()
+
+    def _prune(self):
+        # Süresi dolan bitmiş job'lar unutulur
+        cutoff = time.time() - self.ttl
+        expired = [
+            job for job in self._jobs.values()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job in expired:
+            del self._jobs[job.id]
+            if self._by_key.get(job.idempotency_key) is job:
+                del self._by_key[job.idempotency_key]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        by_status = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in self._jobs.values():
+            by_status[job.status] += 1
+
+        return {
+            "workers": self.workers,
+            "max_queued": self.max_queued,
+            "submitted": self.submitted,
+            "attached": self.attached,
+            "rejected": self.rejected,
+            "conflicts": self.conflicts,
+            **by_status,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_recap_jobs() -> RecapJobQueue:
+    return RecapJobQueue()
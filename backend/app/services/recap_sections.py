@@ -0,0 +1,115 @@
+"""
+Parsing of the two-section recap format produced by the recap prompts:
+
+    SECTION 1 — CHARACTER CONTEXT
+    • ...
+    SECTION 2 — STORY RECAP
+    ...
+"""
+
+SECTION_1 = "SECTION 1 —"
+SECTION_2 = "SECTION 2 —"
+CHARACTER_HEADER = "CHARACTER CONTEXT"
+STORY_HEADER = "STORY RECAP"
+
+
+def _is_character_line(line: str) -> bool:
+    return line.startswith("•") or (bool(line) and not line.startswith("-"))
+
+
+def parse_recap_sections(recap_text: str) -> tuple[list[str], str]:
+    """
+    Splits a finished recap into (character context lines, story recap).
+    """
+    sections = recap_text.split(SECTION_2)
+
+    character_context = []
+    story_recap = ""
+
+    if len(sections) >= 1:
+        # Extract character context bullets
+        context_text = sections[0].replace(SECTION_1, "").replace(CHARACTER_HEADER, "").strip()
+        character_context = [
+            line.strip()
+            for line in context_text.split("\n")
+            if _is_character_line(line.strip())
+        ]
+
+    if len(sections) == 2:
+        story_recap = sections[1].replace(STORY_HEADER, "").strip()
+
+    return character_context, story_recap
+
+
+class RecapSectionStream:
+    """
+    Incremental counterpart of parse_recap_sections for streamed output.
+
+    feed() takes raw model chunks and returns events as soon as they are
+    complete: ("character", line) for each finished SECTION 1 line and
+    ("story", text) for SECTION 2 text deltas.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._in_story = False
+        self._story_started = False
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        self._buffer += chunk
+        events: list[tuple[str, str]] = []
+
+        if not self._in_story:
+            marker = self._buffer.find(SECTION_2)
+
+            if marker == -1:
+                # Sadece tamamlanmış satırlar; yarım satır (ve olası yarım
+                # SECTION 2 işareti) bir sonraki chunk'ı bekler
+                cut = self._buffer.rfind("\n")
+                if cut == -1:
+                    return events
+                events += self._character_lines(self._buffer[:cut])
+                self._buffer = self._buffer[cut + 1:]
+                return events
+
+            events += self._character_lines(self._buffer[:marker])
+            self._buffer = self._buffer[marker + len(SECTION_2):]
+            self._in_story = True
+
+        events += self._story_delta()
+        return events
+
+    def finish(self) -> list[tuple[str, str]]:
+        if not self._in_story:
+            events = self._character_lines(self._buffer)
+            self._buffer = ""
+            return events
+
+        events = self._story_delta(final=True)
+        return events
+
+    def _character_lines(self, text: str) -> list[tuple[str, str]]:
+        events = []
+        for line in text.split("\n"):
+            line = line.replace(SECTION_1, "").replace(CHARACTER_HEADER, "").strip()
+            if _is_character_line(line):
+                events.append(("character", line))
+        return events
+
+    def _story_delta(self, final: bool = False) -> list[tuple[str, str]]:
+        if not self._story_started:
+            head = self._buffer.lstrip()
+
+            # Başlığın tamamı gelene kadar bekle, sonra at
+            if not final and len(head) < len(STORY_HEADER) and STORY_HEADER.startswith(head):
+                return []
+            if head.startswith(STORY_HEADER):
+                head = head[len(STORY_HEADER):]
+
+            self._buffer = head.lstrip()
+            if not self._buffer:
+                return []
+            self._story_started = True
+
+        text, self._buffer = self._buffer, ""
+        return [("story", text)] if text else []
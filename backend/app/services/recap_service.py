@@ -1,30 +1,30 @@
-from app.services.llm.gemini import GeminiClient
-from app.data_sources.tmdb import TMDBClient
+import asyncio
+from itertools import groupby
 
-class RecapService:
-
-    def __init__(self):
-        self.tmdb = TMDBClient()
-        self.llm = GeminiClient()
-
-    def _build_raw_text(self, episodes: list) -> str:
-        parts = []
-        for ep in episodes:
-            parts.append(
-                f"Season {ep['season']}, Episode {ep['episode']} "
-                f"({ep['title']}): {ep['overview']}"
-            )
-        return "\n".join(parts)
-
-    def generate_full_recap(self, title: str, season: int, episode: int) -> str:
-        # 1. TMDb'den raw recap datası
-        episodes = self.tmdb.get_recap_until(title, season, episode)
+from app.core.config import (
+    PROMPT_CURRENT_SEASON_SHARE,
+    PROMPT_TOKEN_BUDGET,
+    RECAP_LANGUAGE,
+    RECAP_MODE,
+)
+from app.core.singleflight import SingleFlight
+from app.data_sources.tmdb import TMDBClient, get_tmdb_client
+from app.services.llm.base import BaseLLMClient
+from app.services.llm.registry import get_llm_client
+from app.services.prompt_budget import PROMPT_BUDGET_VERSION, estimate_tokens, fit_to_budget
+from app.services.recap_cache import (
+    RecapCache,
+    RecapKey,
+    RecapResult,
+    get_recap_cache,
+    prompt_hash,
+)
 
-        # 2. Raw recap text oluştur
-        raw_text = self._build_raw_text(episodes)
+# Aynı (dizi, sezon, bölüm) için eşzamanlı istekler tek üretimi paylaşır
+_recap_flight = SingleFlight("series_recap")
+_digest_flight = SingleFlight("season_digest")
 
-        # 3. Prompt hazırla
-        prompt = f"""
+PROMPT_TEMPLATE = """
 Below are episode summaries for {title} up to Season {season} Episode {episode}.
 Your task is to create a detailed recap of the story so far and PRODUCE EXACTLY TWO SECTIONS as per the instructions below.     
 
@@ -70,5 +70,294 @@ EPISODE SUMMARIES:
 {raw_text}
 """
 
-        # 4. LLM'e gönder
-        return self.llm.generate_recap(prompt)
+PROMPT_VERSION = prompt_hash(PROMPT_TEMPLATE + PROMPT_BUDGET_VERSION)
+
+# Hierarchical mode: earlier seasons arrive as cached digests, only the
+# target season is sent as raw episode overviews.
+HIERARCHICAL_PROMPT_TEMPLATE = PROMPT_TEMPLATE.replace(
+    "Below are episode summaries for {title} up to Season {season} Episode {episode}.",
+    "Below are condensed season digests for {title} (Seasons 1–{previous_season}) "
+    "followed by episode summaries for Season {season} up to Episode {episode}."
+).replace(
+    "EPISODE SUMMARIES:\n{raw_text}",
+    "SEASON DIGESTS:\n{digests}\n\nEPISODE SUMMARIES (Season {season}):\n{raw_text}"
+)
+
+HIERARCHICAL_PROMPT_VERSION = prompt_hash(HIERARCHICAL_PROMPT_TEMPLATE + PROMPT_BUDGET_VERSION)
+
+DIGEST_PROMPT_TEMPLATE = """
+Below are the episode summaries of Season {season} of {title}.
+Condense the whole season into one digest that a recap writer can use instead of the episode summaries.
+
+Rules:
+- Keep every event that changes a main character's situation, relationships or goals.
+- Keep how the season ends: open conflicts, cliffhangers, who is where.
+- Drop minor side plots that are resolved within the season.
+- Use plain prose in chronological order, at most 250 words.
+- Do NOT add commentary, headings or information that is not in the summaries.
+- Write in the same language as the summaries.
+
+EPISODE SUMMARIES:
+{raw_text}
+"""
+
+DIGEST_PROMPT_VERSION = prompt_hash(DIGEST_PROMPT_TEMPLATE + PROMPT_BUDGET_VERSION)
+
+
+class RecapService:
+
+    def __init__(
+        self,
+        tmdb: TMDBClient | None = None,
+        cache: RecapCache | None = None,
+        llm: BaseLLMClient | None = None
+    ):
+        self.tmdb = tmdb or get_tmdb_client()
+        self.cache = cache or get_recap_cache()
+        self.llm = llm or get_llm_client()
+
+    def _build_raw_text(self, episodes: list, budget: int = PROMPT_TOKEN_BUDGET) -> str:
+        headers = [
+            f"Season {ep['season']}, Episode {ep['episode']} ({ep['title']}):"
+            for ep in episodes
+        ]
+        # Bütçe aşılırsa eski özetler kısaltılır (en eskiler tamamen düşebilir)
+        overviews = fit_to_budget(
+            [ep["overview"] or "" for ep in episodes],
+            budget,
+            overheads=[estimate_tokens(h) + 1 for h in headers]
+        )
+
+        parts = []
+        for header, overview in zip(headers, overviews):
+            if overview is not None:
+                parts.append(f"{header} {overview}".rstrip())
+        return "\n".join(parts)
+
+    def _hierarchical(self, season: int) -> bool:
+        return RECAP_MODE == "hierarchical" and season > 1
+
+    def _cache_key(self, tv_id: int, season: int, episode: int) -> RecapKey:
+        return RecapKey(
+            kind="series",
+            content_id=str(tv_id),
+            position=f"S{season}E{episode}",
+            language=RECAP_LANGUAGE,
+            prompt_hash=(
+                HIERARCHICAL_PROMPT_VERSION
+                if self._hierarchical(season)
+                else PROMPT_VERSION
+            ),
+            model=self.llm.model_name
+        )
+
+    def _digest_key(self, tv_id: int, season: int) -> RecapKey:
+        return RecapKey(
+            kind="series_digest",
+            content_id=str(tv_id),
+            position=f"S{season}",
+            language=RECAP_LANGUAGE,
+            prompt_hash=DIGEST_PROMPT_VERSION,
+            model=self.llm.model_name
+        )
+
+    def missing_llm_calls(self, tv_id: int, season: int, episode: int) -> int:
+        """
+        Upper bound on the LLM calls generate_recap_for_id would make right
+        now: 0 for a cached recap, otherwise the recap itself plus (in
+        hierarchical mode) every earlier season whose digest is not cached.
+        """
+        if self.cache.contains(self._cache_key(tv_id, season, episode)):
+            return 0
+        if not self._hierarchical(season):
+            return 1
+        return 1 + sum(
+            not self.cache.contains(self._digest_key(tv_id, number))
+            for number in range(1, season)
+        )
+
+    async def _season_digest(
+        self,
+        tv_id: int,
+        title: str,
+        season: int,
+        episodes: list,
+        expires_at: float | None = None
+    ) -> str:
+        """
+        Condensed digest of a completed season, generated once and cached;
+        until `expires_at` only, if some of its episodes are still volatile.
+        """
+        key = self._digest_key(tv_id, season)
+
+        async def generate():
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached.text
+
+            prompt = DIGEST_PROMPT_TEMPLATE.format(
+                title=title,
+                season=season,
+                raw_text=self._build_raw_text(episodes)
+            )
+            text = await self.llm.agenerate_recap(prompt)
+            return self.cache.put(key, text.strip(), expires_at).text
+
+        return await _digest_flight.do(key, generate)
+
+    async def generate_full_recap(self, title: str, season: int, episode: int) -> RecapResult:
+        # Başlık → TMDB id (cache anahtarı çözümlenmiş id üzerinden)
+        tv_id = await self.tmdb.resolve_tv_id(title)
+        return await self.generate_recap_for_id(tv_id, title, season, episode)
+
+    async def generate_recap_for_id(self, tv_id: int, title: str, season: int, episode: int) -> RecapResult:
+        """
+        Same as generate_full_recap for an already resolved TMDB id
+        (e.g. shows taken from the trending/popular listings).
+        """
+        key = self._cache_key(tv_id, season, episode)
+
+        return await _recap_flight.do(
+            key,
+            lambda: self._generate_full_recap(key, title, tv_id, season, episode)
+        )
+
+    async def _generate_full_recap(
+        self,
+        key: RecapKey,
+        title: str,
+        tv_id: int,
+        season: int,
+        episode: int
+    ) -> RecapResult:
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        prompt, expires_at = await self._build_recap_prompt(tv_id, title, season, episode)
+
+        # 4. LLM'e gönder (paylaşılan client, eşzamanlılık limiti + timeout)
+        text = await self.llm.agenerate_recap(prompt)
+        return self.cache.put(key, text, expires_at)
+
+    async def stream_full_recap(self, title: str, season: int, episode: int):
+        """
+        Streaming variant of generate_full_recap: yields text chunks as the
+        model produces them, then the final RecapResult. A cache hit yields
+        the whole cached text as a single chunk.
+        """
+        tv_id = await self.tmdb.resolve_tv_id(title)
+        key = self._cache_key(tv_id, season, episode)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached.text
+            yield cached
+            return
+
+        prompt, expires_at = await self._build_recap_prompt(tv_id, title, season, episode)
+
+        chunks = []
+        async for chunk in self.llm.astream_recap(prompt):
+            chunks.append(chunk)
+            yield chunk
+
+        yield self.cache.put(key, "".join(chunks), expires_at)
+
+    async def _build_recap_prompt(
+        self,
+        tv_id: int,
+        title: str,
+        season: int,
+        episode: int
+    ) -> tuple[str, float | None]:
+        """
+        (prompt, expires_at): expires_at is set when some input episode is
+        still volatile (recent, unaired or without an overview), so the
+        recap is regenerated once TMDB may have filled it in.
+        """
+        # 1. TMDb'den raw recap datası
+        episodes, expires = await self.tmdb.get_recap_episodes(tv_id, season, episode)
+        expires_at = min((t for t in expires.values() if t is not None), default=None)
+
+        # 2-3. Raw recap text + prompt
+        if self._hierarchical(season):
+            prompt = await self._build_hierarchical_prompt(
+                tv_id, title, season, episode, episodes, expires
+            )
+            return prompt, expires_at
+
+        prompt = PROMPT_TEMPLATE.format(
+            title=title,
+            season=season,
+            episode=episode,
+            raw_text=self._build_raw_text(episodes)
+        )
+        return prompt, expires_at
+
+    async def _build_hierarchical_prompt(
+        self,
+        tv_id: int,
+        title: str,
+        season: int,
+        episode: int,
+        episodes: list,
+        expires: dict[int, float | None]
+    ) -> str:
+        by_season = {
+            number: list(items)
+            for number, items in groupby(episodes, key=lambda ep: ep["season"])
+        }
+        previous = [number for number in sorted(by_season) if number < season]
+
+        # Önceki sezonlar: cache'teki digest'ler (eksikler paralel üretilir)
+        digests = await asyncio.gather(*(
+            self._season_digest(tv_id, title, number, by_season[number], expires.get(number))
+            for number in previous
+        ))
+
+        digest_text, raw_text = self._hierarchical_sections(
+            dict(zip(previous, digests)),
+            by_season.get(season, [])
+        )
+
+        return HIERARCHICAL_PROMPT_TEMPLATE.format(
+            title=title,
+            season=season,
+            episode=episode,
+            previous_season=season - 1,
+            digests=digest_text,
+            raw_text=raw_text
+        )
+
+    def _hierarchical_sections(
+        self,
+        digests: dict[int, str],
+        current: list,
+        budget: int = PROMPT_TOKEN_BUDGET
+    ) -> tuple[str, str]:
+        """
+        Splits the budget between earlier-season digests and the current
+        season's overviews. The current season always keeps at least
+        PROMPT_CURRENT_SEASON_SHARE of the budget; digests are compacted
+        into the rest (oldest seasons first), and whatever they leave
+        unused goes back to the current season.
+        """
+        headers = [f"Season {number}:" for number in digests]
+        compacted = fit_to_budget(
+            list(digests.values()),
+            int(budget * (1 - PROMPT_CURRENT_SEASON_SHARE)),
+            overheads=[estimate_tokens(h) + 2 for h in headers]
+        )
+
+        digest_text = "\n\n".join(
+            f"{header} {digest}".rstrip()
+            for header, digest in zip(headers, compacted)
+            if digest is not None
+        )
+
+        current_budget = max(
+            int(budget * PROMPT_CURRENT_SEASON_SHARE),
+            budget - estimate_tokens(digest_text)
+        )
+        return digest_text, self._build_raw_text(current, current_budget)
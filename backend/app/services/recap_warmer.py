@@ -0,0 +1,211 @@
+"""
+Background recap warm-up.
+
+Walks /series/trending and /series/popular, and for each show generates
+the recap up to its latest aired episode and the few before it, so the
+first visitor after an episode airs gets a cached response.
+
+Warm-up is low priority: TMDB requests use the BULK class, each recap
+waits until the shared LLM client has idle slots beyond the ones reserved
+for users, and one cycle stays within its LLM call budget: before each
+recap the calls it still needs (the recap plus any uncached season
+digests) are counted, and a recap that would overrun the budget is
+skipped.
+
+    python -m app.services.recap_warmer    # tek tur, sonucu yazdırır
+"""
+
+import asyncio
+import time
+from functools import lru_cache
+
+from app.core.config import (
+    RECAP_WARMUP_EPISODES,
+    RECAP_WARMUP_INTERVAL,
+    RECAP_WARMUP_LLM_BUDGET,
+    RECAP_WARMUP_MAX_SHOWS,
+    RECAP_WARMUP_PAGES,
+    RECAP_WARMUP_RESERVED_SLOTS,
+)
+from app.core.rate_limit import BULK
+from app.data_sources.tmdb import TMDBClient, get_tmdb_client
+from app.services.llm.base import BaseLLMClient
+from app.services.llm.registry import get_llm_client
+from app.services.recap_service import RecapService
+
+# Boş LLM slotu beklerken kontrol aralığı
+IDLE_POLL_INTERVAL = 1.0
+
+
+class _CountingLLM(BaseLLMClient):
+    """
+    Pass-through client that counts the LLM calls of one warm-up cycle.
+    Same model_name as the wrapped client, so cache keys match user requests.
+    """
+
+    def __init__(self, inner: BaseLLMClient):
+        self.inner = inner
+        self.model_name = inner.model_name
+        self.calls = 0
+
+    def generate_recap(self, prompt: str) -> str:
+        self.calls += 1
+        return self.inner.generate_recap(prompt)
+
+    async def agenerate_recap(self, prompt: str) -> str:
+        self.calls += 1
+        return await self.inner.agenerate_recap(prompt)
+
+    async def astream_recap(self, prompt: str):
+        self.calls += 1
+        async for chunk in self.inner.astream_recap(prompt):
+            yield chunk
+
+
+class RecapWarmer:
+
+    def __init__(
+        self,
+        tmdb: TMDBClient | None = None,
+        llm: BaseLLMClient | None = None,
+        interval: float = RECAP_WARMUP_INTERVAL,
+        pages: int = RECAP_WARMUP_PAGES,
+        max_shows: int = RECAP_WARMUP_MAX_SHOWS,
+        episodes: int = RECAP_WARMUP_EPISODES,
+        llm_budget: int = RECAP_WARMUP_LLM_BUDGET,
+        reserved_slots: int = RECAP_WARMUP_RESERVED_SLOTS
+    ):
+        self.tmdb = tmdb or get_tmdb_client()
+        self.llm = llm or get_llm_client()
+        self.interval = interval
+        self.pages = pages
+        self.max_shows = max_shows
+        self.episodes = episodes
+        self.llm_budget = llm_budget
+        self.reserved_slots = reserved_slots
+
+        self.cycles = 0
+        self.generated = 0
+        self.already_cached = 0
+        self.failed = 0
+        self.over_budget = 0
+        self.llm_calls = 0
+        self.last_cycle_at: float | None = None
+        self.running = False
+
+    # ------------------------
+    # Scheduling
+    # ------------------------
+    async def run_forever(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Recap warm-up turu başarısız: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> dict:
+        """
+        One warm-up cycle; returns the cycle's counters.
+        """
+        self.running = True
+        counting = _CountingLLM(self.llm)
+        service = RecapService(tmdb=self.tmdb, llm=counting)
+        cycle = {"shows": 0, "generated": 0, "already_cached": 0, "failed": 0, "over_budget": 0}
+
+        try:
+            for tv_id, title in await self._candidate_shows():
+                if counting.calls >= self.llm_budget:
+                    print(f"Recap warm-up: LLM bütçesi doldu ({counting.calls})")
+                    break
+
+                latest = await self.tmdb.last_aired_episode(tv_id, priority=BULK)
+                if latest is None:
+                    continue
+
+                cycle["shows"] += 1
+                season, last_episode = latest
+
+                # En son bölüm önce: bütçe biterse en değerli recap hazır olur
+                for episode in range(last_episode, max(0, last_episode - self.episodes), -1):
+                    needed = service.missing_llm_calls(tv_id, season, episode)
+                    if counting.calls + needed > self.llm_budget:
+                        cycle["over_budget"] += 1
+                        continue
+
+                    await self._wait_for_idle_llm()
+                    try:
+                        result = await service.generate_recap_for_id(tv_id, title, season, episode)
+                    except Exception as e:
+                        cycle["failed"] += 1
+                        print(f"⚠️ Warm-up recap hatası ({title} S{season}E{episode}): {e}")
+                        continue
+
+                    cycle["already_cached" if result.cached else "generated"] += 1
+        finally:
+            self.running = False
+            self.cycles += 1
+            self.last_cycle_at = time.time()
+            self.generated += cycle["generated"]
+            self.already_cached += cycle["already_cached"]
+            self.failed += cycle["failed"]
+            self.over_budget += cycle["over_budget"]
+            self.llm_calls += counting.calls
+
+        cycle["llm_calls"] = counting.calls
+        print(f"Recap warm-up turu bitti: {cycle}")
+        return cycle
+
+    async def _candidate_shows(self) -> list[tuple[int, str]]:
+        listings = await asyncio.gather(*(
+            fetch(page, priority=BULK)
+            for fetch in (self.tmdb.trending_tv, self.tmdb.popular_tv)
+            for page in range(1, self.pages + 1)
+        ))
+
+        shows: dict[int, str] = {}
+        for listing in listings:
+            for show in listing.get("results", []):
+                if show["id"] not in shows and show.get("name"):
+                    shows[show["id"]] = show["name"]
+
+        return list(shows.items())[:self.max_shows]
+
+    async def _wait_for_idle_llm(self):
+        # Kullanıcı istekleri için ayrılan slotlar boşalana kadar bekle
+        idle_slots = getattr(self.llm, "idle_slots", None)
+        if idle_slots is None:
+            return
+        while idle_slots() <= self.reserved_slots:
+            await asyncio.sleep(IDLE_POLL_INTERVAL)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "cycles": self.cycles,
+            "last_cycle_at": self.last_cycle_at,
+            "generated": self.generated,
+            "already_cached": self.already_cached,
+            "failed": self.failed,
+            "over_budget": self.over_budget,
+            "llm_calls": self.llm_calls,
+            "llm_budget": self.llm_budget,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_recap_warmer() -> RecapWarmer:
+    return RecapWarmer()
+
+
+async def main():
+    try:
+        await get_recap_warmer().run_once()
+    finally:
+        await get_tmdb_client().aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
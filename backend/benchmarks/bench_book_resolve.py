@@ -0,0 +1,80 @@
+"""
+Book title resolution against the stand-in Google Books server.
+
+Resolves a set of free-form titles (typos, edition noise, Turkish
+translations) twice with a fresh metadata cache: the cold pass shows how
+many API requests each title costs, the warm pass must cost none. The
+expected first title candidate of every title is checked, including the
+translated-title case: "Suç ve Ceza" must resolve to the English original
+through the author lookup, while "Fareler ve İnsanlar" (an author with two
+equally rated works) must not. Exits 1 on any mismatch.
+
+Usage (from backend/):
+    python -m benchmarks.bench_book_resolve [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("TMDB_API_KEY", "benchmark-key")
+
+from app.data_sources.google_books import BookMetadataCache, GoogleBooksClient  # noqa: E402
+from benchmarks.google_books_standin import StandInGoogleBooks  # noqa: E402
+
+# başlık -> beklenen ilk aday (None: eşleşme yok)
+EXPECTED = {
+    "crime and punishment": "Crime and Punishment",
+    "Crime and Punishmnet": "Crime and Punishment",
+    "Suç ve Ceza": "Crime and Punishment",
+    "Fareler ve İnsanlar": "Fareler ve İnsanlar",
+    "the great gatsby": "The Great Gatsby",
+    "A Book Nobody Wrote": None,
+}
+
+
+async def _resolve_all(client: GoogleBooksClient) -> dict:
+    return {title: await client.resolve(title) for title in EXPECTED}
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    with StandInGoogleBooks(latency_ms=args.latency_ms) as server:
+        client = GoogleBooksClient(base_url=server.base_url, cache=BookMetadataCache(":memory:"))
+        try:
+            start = time.perf_counter()
+            cold = await _resolve_all(client)
+            cold_seconds = time.perf_counter() - start
+            cold_requests = server.total_requests
+
+            start = time.perf_counter()
+            warm = await _resolve_all(client)
+            warm_seconds = time.perf_counter() - start
+            warm_requests = server.total_requests - cold_requests
+        finally:
+            await client.aclose()
+
+    failures = 0
+    for title, expected in EXPECTED.items():
+        metadata = cold[title]
+        first = metadata.title_candidates[0] if metadata else None
+        ok = first == expected and warm[title] == metadata
+        failures += not ok
+        candidates = list(metadata.title_candidates) if metadata else None
+        print(f"{'OK  ' if ok else 'FAIL'} {title!r:<26} -> {candidates}")
+
+    print(
+        f"cold: {cold_requests} requests, {cold_seconds * 1000:.0f}ms  "
+        f"warm: {warm_requests} requests, {warm_seconds * 1000:.1f}ms"
+    )
+    if failures or warm_requests:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,195 @@
+"""
+HTML extraction cost per page: BeautifulSoup/html.parser vs lxml.
+
+Runs the implementations in app.data_sources.html_extract over a directory
+of saved pages (*.html, e.g. CourseHero landing and chapter-summary pages
+saved from the browser) and checks that the shipped one ("fast": lxml,
+bs4 for markup the parsers repair differently) produces the same
+summaries and link lists as bs4. Without --fixtures, synthetic
+CourseHero-like pages are generated. The known broken-markup cases (see
+html_extract) and broken copies of the pages are checked as well. Exits 1
+if any page differs.
+
+Usage (from backend/):
+    python -m benchmarks.bench_html_extract [--fixtures DIR] [--rounds 5]
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("TMDB_API_KEY", "benchmark-key")
+
+from app.data_sources import html_extract  # noqa: E402
+
+IMPLEMENTATIONS = {
+    "bs4": (html_extract.extract_summary_bs4, html_extract.iter_links_bs4),
+    "lxml": (html_extract.extract_summary_lxml, html_extract.iter_links_lxml),
+    "fast": (html_extract.extract_summary_fast, html_extract.iter_links_fast),
+}
+
+# Bozuk markup: iki parser farklı onarıyor (bkz. html_extract docstring)
+KNOWN_DIVERGENCES = [
+    ("block element inside <p>", "<h2>Summary</h2><p>a<div>b</div>c</p>"),
+    ("unclosed <p> before <h2>", "<h2>Summary</h2><p>one<p>two<h2>Next</h2>"),
+    ("nested <a>", '<ul><li><a href="/a/">x<a href="/b/">y</a></a></li></ul>'),
+]
+
+# Sayfaları bozmak için: (eski, yeni) ilk geçtiği yerde değiştirilir
+BREAKAGES = [
+    ("</p>", ""),
+    ("</em>", "</em><div>ad</div>"),
+    ("</a>", '<a href="/x/">x</a></a>'),
+    ("<h2>Analysis</h2>", "<p><h2>Analysis</h2>"),
+]
+
+WORDS = (
+    "raskolnikov sonya petersburg fever axe pawnbroker confession garret "
+    "rent letter mother sister marriage money crowd tavern bridge police"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(12, 30))
+    return " ".join(words).capitalize() + "."
+
+
+def _chrome(rng: random.Random) -> str:
+    # Gerçek sayfalardaki menü/footer gürültüsü
+    nav = "".join(f'<li><a href="/subjects/{w}/">{w.title()}</a></li>' for w in rng.sample(WORDS, 10))
+    scripts = "".join(f"<script>window.__d{i} = {{\"k\": {i}}};</script>" for i in range(15))
+    return f"<header><nav><ul>{nav * 8}</ul></nav></header>{scripts}"
+
+
+def _chapter_page(rng: random.Random, part: int, start: int) -> str:
+    summary = "".join(
+        f"<p>{_sentence(rng)} <em>{rng.choice(WORDS)}</em> {_sentence(rng)}</p>"
+        for _ in range(rng.randint(4, 9))
+    )
+    analysis = "".join(f"<p>{_sentence(rng)}</p>" for _ in range(rng.randint(4, 9)))
+    return (
+        f"<!DOCTYPE html><html><head><title>Part {part} Chapter {start}</title></head><body>"
+        f"{_chrome(rng)}<main><article><h1>Part {part}, Chapter {start}</h1>"
+        f"<h2>Summary</h2>{summary}<h2>Analysis</h2>{analysis}</article></main>"
+        f"<footer>{_chrome(rng)}</footer></body></html>"
+    )
+
+
+def _landing_page(rng: random.Random, parts: int = 6, chapters: int = 12) -> str:
+    links = "".join(
+        f'<li><a href="/lit/Crime-and-Punishment/part-{p}-chapters-{c}-{c + 1}-summary/">'
+        f"Part {p}, Chapters {c}–{c + 1} Summary</a></li>"
+        f'<li><a href="/lit/Crime-and-Punishment/part-{p}-chapters-{c}-{c + 1}-analysis/">Analysis</a></li>'
+        for p in range(1, parts + 1)
+        for c in range(1, chapters, 2)
+    )
+    return (
+        f"<!DOCTYPE html><html><body>{_chrome(rng)}<main><h1>Crime and Punishment</h1>"
+        f"<ul>{links}</ul></main><footer>{_chrome(rng)}</footer></body></html>"
+    )
+
+
+def synthetic_pages(count: int = 60) -> list[tuple[str, str]]:
+    rng = random.Random(7)
+    pages = [("landing.html", _landing_page(rng))]
+    pages += [
+        (f"part-{i // 6 + 1}-chapter-{i % 6 + 1}.html", _chapter_page(rng, i // 6 + 1, i % 6 + 1))
+        for i in range(count - 1)
+    ]
+    return pages
+
+
+def broken_pages(pages: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    broken = []
+    for i, (name, html) in enumerate(pages):
+        old, new = BREAKAGES[i % len(BREAKAGES)]
+        if old in html:
+            broken.append((f"broken-{name}", html.replace(old, new, 1)))
+    return broken
+
+
+def load_pages(directory: str) -> list[tuple[str, str]]:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def run(pages: list[tuple[str, str]], extract, links) -> list[tuple[str | None, list]]:
+    return [(extract(html), list(links(html))) for _, html in pages]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", help="directory of saved *.html pages (default: synthetic)")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    if not html_extract.LXML_AVAILABLE:
+        print("lxml yüklü değil: pip install lxml")
+        sys.exit(1)
+
+    pages = load_pages(args.fixtures) if args.fixtures else synthetic_pages()
+    if not pages:
+        print(f"{args.fixtures} içinde *.html yok")
+        sys.exit(1)
+
+    size_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"{len(pages)} pages, {size_kb:.0f} KiB, {args.rounds} rounds")
+
+    outputs = {}
+    timings = {}
+    for name, (extract, links) in IMPLEMENTATIONS.items():
+        outputs[name] = run(pages, extract, links)
+        best = float("inf")
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            run(pages, extract, links)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+
+    for name, seconds in timings.items():
+        print(
+            f"{name:<5} {seconds * 1000:8.1f}ms/pass  "
+            f"{len(pages) / seconds:8.0f} pages/s  "
+            f"x{timings['bs4'] / seconds:.1f}"
+        )
+
+    reference = IMPLEMENTATIONS["bs4"]
+    shipped = IMPLEMENTATIONS["fast"]
+    mismatches = [
+        page for page, old, new in zip((p for p, _ in pages), outputs["bs4"], outputs["fast"])
+        if old != new
+    ]
+    summaries = sum(1 for summary, _ in outputs["fast"] if summary)
+    fallbacks = sum(1 for _, html in pages if not html_extract._repairs_agree(html))
+    print(
+        f"summaries found: {summaries}, pages handed to bs4: {fallbacks}, "
+        f"mismatched pages: {len(mismatches)}"
+    )
+
+    print("broken markup:")
+    broken = KNOWN_DIVERGENCES + broken_pages(pages)
+    for label, html in broken:
+        old = run([(label, html)], *reference)
+        raw = run([(label, html)], *IMPLEMENTATIONS["lxml"])
+        new = run([(label, html)], *shipped)
+        if new != old:
+            mismatches.append(label)
+        if (label, html) in KNOWN_DIVERGENCES:
+            print(f"  {label:<26} bs4={old[0]!r}\n  {'':<26} lxml={raw[0]!r}\n  {'':<26} fast={new[0]!r}")
+    print(f"  {len(broken)} broken pages checked")
+
+    for page in mismatches[:10]:
+        print(f"  ≠ {page}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Serialization cost per listing page: old handler path vs compact projection.
+
+old    : per-row dict built by hand (image_url twice per row), then FastAPI's
+         default path (jsonable_encoder + JSONResponse.render)
+new    : SeriesSummary projection encoded straight to bytes (encode_listing)
+cached : pre-encoded bytes served from the listing cache
+
+Usage (from backend/):
+    python -m benchmarks.bench_listing_serialization [--pages 200] [--rounds 5]
+"""
+
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("TMDB_API_KEY", "benchmark-key")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.core import serialization  # noqa: E402
+from app.schemas.series import encode_listing  # noqa: E402
+from benchmarks.tmdb_standin import _listing  # noqa: E402
+
+IMAGE_BASE = "https://image.tmdb.org/t/p/w500"
+
+
+def image_url(path):
+    if not path:
+        return None
+    return f"{IMAGE_BASE}{path}"
+
+
+def old_path(data: dict) -> bytes:
+    series_list = []
+    for show in data.get("results", []):
+        series_list.append({
+            "id": show["id"],
+            "title": show.get("name", ""),
+            "description": show.get("overview", ""),
+            "poster_path": show.get("poster_path"),
+            "poster": image_url(show.get("poster_path")),
+            "backdrop_path": show.get("backdrop_path"),
+            "backdrop": image_url(show.get("backdrop_path")),
+            "rating": show.get("vote_average", 0),
+            "genres": [],
+            "seasons": 0,
+            "episodes": 0,
+        })
+
+    content = {
+        "results": series_list,
+        "page": data.get("page"),
+        "total_pages": data.get("total_pages"),
+        "total_results": data.get("total_results"),
+    }
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def new_path(data: dict) -> bytes:
+    return encode_listing(data, image_url)
+
+
+def _time_per_page(fn, pages: list[dict], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for data in pages:
+            fn(data)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = [_listing(page) for page in range(1, args.pages + 1)]
+    encoded = {id(data): new_path(data) for data in pages}
+
+    # Aynı içerik: iki yol da aynı JSON'u üretmeli
+    for data in pages[:5]:
+        assert json.loads(old_path(data)) == json.loads(new_path(data))
+
+    old_us = _time_per_page(old_path, pages, args.rounds)
+    new_us = _time_per_page(new_path, pages, args.rounds)
+    cached_us = _time_per_page(lambda data: encoded[id(data)], pages, args.rounds)
+
+    print(f"serializer: {'orjson' if serialization.orjson else 'json'}, 20 rows/page")
+    print(f"{'old (dict + jsonable_encoder)':<32} {old_us:8.1f} us/page")
+    print(f"{'new (projection + dumps)':<32} {new_us:8.1f} us/page  ({old_us / new_us:.1f}x)")
+    print(f"{'cached (pre-encoded bytes)':<32} {cached_us:8.2f} us/page")
+
+
+if __name__ == "__main__":
+    main()
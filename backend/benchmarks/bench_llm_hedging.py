@@ -0,0 +1,139 @@
+"""
+Recap LLM latency with and without hedged requests.
+
+Both providers are the deterministic local stand-in. The primary has a
+slow tail (--tail-ratio of prompts take --tail-ms longer); the secondary
+is a bit slower on average with an independent tail. Each prompt is sent
+once through the primary alone and once through HedgedLLMClient.
+
+--mixed instead interleaves streaming and blocking recaps on providers
+without a tail and checks that first-chunk latencies of the streams do
+not shrink the blocking hedge delay (at most --max-hedge-rate of the
+blocking calls may be hedged).
+
+Usage (from backend/):
+    python -m benchmarks.bench_llm_hedging [--calls 400] [--tail-ms 3000]
+    python -m benchmarks.bench_llm_hedging --mixed
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("TMDB_API_KEY", "benchmark-key")
+
+from app.services.llm.hedged import HedgedLLMClient  # noqa: E402
+from app.services.llm.local import LocalLLMClient  # noqa: E402
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run(client, prompts: list[str], concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(prompt: str):
+        async with semaphore:
+            start = time.perf_counter()
+            await client.agenerate_recap(prompt)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one(p) for p in prompts))
+    return latencies
+
+
+async def _mixed(args) -> bool:
+    # Kuyruk yok: hedge edilen her blocking çağrı gereksiz ikinci LLM çağrısıdır
+    client = HedgedLLMClient(
+        LocalLLMClient(args.latency_ms, 0, 0, seed="primary"),
+        LocalLLMClient(args.latency_ms, 0, 0, seed="secondary"),
+        percentile=args.percentile,
+        min_samples=20,
+        default_delay=args.latency_ms * 3 / 1000
+    )
+
+    async def stream(prompt: str):
+        async for _ in client.astream_recap(prompt):
+            pass
+
+    prompts = [f"Season 1, Episode {i}: prompt {i}" for i in range(args.calls)]
+    await _run(client, prompts[:40], args.concurrency)
+    await asyncio.gather(*(stream(p) for p in prompts))
+
+    before = client.hedged
+    await _run(client, prompts[:40], args.concurrency)
+    rate = (client.hedged - before) / 40
+
+    stats = client.stats()
+    ok = rate <= args.max_hedge_rate
+    print(
+        f"mixed: blocking hedge rate after {args.calls} streams {rate:.1%} "
+        f"(max {args.max_hedge_rate:.0%}), hedge delay {stats['hedge_delay'] * 1000:.0f}ms, "
+        f"stream hedge delay {stats['stream_hedge_delay'] * 1000:.0f}ms -> {'OK' if ok else 'FAIL'}"
+    )
+    return ok
+
+
+def _report(label: str, latencies: list[float], wall: float):
+    print(
+        f"{label:<10} p50={statistics.median(latencies):7.0f}ms "
+        f"p95={_percentile(latencies, 95):7.0f}ms "
+        f"p99={_percentile(latencies, 99):7.0f}ms "
+        f"max={max(latencies):7.0f}ms  wall={wall:5.1f}s"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--tail-ms", type=float, default=3000)
+    parser.add_argument("--tail-ratio", type=float, default=0.05)
+    parser.add_argument("--percentile", type=float, default=95)
+    parser.add_argument("--mixed", action="store_true")
+    parser.add_argument("--max-hedge-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.mixed:
+        if not await _mixed(args):
+            raise SystemExit(1)
+        return
+
+    def primary():
+        return LocalLLMClient(args.latency_ms, args.tail_ms, args.tail_ratio, seed="primary")
+
+    secondary = LocalLLMClient(args.latency_ms * 1.5, args.tail_ms, args.tail_ratio, seed="secondary")
+    prompts = [f"Season 1, Episode {i}: prompt {i}" for i in range(args.calls)]
+
+    start = time.perf_counter()
+    plain = await _run(primary(), prompts, args.concurrency)
+    _report("primary", plain, time.perf_counter() - start)
+
+    hedged_client = HedgedLLMClient(
+        primary(),
+        secondary,
+        percentile=args.percentile,
+        min_samples=20,
+        default_delay=args.latency_ms * 3 / 1000
+    )
+    start = time.perf_counter()
+    hedged = await _run(hedged_client, prompts, args.concurrency)
+    _report("hedged", hedged, time.perf_counter() - start)
+
+    stats = hedged_client.stats()
+    print(
+        f"hedged {stats['hedged']}/{stats['calls']} calls "
+        f"({stats['hedged'] / stats['calls']:.1%} extra LLM load), "
+        f"secondary won {stats['secondary_wins']}, final hedge delay {stats['hedge_delay'] * 1000:.0f}ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
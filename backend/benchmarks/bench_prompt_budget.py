@@ -0,0 +1,171 @@
+"""
+Prompt size before/after the prompt-budget stage, at real series depths.
+
+For each case the flat recap prompt's summary block (every overview from
+S1E1 up to the stopping point) is built twice: plain concatenation (the old
+_build_raw_text) and RecapService._build_raw_text with compaction. Token
+counts use the same local estimate as the service.
+
+Overviews are synthetic (TMDB-typical length, recurring characters) unless
+--fixtures points at recorded season JSON (fixtures/tv/<id>/season/<n>.json,
+the stand-in TMDB layout), in which case those are used for cases with a
+matching tv id.
+
+With --mode hierarchical the same cases go through the hierarchical
+split instead: one synthetic ~250-word digest per earlier season plus the
+current season's overviews. The check asserts the prompt stays within the
+budget and the current season is never crowded out by the digests (its
+most recent overview is always there verbatim).
+
+Usage (from backend/):
+    python -m benchmarks.bench_prompt_budget [--budget 6000] [--fixtures DIR] [--mode hierarchical]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from pathlib import Path
+
+os.environ.setdefault("TMDB_API_KEY", "benchmark-key")
+
+from app.services.prompt_budget import estimate_tokens  # noqa: E402
+from app.services import prompt_budget, recap_service  # noqa: E402
+from app.services.recap_service import RecapService  # noqa: E402
+
+# (title, tv id, episodes per season) — stopping point is the last episode
+CASES = [
+    ("Breaking Bad", 1396, [7, 13, 13, 13, 16]),
+    ("Game of Thrones", 1399, [10, 10, 10, 10, 10, 10, 7, 6]),
+    ("Dexter", 1405, [12] * 8),
+    ("Supernatural", 1622, [22, 22, 16, 22, 22, 22, 23, 23, 23, 23, 23, 23, 23, 23, 20]),
+    ("Grey's Anatomy", 1416, [9, 27, 25, 17, 24, 24, 22, 24, 24, 22, 25, 24, 24, 24, 25, 21, 24, 20, 20]),
+    ("The Simpsons", 456, [13, 22, 24, 22, 22, 25, 25, 25, 25, 23] + [22] * 24),
+]
+
+NAMES = ["Walter", "Jesse", "Skyler", "Hank", "Marie", "Saul", "Gus", "Mike", "Lydia", "Todd"]
+EVENTS = [
+    "{a} discovers that {b} has been hiding a second phone.",
+    "{a} and {b} argue about the money and the risks of the next deal.",
+    "A routine job goes wrong when {a} is spotted near the warehouse.",
+    "{a} pressures {b} to cut ties with the cartel before it is too late.",
+    "Meanwhile, {a} starts to suspect that someone inside the family is lying.",
+    "{a} makes a desperate choice that puts {b} in danger.",
+    "An old enemy of {a} resurfaces with a proposal nobody can refuse.",
+    "{a} tries to repair the relationship with {b} after the funeral.",
+]
+
+
+def _synthetic_overview(rng: random.Random) -> str:
+    sentences = []
+    for _ in range(rng.randint(2, 4)):
+        a, b = rng.sample(NAMES, 2)
+        sentences.append(rng.choice(EVENTS).format(a=a, b=b))
+    return " ".join(sentences)
+
+
+def _episodes(tv_id: int, seasons: list[int], fixtures: Path | None) -> list[dict]:
+    rng = random.Random(tv_id)
+    episodes = []
+    for season, count in enumerate(seasons, start=1):
+        recorded = fixtures / "tv" / str(tv_id) / "season" / f"{season}.json" if fixtures else None
+        if recorded and recorded.exists():
+            data = json.loads(recorded.read_text(encoding="utf-8"))
+            for ep in data.get("episodes", []):
+                episodes.append({
+                    "season": season,
+                    "episode": ep["episode_number"],
+                    "title": ep.get("name"),
+                    "overview": ep.get("overview") or "",
+                })
+            continue
+
+        for episode in range(1, count + 1):
+            episodes.append({
+                "season": season,
+                "episode": episode,
+                "title": f"Episode {episode}",
+                "overview": _synthetic_overview(rng),
+            })
+    return episodes
+
+
+def _synthetic_digest(rng: random.Random) -> str:
+    sentences = []
+    while len(" ".join(sentences).split()) < 240:
+        a, b = rng.sample(NAMES, 2)
+        sentences.append(rng.choice(EVENTS).format(a=a, b=b))
+    return " ".join(sentences)
+
+
+def _legacy_raw_text(episodes: list[dict]) -> str:
+    return "\n".join(
+        f"Season {ep['season']}, Episode {ep['episode']} ({ep['title']}): {ep['overview']}"
+        for ep in episodes
+    )
+
+
+def _run_flat(service: RecapService, episodes: list[dict], budget: int) -> tuple[int, int, float]:
+    before = estimate_tokens(_legacy_raw_text(episodes))
+    start = time.perf_counter()
+    compacted = service._build_raw_text(episodes, budget)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    # Determinism: aynı girdi → aynı prompt (cache anahtarı stabil kalır)
+    assert compacted == service._build_raw_text(episodes, budget)
+    return before, estimate_tokens(compacted), elapsed
+
+
+def _run_hierarchical(service: RecapService, episodes: list[dict], budget: int) -> tuple[int, int, float]:
+    last = episodes[-1]
+    rng = random.Random(last["season"])
+    digests = {number: _synthetic_digest(rng) for number in range(1, last["season"])}
+    current = [ep for ep in episodes if ep["season"] == last["season"]]
+
+    legacy_digests = "\n\n".join(f"Season {number}: {digest}" for number, digest in digests.items())
+    before = estimate_tokens(legacy_digests) + estimate_tokens(_legacy_raw_text(current))
+    start = time.perf_counter()
+    digest_text, raw_text = service._hierarchical_sections(digests, current, budget)
+    elapsed = (time.perf_counter() - start) * 1000
+    after = estimate_tokens(digest_text) + estimate_tokens(raw_text)
+
+    assert (digest_text, raw_text) == service._hierarchical_sections(digests, current, budget)
+    # Sezon digest'leri ne kadar büyürse büyüsün mevcut sezon prompt'ta kalır
+    assert last["overview"] in raw_text, "current season crowded out by digests"
+    assert after <= budget * 1.02, f"{after} tokens over budget {budget}"
+    return before, after, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=int, default=prompt_budget.PROMPT_TOKEN_BUDGET)
+    parser.add_argument("--fixtures", help="recorded TMDB fixtures directory")
+    parser.add_argument("--mode", choices=("flat", "hierarchical"), default="flat")
+    args = parser.parse_args()
+
+    fixtures = Path(args.fixtures) if args.fixtures else None
+    service = RecapService(tmdb=object(), cache=object(), llm=object())
+    template = (
+        recap_service.HIERARCHICAL_PROMPT_TEMPLATE
+        if args.mode == "hierarchical"
+        else recap_service.PROMPT_TEMPLATE
+    )
+    run = _run_hierarchical if args.mode == "hierarchical" else _run_flat
+
+    print(f"mode={args.mode} budget={args.budget} tokens (summaries), prompt template ≈{estimate_tokens(template)} tokens\n")
+    print(f"{'series':<16} {'stop':>8} {'eps':>5} {'before':>9} {'after':>8} {'ratio':>6} {'time':>8}")
+
+    for title, tv_id, seasons in CASES:
+        episodes = _episodes(tv_id, seasons, fixtures)
+        last = episodes[-1]
+        before, after, elapsed = run(service, episodes, args.budget)
+
+        print(
+            f"{title:<16} {'S%dE%d' % (last['season'], last['episode']):>8} {len(episodes):>5} "
+            f"{before:>9} {after:>8} {after / before:>6.2f} {elapsed:>6.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Recap data collection benchmark: per-episode crawl vs season-level fetch.
+
+Runs TMDBClient.get_recap_until against the stand-in TMDB server and reports
+upstream request count and wall time per show depth.
+
+Usage (from backend/):
+    python -m benchmarks.bench_tmdb_recap [--fixtures DIR] [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("TMDB_API_KEY", "benchmark-key")
+
+from app.data_sources.tmdb import TMDBClient  # noqa: E402
+from benchmarks.tmdb_standin import StandInTMDB  # noqa: E402
+
+
+CASES = [
+    ("Short Show", 1, 8),
+    ("Dexter", 6, 2),
+    ("Long Show", 20, 22),
+]
+
+
+async def legacy_recap_until(client: TMDBClient, title: str, target_season: int, target_episode: int):
+    """The old O(episodes) path: one get_episode call per episode, serially."""
+    tv_id = (await client.search_tv(title))["results"][0]["id"]
+    recap = []
+
+    for season in (await client.tv_details(tv_id))["seasons"]:
+        season_number = season["season_number"]
+        if season_number == 0:
+            continue
+        if season_number > target_season:
+            break
+
+        max_episode = target_episode if season_number == target_season else season["episode_count"]
+        for ep in range(1, max_episode + 1):
+            data = await client.get_episode(tv_id, season_number, ep)
+            overview = data.get("overview", "").strip()
+            if overview:
+                recap.append({"season": season_number, "episode": ep, "title": data["name"], "overview": overview})
+
+    return recap
+
+
+async def _measure(server: StandInTMDB, fn) -> tuple[int, float, int]:
+    server.reset()
+    start = time.perf_counter()
+    episodes = await fn()
+    elapsed = time.perf_counter() - start
+    return server.total_requests, elapsed, len(episodes)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", default=None, help="directory of recorded TMDB responses")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated upstream latency")
+    args = parser.parse_args()
+
+    with StandInTMDB(args.fixtures, args.latency_ms) as server:
+        client = TMDBClient()
+        client.BASE_URL = server.base_url
+
+        print(f"{'show':<12} {'target':<8} {'episodes':>8} | {'old req':>7} {'old s':>7} | {'new req':>7} {'new s':>7}")
+        print("-" * 72)
+
+        for title, season, episode in CASES:
+            old_req, old_t, old_n = await _measure(
+                server, lambda: legacy_recap_until(client, title, season, episode)
+            )
+            new_req, new_t, new_n = await _measure(
+                server, lambda: client.get_recap_until(title, season, episode)
+            )
+            assert old_n == new_n, f"{title}: episode count mismatch ({old_n} != {new_n})"
+
+            print(
+                f"{title:<12} S{season}E{episode:<5} {new_n:>8} | "
+                f"{old_req:>7} {old_t:>7.2f} | {new_req:>7} {new_t:>7.2f}"
+            )
+
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+"""
+Stand-in Google Books server for benchmarks and offline runs.
+
+Answers GET /volumes?q=intitle:... (or q=inauthor:..., optionally with
+langRestrict) from a small built-in catalog (plus an optional JSON list of
+volumeInfo dicts) with Google Books-shaped results: every volume sharing a
+word with the query (title or authors), in catalog order, like the real
+API's loose relevance matching. Point the app at it with
+GOOGLE_BOOKS_BASE_URL=<base_url>. Every request is counted.
+
+    python -m benchmarks.google_books_standin [--port 8765]
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CATALOG = [
+    {"title": "Crime and Punishment", "authors": ["Fyodor Dostoyevsky"], "language": "en", "ratingsCount": 1450},
+    {"title": "Crime and Punishment (Penguin Classics)", "authors": ["Fyodor Dostoevsky"], "language": "en", "ratingsCount": 310},
+    {"title": "Suç ve Ceza", "authors": ["Fyodor Mihayloviç Dostoyevski"], "language": "tr", "ratingsCount": 95},
+    {"title": "Punishment Park", "authors": ["Someone Else"], "language": "en", "ratingsCount": 3},
+    {"title": "1984", "authors": ["George Orwell"], "language": "en", "ratingsCount": 2100},
+    {"title": "Bin Dokuz Yüz Seksen Dört", "authors": ["George Orwell"], "language": "tr", "ratingsCount": 120},
+    {"title": "Anna Karenina", "authors": ["Leo Tolstoy"], "language": "en", "ratingsCount": 980},
+    {"title": "The Great Gatsby", "authors": ["F. Scott Fitzgerald"], "language": "en", "ratingsCount": 1800},
+    {"title": "The Brothers Karamazov", "authors": ["Fyodor Dostoevsky"], "language": "en", "ratingsCount": 640},
+    {"title": "Of Mice and Men", "authors": ["John Steinbeck"], "language": "en", "ratingsCount": 900},
+    {"title": "The Grapes of Wrath", "authors": ["John Steinbeck"], "language": "en", "ratingsCount": 880},
+    {"title": "Fareler ve İnsanlar", "authors": ["John Steinbeck"], "language": "tr", "ratingsCount": 40},
+]
+
+
+def _words(text: str) -> set[str]:
+    return set(re.findall(r"\w+", text.casefold()))
+
+
+def search(catalog: list[dict], query: str, language: str | None = None) -> dict:
+    if query.startswith("inauthor:"):
+        field, words = "authors", _words(query.removeprefix("inauthor:"))
+    else:
+        field, words = "title", _words(query.removeprefix("intitle:"))
+
+    items = [
+        {"volumeInfo": info} for info in catalog
+        if words & _words(" ".join(info[field]) if field == "authors" else info[field])
+        and (language is None or info["language"] == language)
+    ]
+    return {"kind": "books#volumes", "totalItems": len(items), "items": items} if items else {"totalItems": 0}
+
+
+class StandInGoogleBooks:
+    """
+    Threaded HTTP server on 127.0.0.1 with an optional per-request latency.
+    """
+
+    def __init__(self, catalog_path: str | None = None, latency_ms: float = 50.0, port: int = 0):
+        self.catalog = list(CATALOG)
+        if catalog_path:
+            with open(catalog_path, encoding="utf-8") as f:
+                self.catalog += json.load(f)
+
+        self.latency = latency_ms / 1000
+        self.counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.counts.values())
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                with server._lock:
+                    server.counts[url.path] += 1
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if url.path == "/volumes":
+                    params = parse_qs(url.query)
+                    query = params.get("q", [""])[0]
+                    language = params.get("langRestrict", [None])[0]
+                    status, data = 200, search(server.catalog, query, language)
+                else:
+                    status, data = 404, {"error": {"code": 404, "message": "Not Found"}}
+
+                body = json.dumps(data, ensure_ascii=False).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--catalog", help="extra volumes (JSON list of volumeInfo dicts)")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    with StandInGoogleBooks(args.catalog, args.latency_ms, args.port) as server:
+        print(f"GOOGLE_BOOKS_BASE_URL={server.base_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Load test: listing-endpoint latency while recap generations are running.
+
+Drives the FastAPI app in-process (httpx ASGITransport, same event loop as
+the app, like a single uvicorn worker) against the stand-in TMDB server.
+The LLM is the deterministic local stand-in provider taking
+--recap-seconds per recap, so the whole pipeline runs offline. By default
+(--llm blocking) its calls block their thread like the synchronous Gemini
+SDK does, so the run checks that blocking providers are kept off the event
+loop; --llm async uses the stand-in's native async methods instead.
+
+Phase 1 measures /series/* latency alone; phase 2 measures it again while
+--recaps concurrent /recap/series generations are in flight. On a
+non-blocking request path both phases report roughly the same numbers.
+
+Usage (from backend/):
+    python -m benchmarks.load_listing_during_recap [--recaps 4] [--recap-seconds 3] [--llm async]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("TMDB_API_KEY", "benchmark-key")
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="nk-bench-"))
+
+from benchmarks.tmdb_standin import StandInTMDB  # noqa: E402
+
+
+def _register_blocking_provider():
+    from app.services.llm.base import BaseLLMClient
+    from app.services.llm.local import LocalLLMClient
+    from app.services.llm.registry import register_provider
+
+    class BlockingLocalLLM(LocalLLMClient):
+        """Local stand-in without native async: blocks like the Gemini SDK."""
+
+        agenerate_recap = BaseLLMClient.agenerate_recap
+        astream_recap = BaseLLMClient.astream_recap
+
+    register_provider("local-blocking", BlockingLocalLLM)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _listing_latencies(client, duration: float, concurrency: int) -> list[float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + duration
+    paths = ["/series/popular", "/series/trending", "/series/top-rated", "/series/search?q=dexter"]
+
+    async def worker(n: int):
+        i = n
+        while time.perf_counter() < deadline:
+            # Farklı sayfalar: cache hit + upstream miss karışımı
+            path = paths[i % len(paths)]
+            sep = "&" if "?" in path else "?"
+            start = time.perf_counter()
+            response = await client.get(f"{path}{sep}page={i % 5 + 1}")
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.text
+            i += concurrency
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return latencies
+
+
+async def _loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Largest event-loop stall (ms) observed while `stop` is unset."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, (time.perf_counter() - start - interval) * 1000)
+    return worst
+
+
+async def _measure(client, duration: float, concurrency: int) -> tuple[list[float], float]:
+    stop = asyncio.Event()
+    lag = asyncio.create_task(_loop_lag(stop))
+    latencies = await _listing_latencies(client, duration, concurrency)
+    stop.set()
+    return latencies, await lag
+
+
+def _report(label: str, latencies: list[float], lag: float):
+    print(
+        f"{label:<22} n={len(latencies):<5} "
+        f"p50={statistics.median(latencies):7.1f}ms "
+        f"p95={_percentile(latencies, 95):7.1f}ms "
+        f"p99={_percentile(latencies, 99):7.1f}ms "
+        f"max={max(latencies):7.1f}ms "
+        f"loop stall={lag:7.1f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recaps", type=int, default=4, help="concurrent recap generations")
+    parser.add_argument("--recap-seconds", type=float, default=3.0, help="stand-in LLM time per recap")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent listing clients")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="stand-in TMDB latency")
+    parser.add_argument(
+        "--llm", choices=("blocking", "async"), default="blocking",
+        help="stand-in LLM calls block a thread (like the Gemini SDK) or are native async"
+    )
+    args = parser.parse_args()
+
+    with StandInTMDB(latency_ms=args.latency_ms) as server:
+        os.environ["TMDB_BASE_URL"] = server.base_url
+        os.environ["LLM_PRIMARY"] = "local-blocking" if args.llm == "blocking" else "local"
+        os.environ["LOCAL_LLM_LATENCY_MS"] = str(args.recap_seconds * 1000)
+        _register_blocking_provider()
+
+        import httpx
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=None) as client:
+            duration = args.recap_seconds
+
+            baseline, lag = await _measure(client, duration, args.concurrency)
+            _report("listing (idle)", baseline, lag)
+
+            recaps = [
+                asyncio.create_task(client.post(
+                    "/recap/series",
+                    json={"title": "Dexter", "season": 1 + i % 8, "episode": 1 + i},
+                ))
+                for i in range(args.recaps)
+            ]
+            await asyncio.sleep(0.05)
+
+            start = time.perf_counter()
+            under_load, lag = await _measure(client, duration, args.concurrency)
+            _report(f"listing ({args.recaps} recaps)", under_load, lag)
+
+            responses = await asyncio.gather(*recaps)
+            failed = [r for r in responses if r.status_code != 200]
+            print(
+                f"recaps: {len(responses) - len(failed)} ok, {len(failed)} failed, "
+                f"finished {time.perf_counter() - start:.1f}s after load phase start"
+            )
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
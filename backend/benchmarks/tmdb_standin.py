@@ -0,0 +1,189 @@
+"""
+Stand-in TMDB server for benchmarks.
+
+Serves recorded JSON fixtures (a directory whose layout mirrors the API
+paths, e.g. fixtures/tv/1405.json, fixtures/tv/1405/season/1.json) and
+synthesizes TMDB-shaped responses for anything that is not recorded.
+Every request is counted so benchmarks can report upstream traffic.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+
+# Synthetic shows: id -> (name, episodes per season)
+SHOWS = {
+    1001: ("Short Show", [8]),
+    1405: ("Dexter", [12, 12, 12, 12, 12, 12, 12, 12]),
+    1002: ("Long Show", [22] * 20),
+}
+
+OVERVIEW = (
+    "{name} S{season}E{episode}: the detective follows a new lead while old "
+    "secrets resurface. Alliances shift as the family deals with the fallout "
+    "of the previous night, and a stranger arrives with a warning."
+)
+
+
+def _show(tv_id: int):
+    if tv_id in SHOWS:
+        return SHOWS[tv_id]
+    return (f"Show {tv_id}", [10, 10, 10])
+
+
+def _episode(tv_id: int, season: int, episode: int) -> dict:
+    name, _ = _show(tv_id)
+    return {
+        "id": tv_id * 10000 + season * 100 + episode,
+        "name": f"{name} {season}x{episode:02d}",
+        "overview": OVERVIEW.format(name=name, season=season, episode=episode),
+        "season_number": season,
+        "episode_number": episode,
+        "air_date": f"{2000 + season}-01-{min(episode, 28):02d}",
+    }
+
+
+def _listing(page: int) -> dict:
+    results = []
+    for i in range(20):
+        tv_id = 5000 + (page - 1) * 20 + i
+        results.append({
+            "id": tv_id,
+            "name": f"Show {tv_id}",
+            "overview": OVERVIEW.format(name=f"Show {tv_id}", season=1, episode=1),
+            "poster_path": f"/poster{tv_id}.jpg",
+            "backdrop_path": f"/backdrop{tv_id}.jpg",
+            "vote_average": 7.5,
+            "popularity": 100.0 - i,
+        })
+    return {"page": page, "results": results, "total_pages": 500, "total_results": 10000}
+
+
+def synthesize(path: str, query: dict) -> dict | None:
+    page = int(query.get("page", ["1"])[0])
+
+    if path in ("/tv/popular", "/tv/top_rated", "/trending/tv/week"):
+        return _listing(page)
+
+    if path == "/search/tv":
+        q = query.get("query", [""])[0].lower()
+        results = [
+            {"id": tv_id, "name": name, "popularity": 50.0}
+            for tv_id, (name, _) in SHOWS.items()
+            if q in name.lower()
+        ]
+        return {"page": page, "results": results, "total_pages": 1, "total_results": len(results)}
+
+    m = re.fullmatch(r"/tv/(\d+)(?:/season/(\d+)(?:/episode/(\d+))?)?", path)
+    if not m:
+        return None
+
+    tv_id = int(m.group(1))
+    name, seasons = _show(tv_id)
+
+    if m.group(3):
+        return _episode(tv_id, int(m.group(2)), int(m.group(3)))
+
+    if m.group(2):
+        season = int(m.group(2))
+        if not 1 <= season <= len(seasons):
+            return None
+        return {
+            "season_number": season,
+            "episodes": [_episode(tv_id, season, e) for e in range(1, seasons[season - 1] + 1)],
+        }
+
+    last_season = len(seasons)
+    return {
+        "id": tv_id,
+        "name": name,
+        "overview": f"{name} overview",
+        "genres": [{"id": 18, "name": "Drama"}],
+        "networks": [{"name": "Network"}],
+        "first_air_date": "2001-01-01",
+        "last_air_date": f"{2000 + last_season}-01-{min(seasons[-1], 28):02d}",
+        "last_episode_to_air": {"season_number": last_season, "episode_number": seasons[-1]},
+        "seasons": [
+            {"season_number": i, "episode_count": count, "air_date": f"{2000 + i}-01-01"}
+            for i, count in enumerate(seasons, start=1)
+        ],
+    }
+
+
+class StandInTMDB:
+    """
+    Threaded HTTP server on 127.0.0.1 with an optional per-request latency.
+    """
+
+    def __init__(self, fixtures_dir: str | None = None, latency_ms: float = 20.0):
+        self.fixtures = Path(fixtures_dir) if fixtures_dir else None
+        self.latency = latency_ms / 1000
+        self.counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.counts.values())
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+
+    def _load(self, path: str, query: dict) -> dict | None:
+        if self.fixtures:
+            recorded = self.fixtures / f"{path.strip('/')}.json"
+            if recorded.is_file():
+                return json.loads(recorded.read_text(encoding="utf-8"))
+        return synthesize(path, query)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                with server._lock:
+                    server.counts[url.path] += 1
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                data = server._load(url.path, parse_qs(url.query))
+                status = 200 if data is not None else 404
+                body = json.dumps(data if data is not None else {"status_code": 34}).encode()
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()